@@ -166,6 +166,8 @@ def process_document(
                 traceback.print_exc()
             sys.exit(1)
     
+    # Closed when processing ends, releasing the backend's pooled connections
+    ai_transcriber = None
     try:
         reporter.start(f"Processing {path}")
         logger.info(f"INITIAL CONFIG: backend={backend}, model={model}, debug={debug}")
@@ -175,7 +177,6 @@ def process_document(
         ocr_processor = None
         
         # Prepare AI processor with semantic layering
-        ai_transcriber = None
         logger.info(f"USE_AI CHECK: use_ai={use_ai}")
         if use_ai:
             try:
@@ -256,6 +257,8 @@ def process_document(
                     
                     # Enhancement backend (multimodal)
                     enhancement_config = config['intelligence']['backends'].get(backend, {})
+                    # Pages per semantic pipeline window, all enhanced concurrently
+                    concurrent_pages = max(1, config.get('processing', {}).get('concurrent_pages', 4))
                     
                     if backend == "openai":
                         # Create debug directory if needed
@@ -283,16 +286,19 @@ def process_document(
                             max_tokens=enhancement_config.get("max_tokens", 4096),
                             temperature=enhancement_config.get("temperature", 0.1),
                             timeout=timeout,
-                            logger=logger
+                            logger=logger,
+                            base_url=enhancement_config.get("base_url"),
+                            local_media=enhancement_config.get("local_media", False)
                         )
                         logger.info(f"Using OpenAI backend with model: {enhancement_backend.model}")
                         
                     else:
-                        # Default to Ollama
+                        # Default to Ollama, keeping a connection alive per page of a window
                         enhancement_backend = OllamaMultimodalBackend(
                             model=model,
                             base_url=enhancement_config.get('base_url', 'http://localhost:11434'),
-                            timeout=enhancement_config.get('timeout', timeout or 120)
+                            timeout=enhancement_config.get('timeout', timeout or 120),
+                            max_connections=concurrent_pages
                         )
                     
                     # Get summarization settings from config or command line
@@ -305,7 +311,8 @@ def process_document(
                         summarization_ratio=summarization_ratio if summarization_ratio is not None else config_summarization.get('ratio', 0.2),
                         max_tokens=max_tokens if max_tokens is not None else config_summarization.get('max_tokens', 75),
                         # Pass the whole config for prompt templates
-                        config=config
+                        config=config,
+                        max_concurrent_requests=concurrent_pages
                     )
                     
                     # Wrap in DocumentProcessor interface
@@ -319,6 +326,9 @@ def process_document(
                     ai_transcriber.semantic_processor = semantic_processor
                     ai_transcriber.use_semantic_pipeline = True
                     
+                    # Load the enhancement model while pages are rendered
+                    ai_transcriber.start_warmup()
+                    
                 else:
                     # Standard flow
                     ai_transcriber = create_processor(
@@ -410,6 +420,10 @@ def process_document(
                 click.echo(click.style("\nTip: Run with --debug flag for enhanced error diagnostics", fg='cyan'))
         
         sys.exit(1)
+    
+    finally:
+        if ai_transcriber is not None:
+            ai_transcriber.close()
 
 
 @click.command(name='extract-dir')
@@ -130,17 +130,13 @@ def transcribe_image(
     try:
         reporter.start(f"Transcribing {image_path} with {backend}")
         
-        # Create AI processor
-        ai_processor = create_processor(
-            config=config,
-            backend_name=backend
-        )
-        
-        # Process image
-        text = ai_processor.process_image(
-            image_path=image_path,
-            custom_prompt=prompt
-        )
+        # Create AI processor, closing its backend's connections when done
+        with create_processor(config=config, backend_name=backend) as ai_processor:
+            # Process image
+            text = ai_processor.process_image(
+                image_path=image_path,
+                custom_prompt=prompt
+            )
         
         if output:
             # Write to file
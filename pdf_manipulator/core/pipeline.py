@@ -511,34 +511,29 @@ def rebuild_memory_from_extracted_data(
             enable_summaries=True
         )
         
-        # Initialize memory processor
-        mem_processor = MemoryProcessor(
-            memory_adapter=self.memory_config,
-            intelligence_processor=self.intelligence_processor
-        )
-        
-        # Reconstruct page content from markdown files
-        page_content = {}
-        pages_data = contents.get('pages', [])
+        # Pages in order, so the memory processor can take them as a stream
+        pages_data = sorted(contents.get('pages', []), key=lambda page: page.get('page_number', 0))
         
         logger.info(f"Reconstructing content for {len(pages_data)} pages")
         
-        for page_info in pages_data:
-            page_num = page_info.get('page_number', 0) - 1  # Convert to 0-based
-            
-            # Read markdown content
-            markdown_file = markdown_dir / page_info.get('markdown_file', f"page_{page_num:04d}.md")
-            if markdown_file.exists():
-                with open(markdown_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # Remove the "# Page N" header if present
-                    lines = content.split('\n')
-                    if lines and lines[0].startswith('# Page '):
-                        content = '\n'.join(lines[2:])  # Skip header and empty line
-                    page_content[page_num] = content
-            else:
-                logger.warning(f"Markdown file not found: {markdown_file}")
-                page_content[page_num] = ""
+        def read_pages():
+            """Yield (page number, content) from the markdown files one page at a time."""
+            for page_info in pages_data:
+                page_num = page_info.get('page_number', 0) - 1  # Convert to 0-based
+                
+                # Read markdown content
+                markdown_file = markdown_dir / page_info.get('markdown_file', f"page_{page_num:04d}.md")
+                if markdown_file.exists():
+                    with open(markdown_file, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                        # Remove the "# Page N" header if present
+                        lines = content.split('\n')
+                        if lines and lines[0].startswith('# Page '):
+                            content = '\n'.join(lines[2:])  # Skip header and empty line
+                else:
+                    logger.warning(f"Markdown file not found: {markdown_file}")
+                    content = ""
+                yield page_num, content
         
         # Extract semantic analysis data
         semantic_analysis = {}
@@ -561,24 +556,29 @@ def rebuild_memory_from_extracted_data(
         # Create a minimal PDFDocument-like object for the memory processor
         # Since we're rebuilding from extracted data, we don't need the actual PDF
         class MockPDFDoc:
-            def __init__(self, page_count):
-                self.page_count = page_count
+            def __init__(self, filename, page_count):
+                self.filename = filename
+                self.num_pages = page_count
+            
+            def get_info(self):
+                return {}
                 
-        mock_doc = MockPDFDoc(len(pages_data))
+        mock_doc = MockPDFDoc(document_metadata['filename'], len(pages_data))
         
-        # Process with memory
+        # Process with memory, holding a bounded window of pages at a time
         logger.info("Rebuilding memory graph from extracted data")
-        memory_results = mem_processor.process_document(
-            pdf_document=mock_doc,
-            page_content=page_content,
-            document_metadata=document_metadata,
-            semantic_analysis=semantic_analysis if semantic_analysis else None
-        )
+        with MemoryProcessor(self.memory_config, self.intelligence_processor) as mem_processor:
+            memory_results = mem_processor.process_document_stream(
+                pdf_document=mock_doc,
+                pages=read_pages(),
+                document_metadata=document_metadata,
+                semantic_analysis=semantic_analysis if semantic_analysis else None
+            )
         
         # Log results
         if memory_results:
             logger.info(f"Memory graph rebuilt successfully at {memory_path}")
-            logger.info(f"Created {memory_results.get('nodes_created', 0)} nodes")
-            logger.info(f"Created {memory_results.get('relationships_created', 0)} relationships")
+            logger.info(f"Stored {len(memory_results['page_memories'])} page and "
+                        f"{len(memory_results['section_memories'])} section memories")
         
         return memory_path
\ No newline at end of file
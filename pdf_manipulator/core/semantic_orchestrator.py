@@ -1,5 +1,4 @@
 """Enhanced semantic orchestrator for full pipeline coordination."""
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
@@ -10,7 +9,7 @@
 from ..processors.structure_analyzer import StructureAnalyzer, TOCStructure
 from ..processors.content_analyzer import ContentAnalyzer
 from ..processors.semantic_enhancer import SemanticEnhancer
-from ..memory.graph_builder import GraphBuilder, NodeType, EdgeType
+from ..memory.graph_builder import GraphBuilder, NodeType, EdgeType, dumps_graph
 from ..intelligence.base import IntelligenceBackend
 from ..core.document import Document
 from ..core.exceptions import ProcessingError
@@ -489,8 +488,8 @@ def _generate_output(self, output_dir: Path, doc_name: str) -> Dict[str, Any]:
             graph_data = self.graph_builder.export_graph()
             json_path = output_dir / f"{doc_name}_graph.json"
             
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(graph_data, f, indent=2, ensure_ascii=False)
+            with open(json_path, "wb") as f:
+                f.write(dumps_graph(graph_data))
             
             results["json_path"] = str(json_path)
             results["graph_stats"] = graph_data["metadata"]
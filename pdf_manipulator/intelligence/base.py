@@ -1,30 +1,126 @@
 """Base classes for intelligence backends."""
+import base64
+import hashlib
+import mmap
 import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any, Optional, Union, List
 
+import httpx
+
 from pdf_manipulator.core.exceptions import PDFManipulatorError
 
+# SIMD base64 encoder; falls back to the standard library
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
+
 
 class IntelligenceError(PDFManipulatorError):
     """Error from intelligence processing."""
     pass
 
 
+# HTTP status codes worth retrying: timeouts, rate limits and overloaded servers
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Image input accepted by backends: a path on disk or the already-read bytes
+ImageInput = Union[str, Path, bytes]
+
+
+def read_image_bytes(image: ImageInput) -> bytes:
+    """Return the raw bytes of an image input.
+    
+    Args:
+        image: Path to the image file, or the image bytes themselves
+        
+    Returns:
+        Image bytes
+        
+    Raises:
+        IntelligenceError: If the image file does not exist
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return bytes(image)
+    
+    image_path = Path(image)
+    if not image_path.exists():
+        raise IntelligenceError(f"Image file not found: {image_path}")
+    return image_path.read_bytes()
+
+
+def encode_image_base64(image: ImageInput) -> str:
+    """Base64-encode an image input for a JSON request body.
+    
+    Files are memory-mapped and encoded in place rather than read into an
+    intermediate bytes object first.
+    
+    Args:
+        image: Path to the image file, or the image bytes themselves
+        
+    Returns:
+        Base64 encoded image
+        
+    Raises:
+        IntelligenceError: If the image file does not exist
+    """
+    b64encode = pybase64.b64encode if PYBASE64_AVAILABLE else base64.b64encode
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return b64encode(image).decode("ascii")
+    
+    image_path = Path(image)
+    try:
+        with open(image_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return b64encode(mapped).decode("ascii")
+    except FileNotFoundError:
+        raise IntelligenceError(f"Image file not found: {image_path}")
+
+
+def image_digest(image: ImageInput) -> str:
+    """Compute a SHA-256 content digest of an image for use as a cache key.
+    
+    hashlib uses OpenSSL's hardware-accelerated SHA-256 and releases the GIL
+    while hashing. Files are hashed with hashlib.file_digest where available
+    (Python 3.11+), which reads straight into the hash without Python-level
+    chunking.
+    
+    Args:
+        image: Path to the image file, or the image bytes
+        
+    Returns:
+        Hex digest of the image content
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(image).hexdigest()
+    
+    with open(image, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
 class IntelligenceBackend(ABC):
     """Base class for intelligence backends."""
     
     @abstractmethod
     def transcribe_image(
         self,
-        image_path: Union[str, Path],
+        image_path: ImageInput,
         prompt: Optional[str] = None,
     ) -> str:
         """Transcribe text from an image.
         
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or the already-read image bytes
             prompt: Optional custom prompt for transcription
             
         Returns:
@@ -81,6 +177,53 @@ def get_model_info(self) -> Dict[str, Any]:
             Dictionary with model information
         """
         pass
+    
+    def warmup(self) -> None:
+        """Prepare the backend for its first request.
+        
+        Backends that load a model or open a connection lazily override this
+        so the cost is paid before the first page rather than during it.
+        The default does nothing.
+        """
+        pass
+    
+    def close(self) -> None:
+        """Release resources held by the backend, such as pooled HTTP connections.
+        
+        The default does nothing.
+        """
+        pass
+    
+    def is_transient(self, error: BaseException) -> bool:
+        """Check whether an error is likely to succeed on retry.
+        
+        Backends usually wrap transport errors in their own exception types,
+        so the whole cause/context chain is inspected for timeouts, dropped
+        connections and retryable HTTP status codes.
+        
+        Args:
+            error: Exception raised by a backend call
+            
+        Returns:
+            True if the call should be retried, False otherwise
+        """
+        seen = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            
+            if isinstance(error, (TimeoutError, ConnectionError,
+                                  httpx.TimeoutException, httpx.NetworkError)):
+                return True
+            
+            status = getattr(error, "status_code", None)
+            if status is None:
+                status = getattr(getattr(error, "response", None), "status_code", None)
+            if status in TRANSIENT_STATUS_CODES:
+                return True
+            
+            error = error.__cause__ or error.__context__
+        
+        return False
 
 
 class IntelligenceManager:
@@ -161,7 +304,10 @@ def _create_backend(self, backend_name: str) -> IntelligenceBackend:
             model = backend_config.get("model", "llava:latest")
             base_url = backend_config.get("base_url", "http://localhost:11434")
             timeout = backend_config.get("timeout", 120)
-            return OllamaMultimodalBackend(model=model, base_url=base_url, timeout=timeout)
+            max_connections = backend_config.get("max_connections", 4)
+            return OllamaMultimodalBackend(
+                model=model, base_url=base_url, timeout=timeout, max_connections=max_connections
+            )
         
         elif backend_name == "openai":
             from pdf_manipulator.intelligence.openai_multimodal import OpenAIMultimodalBackend
@@ -176,7 +322,9 @@ def _create_backend(self, backend_name: str) -> IntelligenceBackend:
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                timeout=timeout
+                timeout=timeout,
+                base_url=backend_config.get("base_url"),
+                local_media=backend_config.get("local_media", False)
             )
         
         else:
@@ -1,4 +1,5 @@
 """Markitdown backend for direct document to markdown conversion."""
+import io
 import os
 import json
 from pathlib import Path
@@ -6,7 +7,7 @@
 
 from markitdown import MarkItDown
 
-from pdf_manipulator.intelligence.base import IntelligenceBackend, IntelligenceError
+from pdf_manipulator.intelligence.base import IntelligenceBackend, IntelligenceError, ImageInput
 from pdf_manipulator.utils.progress import DirectConversionProgress
 from pdf_manipulator.utils.logging_config import get_logger, LogMessages, console
 
@@ -27,13 +28,13 @@ def __init__(self, config: Optional[Dict[str, Any]] = None):
     
     def transcribe_image(
         self,
-        image_path: Union[str, Path],
+        image_path: ImageInput,
         prompt: Optional[str] = None,
     ) -> str:
         """Convert image to markdown using markitdown.
         
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or the already-read image bytes
             prompt: Not used for markitdown
             
         Returns:
@@ -42,18 +43,25 @@ def transcribe_image(
         Raises:
             IntelligenceError: If conversion fails
         """
-        image_path = Path(image_path)
-        
-        if not image_path.exists():
-            raise IntelligenceError(f"Image file not found: {image_path}")
+        from_bytes = isinstance(image_path, (bytes, bytearray, memoryview))
+        if from_bytes:
+            source = "<bytes>"
+        else:
+            image_path = Path(image_path)
+            source = str(image_path)
+            if not image_path.exists():
+                raise IntelligenceError(f"Image file not found: {image_path}")
         
         try:
-            logger.debug(f"Converting image {image_path} with markitdown")
-            result = self.converter.convert(str(image_path))
+            logger.debug(f"Converting image {source} with markitdown")
+            if from_bytes:
+                result = self.converter.convert_stream(io.BytesIO(image_path))
+            else:
+                result = self.converter.convert(source)
             text = result.text_content or ""
             logger.debug(f"Markitdown returned {len(text)} characters")
             if not text.strip():
-                logger.warning(f"Empty text from markitdown for {image_path}")
+                logger.warning(f"Empty text from markitdown for {source}")
             return text
         except Exception as e:
             raise IntelligenceError(f"Failed to convert image with markitdown: {e}")
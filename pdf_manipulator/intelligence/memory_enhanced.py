@@ -3,7 +3,7 @@
 from pathlib import Path
 import json
 
-from .base import IntelligenceBackend
+from .base import IntelligenceBackend, ImageInput
 from ..memory.memory_adapter import MemoryAdapter, MemoryConfig
 
 
@@ -39,14 +39,14 @@ def initialize(self) -> None:
     
     def transcribe_image(
         self,
-        image_path: str,
+        image_path: ImageInput,
         prompt: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None
     ) -> str:
         """Transcribe an image with enhanced context from memory graph.
         
         Args:
-            image_path: Path to the image
+            image_path: Path to the image, or the already-read image bytes
             prompt: Optional custom prompt
             context: Optional context dictionary
             
@@ -329,6 +329,34 @@ def store_result_as_memory(
             metadata=full_metadata
         )
     
+    def transcribe_text(self, text: str, prompt_template: Optional[str] = None) -> str:
+        """Process text with the wrapped backend."""
+        return self.base_backend.transcribe_text(text, prompt_template=prompt_template)
+    
+    def supports_image_input(self) -> bool:
+        """Check whether the wrapped backend accepts images."""
+        return self.base_backend.supports_image_input()
+    
+    def get_name(self) -> str:
+        """Name of the wrapped backend, marked as memory-enhanced."""
+        return f"memory_enhanced:{self.base_backend.get_name()}"
+    
+    def get_model_info(self) -> Dict[str, Any]:
+        """Model information of the wrapped backend."""
+        return self.base_backend.get_model_info()
+    
+    def warmup(self) -> None:
+        """Warm up the wrapped backend."""
+        self.base_backend.warmup()
+    
+    def close(self) -> None:
+        """Release the wrapped backend's pooled connections."""
+        self.base_backend.close()
+    
+    def is_transient(self, error: BaseException) -> bool:
+        """Classify errors as the wrapped backend does."""
+        return self.base_backend.is_transient(error)
+    
     def cleanup(self) -> None:
         """Clean up resources."""
         if self.connected:
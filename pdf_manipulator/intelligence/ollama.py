@@ -1,12 +1,13 @@
 """Ollama intelligence backend."""
 import os
-import base64
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 
 import httpx
 
-from pdf_manipulator.intelligence.base import IntelligenceBackend, IntelligenceError
+from pdf_manipulator.intelligence.base import (
+    IntelligenceBackend, IntelligenceError, ImageInput, encode_image_base64, read_image_bytes
+)
 
 
 class OllamaBackend(IntelligenceBackend):
@@ -21,16 +22,22 @@ def __init__(self, config: Dict[str, Any]):
         self.model = config.get("model", "llava:latest")
         self.base_url = config.get("base_url", "http://localhost:11434")
         self.timeout = config.get("timeout", 120)
+        
+        # One pooled client for all requests so connections are reused across pages
+        self.http_client = httpx.Client(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=config.get("max_connections", 4)),
+        )
     
     def transcribe_image(
         self,
-        image_path: Union[str, Path],
+        image_path: ImageInput,
         prompt: Optional[str] = None,
     ) -> str:
         """Transcribe text from an image using Ollama.
         
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or the already-read image bytes
             prompt: Optional custom prompt for transcription
             
         Returns:
@@ -39,10 +46,7 @@ def transcribe_image(
         Raises:
             IntelligenceError: If transcription fails
         """
-        image_path = Path(image_path)
-        
-        if not image_path.exists():
-            raise IntelligenceError(f"Image file not found: {image_path}")
+        image_data = read_image_bytes(image_path)
         
         # Use default prompt if none provided
         if prompt is None:
@@ -51,7 +55,7 @@ def transcribe_image(
         
         try:
             # Encode the image
-            base64_image = self._encode_image(image_path)
+            base64_image = self._encode_image(image_data)
             
             # Prepare the request payload
             payload = {
@@ -62,10 +66,9 @@ def transcribe_image(
             }
             
             # Send request to Ollama
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(f"{self.base_url}/api/generate", json=payload)
-                response.raise_for_status()
-                result = response.json()
+            response = self.http_client.post(f"{self.base_url}/api/generate", json=payload)
+            response.raise_for_status()
+            result = response.json()
             
             return result.get("response", "")
         
@@ -110,16 +113,31 @@ def transcribe_text(
             }
             
             # Send request to Ollama
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(f"{self.base_url}/api/generate", json=payload)
-                response.raise_for_status()
-                result = response.json()
+            response = self.http_client.post(f"{self.base_url}/api/generate", json=payload)
+            response.raise_for_status()
+            result = response.json()
             
             return result.get("response", "")
         
         except Exception as e:
             raise IntelligenceError(f"Failed to process text with Ollama: {e}")
     
+    def warmup(self) -> None:
+        """Load the model into Ollama's memory ahead of the first request.
+        
+        A generate request without a prompt makes Ollama load the model and
+        return immediately. Failures are ignored; the first real request will
+        surface any connection problem.
+        """
+        try:
+            self.http_client.post(f"{self.base_url}/api/generate", json={"model": self.model})
+        except Exception:
+            pass
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client."""
+        self.http_client.close()
+    
     def supports_image_input(self) -> bool:
         """Check if Ollama supports direct image input.
         
@@ -146,10 +164,9 @@ def get_model_info(self) -> Dict[str, Any]:
         """
         try:
             # Check if model is loaded
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(f"{self.base_url}/api/tags")
-                response.raise_for_status()
-                result = response.json()
+            response = self.http_client.get(f"{self.base_url}/api/tags")
+            response.raise_for_status()
+            result = response.json()
             
             models = result.get("models", [])
             
@@ -177,15 +194,13 @@ def get_model_info(self) -> Dict[str, Any]:
                 "message": f"Failed to get model info: {e}"
             }
     
-    def _encode_image(self, image_path: Union[str, Path]) -> str:
+    def _encode_image(self, image_path: ImageInput) -> str:
         """Encode image to base64.
         
         Args:
-            image_path: Path to the image
+            image_path: Path to the image, or the image bytes
             
         Returns:
             Base64 encoded image
         """
-        image_path = Path(image_path)
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
\ No newline at end of file
+        return encode_image_base64(image_path)
\ No newline at end of file
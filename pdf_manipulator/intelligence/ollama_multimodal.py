@@ -1,6 +1,5 @@
 """Enhanced Ollama backend with multimodal support for semantic extraction."""
 import os
-import base64
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional, Union, List
@@ -8,9 +7,15 @@
 
 import httpx
 
-from .base import IntelligenceBackend
+from .base import IntelligenceBackend, ImageInput, encode_image_base64
 from ..core.exceptions import IntelligenceError, ProcessingError
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class OllamaMultimodalBackend(IntelligenceBackend):
     """Enhanced Ollama backend with LLaVA and multimodal support."""
@@ -19,13 +24,16 @@ def __init__(self,
                  model: str = "llava:latest",
                  base_url: str = "http://localhost:11434",
                  timeout: int = 120,
-                 logger: Optional[logging.Logger] = None):
+                 logger: Optional[logging.Logger] = None,
+                 max_connections: int = 4):
         """Initialize enhanced Ollama backend.
         
         Args:
             model: Model to use (e.g., llava, bakllava)
             base_url: Ollama server URL
             timeout: Request timeout in seconds
+            max_connections: Keep-alive connections held in the HTTP pool; match the
+                             number of concurrent page requests so none reconnect
         """
         super().__init__()
         self.model = model
@@ -33,6 +41,15 @@ def __init__(self,
         self.timeout = timeout
         self.logger = logger or logging.getLogger(__name__)
         
+        # One pooled client for all requests so connections are reused across pages.
+        # HTTP/2 is only negotiated over TLS, where concurrent pages then share one
+        # multiplexed connection (e.g. a remote server behind a reverse proxy)
+        self.http_client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=max_connections),
+            http2=HTTP2_AVAILABLE and base_url.startswith("https://"),
+        )
+        
         # Multimodal models
         self.multimodal_models = {
             "llava", "llava-v1.6", "llava:latest",
@@ -51,12 +68,12 @@ def __init__(self,
         self.logger.info(f"Initialized Ollama backend with model: {model}")
     
     def transcribe_image(self, 
-                        image_path: Union[str, Path],
+                        image_path: ImageInput,
                         prompt: Optional[str] = None) -> str:
         """Transcribe text from an image using multimodal model.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file, or the already-read image bytes
             prompt: Optional custom prompt
             
         Returns:
@@ -66,13 +83,7 @@ def transcribe_image(self,
             prompt = "Extract all text from this image. Focus on accuracy and preserve formatting."
         
         # Read and encode image
-        image_path = Path(image_path)
-        if not image_path.exists():
-            raise IntelligenceError(f"Image not found: {image_path}")
-            
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-        image_b64 = base64.b64encode(image_data).decode()
+        image_b64 = encode_image_base64(image_path)
         
         return self.process(prompt, image_b64)
     
@@ -95,17 +106,19 @@ def transcribe_text(self,
         return self.process(prompt)
     
     def process_page_with_context(self,
-                                 image_path: Union[str, Path],
+                                 image_path: ImageInput,
                                  extracted_text: str,
-                                 context: Optional[Dict[str, Any]] = None) -> str:
+                                 context: Optional[Dict[str, Any]] = None,
+                                 response_schema: Optional[Dict[str, Any]] = None) -> str:
         """Process page with both extracted text and image for enhanced understanding.
         
         This is the key method for our enhanced semantic pipeline flow.
         
         Args:
-            image_path: Path to page image
+            image_path: Path to page image, or the already-read image bytes
             extracted_text: Previously extracted text (OCR/markitdown) or a unified prompt
             context: Additional context (TOC, previous summaries, etc.)
+            response_schema: Optional JSON schema the response must follow
             
         Returns:
             Enhanced semantic analysis
@@ -152,15 +165,12 @@ def process_page_with_context(self,
                     prompt = f"CURRENT SECTION: {context['current_section']}\n\n{prompt}"
         
         # Read and encode image
-        image_path = Path(image_path)
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-        image_b64 = base64.b64encode(image_data).decode()
+        image_b64 = encode_image_base64(image_path)
         
         # Log that we're making a single call to process the page
         self.logger.info(f"Making single call to Ollama model: {self.model} for comprehensive page analysis")
         
-        return self.process(prompt, image_b64, json_mode=True)
+        return self.process(prompt, image_b64, json_mode=True, response_schema=response_schema)
     
     def process(self, prompt: str, image: Optional[str] = None, 
                **kwargs) -> str:
@@ -169,7 +179,8 @@ def process(self, prompt: str, image: Optional[str] = None,
         Args:
             prompt: Text prompt for the model
             image: Base64 encoded image (optional)
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters; json_mode requests JSON output and
+                      response_schema constrains it to a JSON schema
             
         Returns:
             Model response text
@@ -192,19 +203,19 @@ def process(self, prompt: str, image: Optional[str] = None,
             
             # Add format if JSON mode requested
             if kwargs.get("json_mode"):
-                payload["format"] = "json"
+                # Ollama accepts a JSON schema here for structured outputs
+                payload["format"] = kwargs.get("response_schema") or "json"
                 # Ensure prompt mentions JSON format
                 if "json" not in prompt.lower():
                     payload["prompt"] = prompt + "\n\nRespond in valid JSON format."
             
             # Send request
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(
-                    f"{self.base_url}/api/generate",
-                    json=payload
-                )
-                response.raise_for_status()
-                result = response.json()
+            response = self.http_client.post(
+                f"{self.base_url}/api/generate",
+                json=payload
+            )
+            response.raise_for_status()
+            result = response.json()
             
             content = result.get("response", "")
             self.logger.debug(f"Ollama response: {content[:200]}...")
@@ -262,6 +273,22 @@ def process_document_page(self,
                 "evidence": []
             }
     
+    def warmup(self) -> None:
+        """Load the model into Ollama's memory ahead of the first request.
+        
+        A generate request without a prompt makes Ollama load the model and
+        return immediately.
+        """
+        try:
+            self.http_client.post(f"{self.base_url}/api/generate", json={"model": self.model})
+            self.logger.debug(f"Warmed up Ollama model: {self.model}")
+        except Exception as e:
+            self.logger.debug(f"Ollama warmup failed: {e}")
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client."""
+        self.http_client.close()
+    
     def supports_batch_processing(self) -> bool:
         """Check if backend supports batch processing."""
         return False  # Ollama processes one at a time
@@ -323,17 +350,16 @@ def _build_semantic_prompt(self, page_text: str,
     def _verify_connection(self):
         """Verify connection to Ollama server."""
         try:
-            with httpx.Client(timeout=5) as client:
-                response = client.get(f"{self.base_url}/api/tags")
-                response.raise_for_status()
+            response = self.http_client.get(f"{self.base_url}/api/tags", timeout=5)
+            response.raise_for_status()
                 
-                # Check if our model is available
-                result = response.json()
-                models = result.get("models", [])
-                model_names = [m.get("name", "").lower() for m in models]
+            # Check if our model is available
+            result = response.json()
+            models = result.get("models", [])
+            model_names = [m.get("name", "").lower() for m in models]
                 
-                if self.model.lower() not in model_names:
-                    self.logger.warning(f"Model {self.model} not found. Available: {model_names}")
+            if self.model.lower() not in model_names:
+                self.logger.warning(f"Model {self.model} not found. Available: {model_names}")
                     
         except Exception as e:
             self.logger.warning(f"Could not verify Ollama connection: {e}")
@@ -343,20 +369,19 @@ def download_model(self, model_name: Optional[str] = None):
         model = model_name or self.model
         
         try:
-            with httpx.Client(timeout=None) as client:  # No timeout for downloads
-                response = client.post(
-                    f"{self.base_url}/api/pull",
-                    json={"name": model},
-                    timeout=None
-                )
-                response.raise_for_status()
+            response = self.http_client.post(
+                f"{self.base_url}/api/pull",
+                json={"name": model},
+                timeout=None
+            )
+            response.raise_for_status()
                 
-                # Stream the response to show progress
-                for line in response.iter_lines():
-                    if line:
-                        data = json.loads(line)
-                        if "status" in data:
-                            self.logger.info(f"Download status: {data['status']}")
+            # Stream the response to show progress
+            for line in response.iter_lines():
+                if line:
+                    data = json.loads(line)
+                    if "status" in data:
+                        self.logger.info(f"Download status: {data['status']}")
                             
         except Exception as e:
             raise ProcessingError(f"Failed to download model {model}: {e}")
@@ -364,10 +389,9 @@ def download_model(self, model_name: Optional[str] = None):
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model."""
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(f"{self.base_url}/api/tags")
-                response.raise_for_status()
-                result = response.json()
+            response = self.http_client.get(f"{self.base_url}/api/tags")
+            response.raise_for_status()
+            result = response.json()
             
             models = result.get("models", [])
             
@@ -402,10 +426,9 @@ def get_model_info(self) -> Dict[str, Any]:
     def list_available_models(self) -> List[Dict[str, Any]]:
         """List all available models on the Ollama server."""
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(f"{self.base_url}/api/tags")
-                response.raise_for_status()
-                result = response.json()
+            response = self.http_client.get(f"{self.base_url}/api/tags")
+            response.raise_for_status()
+            result = response.json()
             
             models = result.get("models", [])
             
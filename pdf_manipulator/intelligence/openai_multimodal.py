@@ -1,6 +1,5 @@
 """OpenAI multimodal backend with GPT-4V support."""
 import os
-import base64
 import json
 import time
 from typing import Dict, List, Optional, Any, Union
@@ -27,7 +26,7 @@
         APITimeoutError = Exception
         RateLimitError = Exception
 
-from .base import IntelligenceBackend
+from .base import IntelligenceBackend, ImageInput, encode_image_base64
 from ..core.exceptions import ProcessingError
 
 
@@ -40,7 +39,9 @@ def __init__(self,
                  max_tokens: int = 4096,
                  temperature: float = 0.1,
                  timeout: int = 60,
-                 logger: Optional[logging.Logger] = None):
+                 logger: Optional[logging.Logger] = None,
+                 base_url: Optional[str] = None,
+                 local_media: bool = False):
         """Initialize OpenAI multimodal backend.
         
         Args:
@@ -49,6 +50,10 @@ def __init__(self,
             max_tokens: Maximum tokens in response
             temperature: Model temperature (0-1)
             timeout: Request timeout in seconds
+            base_url: OpenAI-compatible server URL, e.g. a local vLLM server
+            local_media: Send image files as file:// URLs instead of base64 data.
+                         The server must be able to read them (vLLM
+                         --allowed-local-media-path)
         """
         super().__init__()
         self.logger = logger or logging.getLogger(__name__)
@@ -65,7 +70,8 @@ def __init__(self,
         masked_key = f"{api_key[:5]}...{api_key[-4:]}" if len(api_key) > 10 else "***"
         self.logger.debug(f"Using API key: {masked_key}")
         
-        self.client = OpenAI(api_key=api_key, timeout=timeout)
+        self.client = OpenAI(api_key=api_key, timeout=timeout, base_url=base_url)
+        self.local_media = local_media
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
@@ -90,7 +96,8 @@ def process(self, prompt: str, image: Optional[str] = None,
         Args:
             prompt: Text prompt for the model
             image: Base64 encoded image (optional)
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters; json_mode requests JSON output and
+                      response_schema constrains it to a JSON schema
             
         Returns:
             Model response text
@@ -109,7 +116,7 @@ def process(self, prompt: str, image: Optional[str] = None,
         
         try:
             # Build messages
-            messages = self._build_messages(prompt, image)
+            messages = self._build_messages(prompt, image, kwargs.get("image_url"))
             
             # Log the request details
             has_image = image is not None
@@ -117,6 +124,16 @@ def process(self, prompt: str, image: Optional[str] = None,
             self.logger.info(f"Calling OpenAI API - Model: {self.model}, Has Image: {has_image}, JSON Mode: {json_mode}")
             self.logger.debug(f"Prompt length: {len(prompt)} chars, Image size: {len(image) if image else 0} bytes")
             
+            # Structured output: a JSON schema (also honoured by vLLM's OpenAI server) or plain JSON mode
+            response_format = None
+            if kwargs.get("response_schema"):
+                response_format = {
+                    "type": "json_schema",
+                    "json_schema": {"name": "response", "schema": kwargs["response_schema"]},
+                }
+            elif kwargs.get("json_mode"):
+                response_format = {"type": "json_object"}
+            
             # Make API call with retries
             max_retries = 3
             retry_count = 0
@@ -130,7 +147,7 @@ def process(self, prompt: str, image: Optional[str] = None,
                         messages=messages,
                         max_tokens=self.max_tokens,
                         temperature=self.temperature,
-                        response_format={"type": "json_object"} if kwargs.get("json_mode") else None
+                        response_format=response_format
                     )
                     
                     # Extract response
@@ -273,22 +290,28 @@ def process_document_page(self,
                 "evidence": []
             }
     
+    def close(self) -> None:
+        """Close the OpenAI client's HTTP connection pool."""
+        self.client.close()
+    
     def supports_batch_processing(self) -> bool:
         """Check if backend supports batch processing."""
         return False  # OpenAI processes one at a time
         
     def process_page_with_context(self,
-                               image_path: Union[str, Path],
+                               image_path: ImageInput,
                                extracted_text: str,
-                               context: Optional[Dict[str, Any]] = None) -> str:
+                               context: Optional[Dict[str, Any]] = None,
+                               response_schema: Optional[Dict[str, Any]] = None) -> str:
         """Process page with both extracted text and image for enhanced understanding.
         
         This is the key method for our enhanced semantic pipeline flow.
         
         Args:
-            image_path: Path to page image
+            image_path: Path to page image, or the already-read image bytes
             extracted_text: Previously extracted text (OCR/markitdown) or a unified prompt
             context: Additional context (TOC, previous summaries, etc.)
+            response_schema: Optional JSON schema the response must follow
             
         Returns:
             Enhanced semantic analysis
@@ -302,18 +325,33 @@ def process_page_with_context(self,
             # Build traditional enhanced prompt combining extracted text and image analysis
             prompt = self._build_semantic_prompt(extracted_text, context)
         
-        # Read and encode image
-        image_path = Path(image_path)
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-        image_b64 = base64.b64encode(image_data).decode()
-        
         # Make single API call with both the prompt and image
         self.logger.info(f"Making single call to OpenAI model: {self.model} for comprehensive page analysis")
         
-        return self.process(prompt, image_b64, json_mode=True)
+        return self.process_with_image_path(prompt, image_path, json_mode=True, response_schema=response_schema)
+    
+    def process_with_image_path(self, prompt: str, image_path: ImageInput, **kwargs) -> str:
+        """Process a prompt with an image, passing the file by URL when possible.
+        
+        With local_media enabled, image files are referenced by file:// URL so
+        the server reads them directly and no base64 copy is built or sent.
+        Otherwise, and for image bytes, this is the same as process() with the
+        base64-encoded image.
+        
+        Args:
+            prompt: Text prompt for the model
+            image_path: Path to the image file, or the image bytes
+            **kwargs: Additional parameters passed to process()
+            
+        Returns:
+            Model response text
+        """
+        if self.local_media and not isinstance(image_path, (bytes, bytearray, memoryview)):
+            return self.process(prompt, image_url=Path(image_path).resolve().as_uri(), **kwargs)
+        return self.process(prompt, encode_image_base64(image_path), **kwargs)
     
-    def _build_messages(self, prompt: str, image: Optional[str] = None) -> List[Dict]:
+    def _build_messages(self, prompt: str, image: Optional[str] = None,
+                        image_url: Optional[str] = None) -> List[Dict]:
         """Build messages for OpenAI API."""
         messages = [
             {
@@ -333,11 +371,11 @@ def _build_messages(self, prompt: str, image: Optional[str] = None) -> List[Dict
         })
         
         # Add image if available and model supports it
-        if image and self.supports_vision:
+        if (image or image_url) and self.supports_vision:
             user_content.append({
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/jpeg;base64,{image}",
+                    "url": image_url or f"data:image/jpeg;base64,{image}",
                     "detail": "high"  # High detail for document analysis
                 }
             })
@@ -441,11 +479,9 @@ def supports_image_input(self) -> bool:
         """Check if backend supports image input."""
         return self.supports_vision
         
-    def transcribe_image(self, image_path: Union[str, Path]) -> str:
+    def transcribe_image(self, image_path: ImageInput) -> str:
         """Transcribe image to text - required by IntelligenceBackend."""
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-        image_b64 = base64.b64encode(image_data).decode()
+        image_b64 = encode_image_base64(image_path)
         
         prompt = "Extract all text from this image, preserving structure and formatting as much as possible."
         return self.process(prompt, image_b64)
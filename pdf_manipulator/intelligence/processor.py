@@ -1,13 +1,209 @@
 """Document processor integrating intelligence backends."""
+import json
 import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List, Callable
+from typing import Dict, Any, Optional, Union, List, Callable, Tuple, Generator
 
-from pdf_manipulator.intelligence.base import IntelligenceBackend, IntelligenceManager, IntelligenceError
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from pdf_manipulator.intelligence.base import (
+    IntelligenceBackend, IntelligenceManager, IntelligenceError, ImageInput,
+    image_digest, read_image_bytes,
+)
 from pdf_manipulator.utils.logging_config import get_logger, LogMessages
 
 logger = get_logger("intelligence")
 
+# Suffix of the partial-TOC checkpoint written next to the page markdown files
+CHECKPOINT_SUFFIX = "_toc_checkpoint.json"
+
+# Pages at least this long are counted with NumPy instead of str.split()
+_VECTORIZED_WORD_COUNT_MIN = 64 * 1024
+
+# Byte lookup table of the ASCII whitespace recognised by str.split()
+_ASCII_WHITESPACE = np.zeros(256, dtype=bool)
+_ASCII_WHITESPACE[[0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20]] = True
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _count_words_compiled(buf, is_space):
+        """Count word starts in a byte buffer in a single compiled pass."""
+        count = 0
+        in_word = False
+        for byte in buf:
+            if is_space[byte]:
+                in_word = False
+            elif not in_word:
+                count += 1
+                in_word = True
+        return count
+
+
+def _prefetch_file(path: Path) -> None:
+    """Ask the OS to start reading a file into the page cache.
+    
+    POSIX_FADV_WILLNEED schedules readahead and returns immediately, so the
+    next page image loads from disk while the current page is transcribed.
+    No-op on platforms without posix_fadvise.
+    
+    Args:
+        path: File to prefetch
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _has_content(path: Path) -> bool:
+    """Check whether a file exists and is non-empty."""
+    try:
+        return path.stat().st_size > 0
+    except OSError:
+        return False
+
+
+def _checkpointed_page(
+    completed_pages: Optional[Dict[str, Dict[str, Any]]],
+    output_dir: Path,
+    image_path: Path,
+) -> Optional[Dict[str, Any]]:
+    """Return a page's info from an earlier run if its markdown file is non-empty."""
+    if not completed_pages:
+        return None
+    done = completed_pages.get(image_path.name)
+    if done is not None and _has_content(output_dir / done.get("markdown_file", f"{image_path.stem}.md")):
+        return done
+    return None
+
+
+def _load_checkpoint(checkpoint_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load completed pages from a TOC checkpoint.
+    
+    Args:
+        checkpoint_path: Checkpoint file written by _save_checkpoint()
+        
+    Returns:
+        Page info dictionaries keyed by image file name (empty if there is
+        no usable checkpoint)
+    """
+    if not checkpoint_path.exists():
+        return {}
+    
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            pages = json.load(f).get("pages", [])
+        return {page["image_file"]: page for page in pages if "image_file" in page}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {checkpoint_path}: {e}")
+        return {}
+
+
+def _save_checkpoint(checkpoint_path: Path, pages: List[Dict[str, Any]]) -> None:
+    """Atomically write completed pages to a TOC checkpoint.
+    
+    Args:
+        checkpoint_path: Checkpoint file path
+        pages: Page info dictionaries completed so far
+    """
+    tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"pages": pages}, f)
+        os.replace(tmp_path, checkpoint_path)
+    except OSError as e:
+        logger.warning(f"Failed to write checkpoint {checkpoint_path}: {e}")
+
+
+def _write_page_markdown(md_path: Path, page_number: int, text: str) -> bool:
+    """Write a page transcript to its markdown file.
+    
+    Each page is written as soon as it is transcribed so completed pages
+    are on disk even if a later page fails. If the file already holds
+    exactly this content (e.g. on a rerun) it is left untouched, keeping
+    its mtime for downstream tools; otherwise it is replaced atomically.
+    
+    Args:
+        md_path: Markdown file path
+        page_number: 1-based page number used in the heading
+        text: Page text
+        
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    header = f"# Page {page_number}\n\n".encode('utf-8')
+    body = text.encode('utf-8')
+    
+    # Only read the existing file when its size matches
+    try:
+        if md_path.stat().st_size == len(header) + len(body):
+            existing = memoryview(md_path.read_bytes())
+            if existing[:len(header)] == header and existing[len(header):] == body:
+                return False
+    except OSError:
+        pass
+    
+    tmp_path = md_path.with_name(md_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        # Write heading and body separately rather than copying the whole text into a new buffer
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, md_path)
+    return True
+
+
+def _text_stats(text: str) -> Tuple[str, int]:
+    """Get the first line and word count of a page transcript.
+    
+    The first line is sliced at the first newline rather than splitting the
+    whole text. Large ASCII transcripts are word-counted by locating word
+    starts in a byte array (with a Numba-compiled scanner when numba is
+    installed), avoiding a list of every token on the page.
+    
+    Args:
+        text: Page text
+        
+    Returns:
+        Tuple of (first line, word count)
+    """
+    if not text:
+        return "", 0
+    
+    newline = text.find('\n')
+    first_line = text[:newline] if newline >= 0 else text
+    
+    if len(text) < _VECTORIZED_WORD_COUNT_MIN or not text.isascii():
+        return first_line, len(text.split())
+    
+    buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    if NUMBA_AVAILABLE:
+        return first_line, int(_count_words_compiled(buf, _ASCII_WHITESPACE))
+    
+    is_space = _ASCII_WHITESPACE[buf]
+    word_starts = ~is_space
+    word_starts[1:] &= is_space[:-1]
+    return first_line, int(np.count_nonzero(word_starts))
+
 
 class DocumentProcessor:
     """Document processor using intelligence backends."""
@@ -17,6 +213,9 @@ def __init__(
         intelligence_backend: IntelligenceBackend,
         ocr_processor: Optional[Callable] = None,
         use_ocr_fallback: bool = False,
+        max_attempts: int = 3,
+        retry_backoff: float = 0.5,
+        transcription_cache_size: int = 128,
     ):
         """Initialize the document processor.
         
@@ -24,24 +223,81 @@ def __init__(
             intelligence_backend: Intelligence backend instance
             ocr_processor: OCR processor function (deprecated - kept for compatibility)
             use_ocr_fallback: Whether to use OCR as fallback (deprecated - kept for compatibility)
+            max_attempts: Maximum attempts for a backend call that fails transiently
+            retry_backoff: Base delay in seconds for exponential backoff between attempts
+            transcription_cache_size: Number of image transcriptions kept for reuse
+                by identical images (0 disables the cache)
         """
         self.intelligence = intelligence_backend
         self.ocr_processor = None  # OCR methods removed
         self.use_ocr_fallback = False  # OCR fallback disabled
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        
+        # Background backend warmup started by start_warmup()
+        self._warmup_thread = None
+        
+        # LRU of transcriptions keyed by image content digest and prompt
+        self.transcription_cache_size = transcription_cache_size
+        self._transcription_cache = OrderedDict()
         
         # Optional semantic processor for enhanced pipeline
         self.semantic_processor = None
         self.use_semantic_pipeline = False
     
+    def close(self) -> None:
+        """Release the backend's pooled connections."""
+        self.intelligence.close()
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+    
+    def start_warmup(self) -> None:
+        """Warm up the intelligence backend in a background thread.
+        
+        Model loading then overlaps with whatever the caller does next
+        (typically rendering page images) instead of delaying the first page.
+        """
+        if self._warmup_thread is not None:
+            return
+        
+        def _warmup():
+            try:
+                self.intelligence.warmup()
+            except Exception as e:
+                logger.debug(f"Backend warmup failed: {e}")
+        
+        self._warmup_thread = threading.Thread(target=_warmup, name="backend-warmup", daemon=True)
+        self._warmup_thread.start()
+    
+    def ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a background warmup to finish.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            True if no warmup is running, False if it is still in progress
+        """
+        if self._warmup_thread is None:
+            return True
+        self._warmup_thread.join(timeout)
+        return not self._warmup_thread.is_alive()
+    
     def process_image(
         self,
-        image_path: Union[str, Path],
+        image_path: ImageInput,
         custom_prompt: Optional[str] = None,
     ) -> str:
         """Process an image using the intelligence backend.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file, or the already-read image bytes
             custom_prompt: Optional custom prompt for processing
             
         Returns:
@@ -50,24 +306,110 @@ def process_image(
         Raises:
             IntelligenceError: If processing fails
         """
-        image_path = Path(image_path)
+        # Read the image once; backends consume the bytes without reopening the file
+        image_data = read_image_bytes(image_path)
         
-        if not image_path.exists():
-            raise IntelligenceError(f"Image file not found: {image_path}")
+        # Check if backend supports direct image input
+        if not self.intelligence.supports_image_input():
+            raise IntelligenceError(
+                f"Backend {self.intelligence.get_name()} doesn't support image input."
+            )
         
-        try:
-            # Check if backend supports direct image input
-            if self.intelligence.supports_image_input():
-                # Process with intelligence backend
-                return self.intelligence.transcribe_image(image_path, prompt=custom_prompt)
-            else:
-                raise IntelligenceError(
-                    f"Backend {self.intelligence.get_name()} doesn't support image input."
+        # Identical images (blank pages, repeated covers) reuse the earlier transcription
+        cache_key = None
+        if self.transcription_cache_size > 0:
+            cache_key = (image_digest(image_data), custom_prompt)
+            cached = self._transcription_cache.get(cache_key)
+            if cached is not None:
+                self._transcription_cache.move_to_end(cache_key)
+                logger.debug("Reusing cached transcription for identical image")
+                return cached
+        
+        # Process with intelligence backend, retrying transient failures
+        text = self._call_with_retry(
+            self.intelligence.transcribe_image, image_data, prompt=custom_prompt
+        )
+        
+        if cache_key is not None:
+            self._transcription_cache[cache_key] = text
+            if len(self._transcription_cache) > self.transcription_cache_size:
+                self._transcription_cache.popitem(last=False)
+        
+        return text
+    
+    def _call_with_retry(self, func: Callable, *args, **kwargs) -> Any:
+        """Call a backend method, retrying transient failures with backoff.
+        
+        Delays grow exponentially from retry_backoff with a little jitter so
+        concurrent callers don't retry in lockstep. Errors the backend does
+        not consider transient are raised immediately.
+        
+        Args:
+            func: Backend method to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            Result of func
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt + 1 >= self.max_attempts or not self.intelligence.is_transient(e):
+                    raise
+                delay = self.retry_backoff * (2 ** attempt) + random.uniform(0, 0.1)
+                logger.warning(
+                    f"Transient backend error (attempt {attempt + 1}/{self.max_attempts}), "
+                    f"retrying in {delay:.1f}s: {e}"
                 )
+                time.sleep(delay)
+    
+    def _process_semantic_window(
+        self,
+        paths: List[Path],
+        start: int,
+        previous_pages: List[Dict[str, Any]],
+        output_dir: Path,
+        completed_pages: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run the semantic pipeline on the pages starting at start.
         
-        except Exception as e:
-            # Re-raise original error
-            raise
+        Up to max_concurrent_requests pages go through process_pages()
+        together so their enhancement requests are in flight at once. The
+        window's own summaries are not known yet, so every page in it gets
+        the summaries of the pages before the window as context.
+        
+        Args:
+            paths: Paths of all page images
+            start: Index of the first page of the window
+            previous_pages: Page info of the (up to two) pages before the window
+            output_dir: Directory for output files
+            completed_pages: Page info from an earlier run; the window ends
+                before the first checkpointed page
+            
+        Returns:
+            Semantic pipeline results for the window's pages, in order
+        """
+        stop = min(start + self.semantic_processor.max_concurrent_requests, len(paths))
+        for j in range(start + 1, stop):
+            if _checkpointed_page(completed_pages, output_dir, paths[j]) is not None:
+                stop = j
+                break
+        
+        summarized = [page for page in previous_pages if page.get("semantic_summary")]
+        pages = [
+            (paths[j], j + 1, {
+                'page_number': j + 1,
+                'total_pages': len(paths),
+                'previous_summaries': [page["semantic_summary"] for page in summarized],
+                'previous_page_numbers': [page["page_number"] for page in summarized],
+            })
+            for j in range(start, stop)
+        ]
+        if len(pages) > 1:
+            logger.info(f"Using semantic pipeline for pages {start + 1}-{stop}")
+        return self.semantic_processor.process_pages(pages, output_dir)
     
     def process_text(
         self,
@@ -91,15 +433,53 @@ def process_text(
         
         return self.intelligence.transcribe_text(text, prompt_template=custom_prompt_template)
     
-    def transcribe_document_pages(
+    def iter_document_pages(
         self,
         image_paths: List[Union[str, Path]],
         output_dir: Union[str, Path],
         base_filename: str,
         custom_prompt: Optional[str] = None,
-        extract_first: bool = True,
-    ) -> Dict[str, Any]:
-        """Process multiple document pages and create a structured TOC.
+        completed_pages: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        """Process document pages one at a time, yielding each page's TOC entry.
+        
+        Only the last two page entries are retained (for previous-page
+        context), so memory stays constant regardless of document length.
+        
+        Args:
+            image_paths: List of paths to page images
+            output_dir: Directory for output files
+            base_filename: Base name for output files
+            custom_prompt: Custom prompt for processing
+            completed_pages: Page info from an earlier run keyed by image file
+                name; these pages are reused if their markdown file is non-empty
+            
+        Yields:
+            Page info dictionary for each processed page
+            
+        Returns:
+            TOC header dictionary (everything except "pages"), available as
+            the StopIteration value once the generator is exhausted
+            
+        Raises:
+            IntelligenceError: If processing fails
+        """
+        try:
+            toc = self._build_toc_header(base_filename, len(image_paths))
+        except Exception as e:
+            raise IntelligenceError(f"Failed to process document: {e}")
+        
+        yield from self._iter_pages(image_paths, output_dir, custom_prompt, completed_pages)
+        return toc
+    
+    def _iter_pages(
+        self,
+        image_paths: List[Union[str, Path]],
+        output_dir: Union[str, Path],
+        custom_prompt: Optional[str] = None,
+        completed_pages: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Process document pages, yielding the TOC entry for each one.
         
         Uses enhanced flow when backend supports it:
         1. First extract text using markitdown/OCR
@@ -108,38 +488,48 @@ def transcribe_document_pages(
         Args:
             image_paths: List of paths to page images
             output_dir: Directory for output files
-            base_filename: Base name for output files
             custom_prompt: Custom prompt for processing
+            completed_pages: Page info from an earlier run keyed by image file name
             
-        Returns:
-            Dictionary with document structure
+        Yields:
+            Page info dictionary for each processed page
             
         Raises:
             IntelligenceError: If processing fails
         """
         output_dir = Path(output_dir)
-        os.makedirs(output_dir, exist_ok=True)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Normalize paths once instead of re-wrapping on every iteration
+        paths = [p if isinstance(p, Path) else Path(p) for p in image_paths]
+        total_pages = len(paths)
         
         try:
-            toc = {
-                "document_name": base_filename,
-                "total_pages": len(image_paths),
-                "backend": self.intelligence.get_name(),
-                "pages": []
-            }
+            # Last two pages, used as context for the next page
+            recent_pages = deque(maxlen=2)
             
-            # Add model info if available
-            model_info = self.intelligence.get_model_info()
-            if model_info:
-                toc["model_info"] = model_info
+            # Semantic pipeline results of the current window, by page index
+            window_results = {}
             
             # Process each page
-            for i, image_path in enumerate(image_paths):
-                image_path = Path(image_path)
+            for i, image_path in enumerate(paths):
+                stem = image_path.stem
                 page_num = i
                 
+                # Reuse pages finished by an earlier, interrupted run
+                done = _checkpointed_page(completed_pages, output_dir, image_path)
+                if done is not None:
+                    logger.debug(f"Reusing checkpointed page {page_num + 1}")
+                    recent_pages.append(done)
+                    yield done
+                    continue
+                
+                # Warm the page cache for the next image while this one is processed
+                if i + 1 < total_pages:
+                    _prefetch_file(paths[i + 1])
+                
                 # Process the image
-                logger.info(LogMessages.PAGE_TRANSCRIBE.format(current=i+1, total=len(image_paths)))
+                logger.info(LogMessages.PAGE_TRANSCRIBE, i + 1, total_pages)
                 
                 # Initialize flow flags
                 has_enhanced_flow = False
@@ -150,31 +540,12 @@ def transcribe_document_pages(
                     logger.info(f"Using semantic pipeline for page {i+1} - use_semantic_pipeline={self.use_semantic_pipeline}")
                     has_enhanced_flow = True
                     
-                    # Build context
-                    context = {
-                        'page_number': i + 1,
-                        'total_pages': len(image_paths),
-                        'previous_summaries': []
-                    }
-                    
-                    # Add previous summaries
-                    if i > 0:
-                        prev_summaries = []
-                        for j in range(max(0, i-2), i):
-                            prev_page = toc["pages"][j]
-                            if "semantic_analysis" in prev_page:
-                                summary = prev_page["semantic_analysis"].get("semantic_summary", "")
-                                if summary:
-                                    prev_summaries.append(summary)
-                        context['previous_summaries'] = prev_summaries
-                    
-                    # Process through semantic pipeline
-                    result = self.semantic_processor.process_page(
-                        image_path=image_path,
-                        page_number=i + 1,
-                        context=context,
-                        output_dir=output_dir
-                    )
+                    # Process the next window of pages together when this one is not ready
+                    if i not in window_results:
+                        results = self._process_semantic_window(
+                            paths, i, list(recent_pages), output_dir, completed_pages)
+                        window_results = dict(enumerate(results, start=i))
+                    result = window_results.pop(i)
                     
                     # Extract enhanced text
                     text = result['extracted_text']
@@ -192,10 +563,13 @@ def transcribe_document_pages(
                     logger.debug(f"Using enhanced flow for page {i+1}")
                     has_enhanced_flow = True
                     
+                    # Read the page image once for both extraction and enhancement
+                    image_data = read_image_bytes(image_path)
+                    
                     # Step 1: Use backend's direct extraction if available
                     try:
                         # Try direct transcription first
-                        extracted_text = self.intelligence.transcribe_image(str(image_path))
+                        extracted_text = self.intelligence.transcribe_image(image_data)
                     except Exception as e:
                         logger.warning(f"Direct extraction failed, continuing with empty text: {e}")
                         extracted_text = ""
@@ -203,15 +577,14 @@ def transcribe_document_pages(
                     # Step 2: Build context from previous pages
                     context = {
                         'page_number': i + 1,
-                        'total_pages': len(image_paths),
+                        'total_pages': total_pages,
                         'previous_summaries': []
                     }
                     
                     # Add previous page summaries for context
                     if i > 0:
                         prev_summaries = []
-                        for j in range(max(0, i-2), i):  # Last 2 pages
-                            prev_page = toc["pages"][j]
+                        for prev_page in recent_pages:  # Last 2 pages
                             if "semantic_summary" in prev_page:
                                 prev_summaries.append(prev_page["semantic_summary"])
                             elif "summary" in prev_page:
@@ -220,14 +593,13 @@ def transcribe_document_pages(
                     
                     # Step 3: Enhance with multimodal AI
                     enhanced_response = self.intelligence.process_page_with_context(
-                        image_path=image_path,
+                        image_path=image_data,
                         extracted_text=extracted_text,
                         context=context
                     )
                     
                     # Parse enhanced response
                     try:
-                        import json
                         enhanced_data = json.loads(enhanced_response)
                         text = enhanced_data.get('enhanced_text', extracted_text)
                         semantic_info = {
@@ -254,17 +626,15 @@ def transcribe_document_pages(
                     text_str = text if text else ""
 
                 # Save text to markdown file
-                md_path = output_dir / f"{image_path.stem}.md"
-                logger.info(LogMessages.PAGE_MARKDOWN.format(current=i+1, total=len(image_paths)))
-                with open(md_path, 'w', encoding='utf-8') as f:
-                    f.write(f"# Page {page_num + 1}\n\n{text_str}")
-                logger.debug(LogMessages.PAGE_COMPLETE.format(page=page_num+1))
+                md_path = output_dir / f"{stem}.md"
+                logger.info(LogMessages.PAGE_MARKDOWN, i + 1, total_pages)
+                _write_page_markdown(md_path, page_num + 1, text_str)
+                logger.debug(LogMessages.PAGE_COMPLETE, page_num + 1)
 
                 # Save JSON output if we have semantic data
                 if semantic_info:
                     try:
-                        import json
-                        json_path = output_dir / f"{image_path.stem}.json"
+                        json_path = output_dir / f"{stem}.json"
                         logger.info(f"Saving semantic JSON data for page {page_num + 1}")
                         with open(json_path, "w", encoding="utf-8") as f:
                             json.dump(semantic_info, f, indent=2)
@@ -273,12 +643,13 @@ def transcribe_document_pages(
 
                 
                 # Add page info to TOC
+                first_line, word_count = _text_stats(text_str)
                 page_info = {
                     "page_number": page_num + 1,
-                    "image_file": str(image_path.name),
-                    "markdown_file": str(md_path.name),
-                    "first_line": text_str.split('\n')[0] if text_str else "",
-                    "word_count": len(text_str.split()) if text_str else 0,
+                    "image_file": image_path.name,
+                    "markdown_file": md_path.name,
+                    "first_line": first_line,
+                    "word_count": word_count,
                     "enhanced_flow_used": has_enhanced_flow
                 }
                 
@@ -300,13 +671,96 @@ def transcribe_document_pages(
                         page_info["visual_elements"] = semantic_info.get("visual_elements", [])
                         page_info["corrections"] = semantic_info.get("corrections", [])
                 
-                toc["pages"].append(page_info)
-            
-            return toc
+                recent_pages.append(page_info)
+                yield page_info
         
         except Exception as e:
             raise IntelligenceError(f"Failed to process document: {e}")
             
+    def transcribe_document_pages(
+        self,
+        image_paths: List[Union[str, Path]],
+        output_dir: Union[str, Path],
+        base_filename: str,
+        custom_prompt: Optional[str] = None,
+        extract_first: bool = True,
+        checkpoint_interval: int = 10,
+    ) -> Dict[str, Any]:
+        """Process multiple document pages and create a structured TOC.
+        
+        Collects the output of iter_document_pages() into a single dictionary.
+        Completed pages are checkpointed to output_dir every
+        checkpoint_interval pages and when processing fails; a rerun picks
+        up the checkpoint and only processes the remaining pages. The
+        checkpoint is removed once the whole document succeeds.
+        
+        Args:
+            image_paths: List of paths to page images
+            output_dir: Directory for output files
+            base_filename: Base name for output files
+            custom_prompt: Custom prompt for processing
+            checkpoint_interval: Pages between checkpoint writes (0 disables checkpointing)
+            
+        Returns:
+            Dictionary with document structure
+            
+        Raises:
+            IntelligenceError: If processing fails
+        """
+        checkpoint_path = Path(output_dir) / f"{base_filename}{CHECKPOINT_SUFFIX}"
+        completed_pages = _load_checkpoint(checkpoint_path) if checkpoint_interval else {}
+        if completed_pages:
+            logger.info(f"Resuming from checkpoint with {len(completed_pages)} completed pages")
+        
+        pages = []
+        page_iter = self.iter_document_pages(
+            image_paths, output_dir, base_filename, custom_prompt, completed_pages
+        )
+        try:
+            while True:
+                try:
+                    pages.append(next(page_iter))
+                except StopIteration as stop:
+                    toc = stop.value
+                    break
+                
+                if checkpoint_interval and len(pages) % checkpoint_interval == 0:
+                    _save_checkpoint(checkpoint_path, pages)
+        except Exception:
+            if checkpoint_interval and pages:
+                _save_checkpoint(checkpoint_path, pages)
+                logger.warning(f"Saved {len(pages)} completed pages to checkpoint {checkpoint_path}")
+            raise
+        
+        if checkpoint_interval:
+            checkpoint_path.unlink(missing_ok=True)
+        
+        toc["pages"] = pages
+        return toc
+    
+    def _build_toc_header(self, base_filename: str, total_pages: int) -> Dict[str, Any]:
+        """Build the document-level fields of a TOC.
+        
+        Args:
+            base_filename: Base name for output files
+            total_pages: Number of pages in the document
+            
+        Returns:
+            TOC dictionary without the "pages" list
+        """
+        toc = {
+            "document_name": base_filename,
+            "total_pages": total_pages,
+            "backend": self.intelligence.get_name(),
+        }
+        
+        # Add model info if available
+        model_info = self.intelligence.get_model_info()
+        if model_info:
+            toc["model_info"] = model_info
+        
+        return toc
+    
     def process_document_pages_with_progress(
         self,
         image_paths: List[Union[str, Path]],
@@ -331,12 +785,16 @@ def process_document_pages_with_progress(
             IntelligenceError: If processing fails
         """
         output_dir = Path(output_dir)
-        os.makedirs(output_dir, exist_ok=True)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Normalize paths once instead of re-wrapping on every iteration
+        paths = [p if isinstance(p, Path) else Path(p) for p in image_paths]
+        total_pages = len(paths)
         
         try:
             toc = {
                 "document_name": base_filename,
-                "total_pages": len(image_paths),
+                "total_pages": total_pages,
                 "backend": self.intelligence.get_name(),
                 "pages": []
             }
@@ -346,18 +804,25 @@ def process_document_pages_with_progress(
             if model_info:
                 toc["model_info"] = model_info
             
+            # Semantic pipeline results of the current window, by page index
+            window_results = {}
+            
             # Process each page
-            for i, image_path in enumerate(image_paths):
-                image_path = Path(image_path)
+            for i, image_path in enumerate(paths):
+                stem = image_path.stem
                 page_num = i
                 
+                # Warm the page cache for the next image while this one is processed
+                if i + 1 < total_pages:
+                    _prefetch_file(paths[i + 1])
+                
                 # Update progress
                 if progress:
                     progress.update_stage("transcription", advance=1)
                     progress.update_page_status(page_num + 1)
                 
                 # Process the image
-                logger.info(LogMessages.PAGE_TRANSCRIBE.format(current=i+1, total=len(image_paths)))
+                logger.info(LogMessages.PAGE_TRANSCRIBE, i + 1, total_pages)
                 
                 # Initialize flow flags
                 has_enhanced_flow = False
@@ -368,31 +833,12 @@ def process_document_pages_with_progress(
                     logger.debug(f"Using semantic pipeline for page {i+1}")
                     has_enhanced_flow = True
                     
-                    # Build context
-                    context = {
-                        'page_number': i + 1,
-                        'total_pages': len(image_paths),
-                        'previous_summaries': []
-                    }
-                    
-                    # Add previous summaries
-                    if i > 0:
-                        prev_summaries = []
-                        for j in range(max(0, i-2), i):
-                            prev_page = toc["pages"][j]
-                            if "semantic_analysis" in prev_page:
-                                summary = prev_page["semantic_analysis"].get("semantic_summary", "")
-                                if summary:
-                                    prev_summaries.append(summary)
-                        context['previous_summaries'] = prev_summaries
-                    
-                    # Process through semantic pipeline
-                    result = self.semantic_processor.process_page(
-                        image_path=image_path,
-                        page_number=i + 1,
-                        context=context,
-                        output_dir=output_dir
-                    )
+                    # Process the next window of pages together when this one is not ready
+                    if i not in window_results:
+                        results = self._process_semantic_window(
+                            paths, i, toc["pages"][max(0, i-2):i], output_dir)
+                        window_results = dict(enumerate(results, start=i))
+                    result = window_results.pop(i)
                     
                     # Extract enhanced text
                     text = result['extracted_text']
@@ -410,16 +856,19 @@ def process_document_pages_with_progress(
                     logger.debug(f"Using enhanced flow for page {i+1}")
                     has_enhanced_flow = True
                     
+                    # Read the page image once for both extraction and enhancement
+                    image_data = read_image_bytes(image_path)
+                    
                     # Try direct transcription first
                     try:
-                        extracted_text = self.intelligence.transcribe_image(str(image_path))
+                        extracted_text = self.intelligence.transcribe_image(image_data)
                     except Exception as e:
                         logger.warning(f"Direct extraction failed, continuing with empty text: {e}")
                         extracted_text = ""
                     
                     context = {
                         'page_number': i + 1,
-                        'total_pages': len(image_paths),
+                        'total_pages': total_pages,
                         'previous_summaries': []
                     }
                     
@@ -433,13 +882,12 @@ def process_document_pages_with_progress(
                         context['previous_summaries'] = prev_summaries
                     
                     enhanced_response = self.intelligence.process_page_with_context(
-                        image_path=image_path,
+                        image_path=image_data,
                         extracted_text=extracted_text,
                         context=context
                     )
                     
                     try:
-                        import json
                         enhanced_data = json.loads(enhanced_response)
                         text = enhanced_data.get('enhanced_text', extracted_text)
                         semantic_info = enhanced_data
@@ -460,19 +908,19 @@ def process_document_pages_with_progress(
                     text_str = text if text else ""
                 
                 # Save text to markdown file
-                md_path = output_dir / f"{image_path.stem}.md"
-                logger.info(LogMessages.PAGE_MARKDOWN.format(current=i+1, total=len(image_paths)))
-                with open(md_path, 'w', encoding='utf-8') as f:
-                    f.write(f"# Page {page_num + 1}\n\n{text_str}")
-                logger.debug(LogMessages.PAGE_COMPLETE.format(page=page_num+1))
+                md_path = output_dir / f"{stem}.md"
+                logger.info(LogMessages.PAGE_MARKDOWN, i + 1, total_pages)
+                _write_page_markdown(md_path, page_num + 1, text_str)
+                logger.debug(LogMessages.PAGE_COMPLETE, page_num + 1)
                 
                 # Add page info to TOC
+                first_line, word_count = _text_stats(text_str)
                 page_info = {
                     "page_number": page_num + 1,
-                    "image_file": str(image_path.name),
-                    "markdown_file": str(md_path.name),
-                    "first_line": text_str.split('\n')[0] if text_str else "",
-                    "word_count": len(text_str.split()) if text_str else 0,
+                    "image_file": image_path.name,
+                    "markdown_file": md_path.name,
+                    "first_line": first_line,
+                    "word_count": word_count,
                     "enhanced_flow_used": has_enhanced_flow
                 }
                 
@@ -509,6 +957,7 @@ def create_processor(
     config: Dict[str, Any],
     ocr_processor=None,  # Kept for backward compatibility
     backend_name: Optional[str] = None,
+    warmup: bool = True,
 ) -> DocumentProcessor:
     """Create a document processor with intelligence backend.
     
@@ -516,6 +965,7 @@ def create_processor(
         config: Configuration dictionary
         ocr_processor: Deprecated parameter, kept for compatibility
         backend_name: Optional name of backend to use
+        warmup: Start warming up the backend in the background
         
     Returns:
         DocumentProcessor instance
@@ -537,6 +987,9 @@ def create_processor(
             use_ocr_fallback=False,
         )
         
+        if warmup:
+            processor.start_warmup()
+        
         return processor
     
     except Exception as e:
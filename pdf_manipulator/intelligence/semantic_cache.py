@@ -0,0 +1,115 @@
+"""Near-duplicate cache for semantic enhancement results."""
+import copy
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def text_vector(text: str, dimensions: int = 1024) -> np.ndarray:
+    """Embed text as an L2-normalised hashed bag of words.
+
+    Args:
+        text: Text to embed
+        dimensions: Number of hash buckets
+
+    Returns:
+        Unit vector (all zeros for text without words)
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    tokens = _TOKEN_RE.findall(text.lower())
+    if tokens:
+        buckets = np.fromiter((hash(token) % dimensions for token in tokens), dtype=np.intp, count=len(tokens))
+        np.add.at(vector, buckets, 1.0)
+        vector /= np.linalg.norm(vector)
+    return vector
+
+
+def image_dhash(image_path: Union[str, Path]) -> int:
+    """Compute a 64-bit difference hash of an image.
+
+    Args:
+        image_path: Path to the image
+
+    Returns:
+        Hash as an integer; similar images differ in few bits
+    """
+    with Image.open(image_path) as image:
+        image.draft("L", (64, 64))
+        pixels = np.asarray(image.convert("L").resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class SemanticCache:
+    """Reuse enhancement results for pages that are near-duplicates of earlier ones.
+
+    A lookup hits when the page text is at least `threshold` cosine-similar to a
+    cached page and the page images differ in at most `max_hash_distance` bits
+    of their difference hash. The image check keeps pages with near-identical
+    wording but different content (tables, figures) apart.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.92,
+                 max_hash_distance: int = 4,
+                 max_entries: int = 256,
+                 dimensions: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            threshold: Minimum text cosine similarity for a hit
+            max_hash_distance: Maximum differing image hash bits for a hit
+            max_entries: Oldest entries are evicted beyond this size
+            dimensions: Size of the text vectors
+        """
+        self.threshold = threshold
+        self.max_hash_distance = max_hash_distance
+        self.dimensions = dimensions
+        self._vectors = np.zeros((0, dimensions), dtype=np.float32)
+        self._hashes = deque(maxlen=max_entries)
+        self._values = deque(maxlen=max_entries)
+        self.max_entries = max_entries
+
+    def key(self, text: str, image_path: Union[str, Path]) -> Optional[Tuple[np.ndarray, int]]:
+        """Build the lookup key for a page.
+
+        Returns:
+            (text vector, image hash), or None if the page has no text or the
+            image cannot be read
+        """
+        vector = text_vector(text or "", self.dimensions)
+        if not vector.any():
+            return None
+        try:
+            return vector, image_dhash(image_path)
+        except OSError:
+            return None
+
+    def get(self, key: Tuple[np.ndarray, int]) -> Optional[Dict[str, Any]]:
+        """Return a copy of the closest cached result, or None on a miss."""
+        if not len(self._values):
+            return None
+        vector, image_hash = key
+        similarities = self._vectors @ vector
+        for index in np.argsort(similarities)[::-1]:
+            if similarities[index] < self.threshold:
+                break
+            if bin(self._hashes[index] ^ image_hash).count("1") <= self.max_hash_distance:
+                return copy.deepcopy(self._values[index])
+        return None
+
+    def put(self, key: Tuple[np.ndarray, int], value: Dict[str, Any]) -> None:
+        """Add a result to the cache."""
+        vector, image_hash = key
+        self._vectors = np.vstack((self._vectors, vector))[-self.max_entries:]
+        self._hashes.append(image_hash)
+        self._values.append(copy.deepcopy(value))
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -1,28 +1,284 @@
 """Enhanced semantic processor for multi-step analysis flow."""
+import bisect
+import concurrent.futures
+import functools
 import json
 import logging
-from pathlib import Path
-from typing import Dict, Any, List, Optional, Union, Tuple
-import base64
+import os
 import re
+import string
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Union, Tuple
 
-# Import the configured logger
-from ..utils.logging_config import get_logger
-
-# Module logger
-logger = get_logger('semantic_processor')
+import fitz  # PyMuPDF
 
-# Text summarization for long texts
 try:
-    from summa import summarizer
-    SUMMARIZER_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    SUMMARIZER_AVAILABLE = False
-    logger.warning("Summa library not found, text summarization disabled")
+    ORJSON_AVAILABLE = False
 
-from .base import IntelligenceBackend
+from . import summarizer
+from .base import IntelligenceBackend, encode_image_base64
 from .markitdown import MarkitdownBackend
+from .semantic_cache import SemanticCache
+from .summarizer import SUMMARIZER_AVAILABLE
 from ..core.exceptions import ProcessingError
+from ..utils.logging_config import get_logger
+
+# Module logger
+logger = get_logger('semantic_processor')
+
+# Patterns used on every page
+_WORD_RE = re.compile(r'\b\w+\b')
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.S)
+# JSON strings (possibly cut off at the end of the text) and structural characters
+_JSON_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*(?:"|$)|[{}\[\],]', re.S)
+
+if not SUMMARIZER_AVAILABLE:
+    logger.warning("scipy not found, text summarization disabled")
+
+
+# JSON schema of the default unified prompt's response format, passed to the
+# backend so decoding is constrained to it
+PAGE_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "main_topic": {"type": "string"},
+        "purpose": {"type": "string"},
+        "semantic_summary": {"type": "string"},
+        "key_insights": {"type": "array", "items": {"type": "string"}},
+        "relationships": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "concept1": {"type": "string"},
+                    "concept2": {"type": "string"},
+                    "relationship": {"type": "string"},
+                },
+                "required": ["concept1", "concept2", "relationship"],
+            },
+        },
+        "content_type": {"type": "string"},
+        "domain_tags": {"type": "array", "items": {"type": "string"}},
+        "knowledge_domain": {"type": "string"},
+        "complexity_level": {"type": "string", "enum": ["beginner", "intermediate", "advanced", "expert"]},
+        "ontology_tags": {"type": "array", "items": {"type": "string"}},
+        "visual_elements": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string"},
+                    "description": {"type": "string"},
+                },
+                "required": ["type", "description"],
+            },
+        },
+        "enhanced_text": {"type": "string"},
+        "confidence_score": {"type": "number"},
+    },
+    "required": ["main_topic", "purpose", "semantic_summary", "key_insights", "relationships",
+                 "content_type", "domain_tags", "knowledge_domain", "complexity_level",
+                 "ontology_tags", "visual_elements", "enhanced_text", "confidence_score"],
+}
+
+
+# Enhancement fields a near-duplicate page may take from the cached page: its
+# classification and tags. Summaries, relationships and enhanced_text describe
+# one page's exact wording, so they are never copied to another page.
+_CACHE_REUSED_FIELDS = (
+    "content_type", "domain_tags", "knowledge_domain", "complexity_level",
+    "ontology_tags", "key_insights", "visual_elements",
+)
+
+
+# Default unified prompt; override with semantic_enhancement.prompts.unified_prompt
+DEFAULT_UNIFIED_PROMPT = """# Semantic Analysis Task
+
+{toc_context}{section_context}## Page Number
+Page {page_number} of {total_pages}
+
+## Extracted Text
+The following {summarized_indicator}text was extracted from this document page:
+
+{extracted_text}
+
+{previous_context}
+
+## Visual Analysis Task
+I'll now provide the image of the page. Please analyze both the extracted text AND the image together to:
+
+1. Identify the main topic and purpose of this page
+2. Extract key concepts and relationships between them
+3. Identify ontological categories and tags
+4. Determine the content type and domain
+5. Provide a comprehensive semantic summary
+6. Note any visual elements (diagrams, tables, equations, etc.)
+7. Correct any errors in the extracted text based on the image
+
+## Response Format
+Provide your analysis in a structured JSON format. IMPORTANT: Your entire response should be valid JSON:
+
+{{
+    "main_topic": "Brief description of the main topic",
+    "purpose": "The purpose of the content on this page",
+    "semantic_summary": "Comprehensive summary of the page content",
+    "key_insights": [
+        "key insight 1",
+        "key insight 2",
+        "key insight 3"
+    ],
+    "relationships": [
+        {{
+            "concept1": "term1", 
+            "concept2": "term2", 
+            "relationship": "type of relationship"
+        }}
+    ],
+    "content_type": "research_paper|diagram|code|etc",
+    "domain_tags": ["tag1", "tag2", "tag3"],
+    "knowledge_domain": "field or domain of knowledge",
+    "complexity_level": "beginner|intermediate|advanced|expert",
+    "ontology_tags": ["hierarchical", "classification", "tags"],
+    "visual_elements": [
+        {{
+            "type": "figure|table|diagram|equation", 
+            "description": "what it shows"
+        }}
+    ],
+    "enhanced_text": "Improved version of the text with corrections",
+    "confidence_score": 0.95
+}}
+
+Carefully analyze the image now and provide your analysis ONLY in the specified JSON format. Do not include any text outside the JSON structure."""
+
+
+def _compile_template(template: str) -> Callable[..., str]:
+    """Parse a str.format template once into a reusable renderer.
+    
+    Templates using only plain named fields render by joining the pre-split
+    literal parts; anything else (format specs, conversions, indexing) falls
+    back to str.format.
+    """
+    parts = list(string.Formatter().parse(template))
+    if any(spec or conversion or (field is not None and not field.isidentifier())
+           for _, field, spec, conversion in parts):
+        return template.format
+    
+    def render(**values: Any) -> str:
+        return ''.join(literal if field is None else literal + str(values[field])
+                       for literal, field, _, _ in parts)
+    return render
+
+
+def _loads_json(text: str) -> Any:
+    """Parse JSON with orjson when available, otherwise the standard library."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps_json_bytes(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to newline-terminated UTF-8 JSON, with orjson when available.
+    
+    Args:
+        obj: Object to serialize
+        indent: Indent by 2 spaces; compact output is about half the size
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return (json.dumps(obj, indent=2) + "\n").encode('utf-8')
+    return (json.dumps(obj, separators=(',', ':')) + "\n").encode('utf-8')
+
+
+@functools.lru_cache(maxsize=64)
+def _read_extracted_markdown(path: str, mtime_ns: int) -> str:
+    """Read a pre-extracted page file without its two-line header.
+    
+    Cached by modification time, so pages read again on a retry or a
+    reprocessing pass skip the disk read until the file changes.
+    """
+    content = Path(path).read_text(encoding='utf-8')
+    first = content.find('\n')
+    second = content.find('\n', first + 1) if first != -1 else -1
+    return content[second + 1:] if second != -1 else content
+
+
+@functools.lru_cache(maxsize=32)
+def _pdf_page_count(path: str, mtime_ns: int) -> int:
+    """Count the pages of a PDF, cached until the file is modified."""
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def _write_utf8(item: Tuple[Path, str]) -> None:
+    """Write text to a file as UTF-8."""
+    path, content = item
+    path.write_text(content, encoding='utf-8')
+
+
+def _extract_first_json_object(text: str) -> Tuple[Optional[str], bool]:
+    """Find the first JSON object in free-form model output.
+    
+    Candidates start at each '{' in turn; a brace span that does not parse
+    as JSON (such as a "{placeholder}" in the prose) is skipped in favour
+    of the next one.
+    
+    Args:
+        text: Model response
+        
+    Returns:
+        Tuple of (JSON text or None if there is no object, whether the
+        object was complete)
+    """
+    start = text.find('{')
+    while start >= 0:
+        candidate, complete = _scan_json_object(text, start)
+        if candidate is not None:
+            try:
+                _loads_json(candidate)
+                return candidate, complete
+            except ValueError:
+                pass
+        start = text.find('{', start + 1)
+    return None, False
+
+
+def _scan_json_object(text: str, start: int) -> Tuple[Optional[str], bool]:
+    """Find the bracket-balanced span opened by the '{' at start.
+    
+    Scans once, skipping over string contents, and tracks bracket depth. If the
+    output is cut off before the object closes, it is trimmed back to the last
+    complete member and the open brackets are closed, so the fields generated
+    so far can still be parsed.
+    
+    Returns:
+        Tuple of (span text or None if nothing can be recovered, whether
+        the span was complete)
+    """
+    stack = []
+    last_cut = None  # (position, open brackets) just before the latest member separator
+    for match in _JSON_TOKEN_RE.finditer(text, start):
+        token = match.group()
+        if token in '{[':
+            stack.append(token)
+        elif token in '}]':
+            stack.pop()
+            if not stack:
+                return text[start:match.end()], True
+        elif token == ',':
+            last_cut = (match.start(), tuple(stack))
+    
+    if last_cut is None:
+        return None, False
+    cut, open_brackets = last_cut
+    closing = ''.join('}' if bracket == '{' else ']' for bracket in reversed(open_brackets))
+    return text[start:cut] + closing, False
 
 
 class SemanticProcessor:
@@ -38,7 +294,9 @@ def __init__(self,
                  logger: Optional[logging.Logger] = None,
                  summarization_ratio: float = 0.2,
                  max_tokens: int = 75,
-                 config: Optional[Dict[str, Any]] = None):
+                 config: Optional[Dict[str, Any]] = None,
+                 max_concurrent_requests: int = 4,
+                 semantic_cache: Optional[SemanticCache] = None):
         """Initialize semantic processor.
         
         Args:
@@ -51,6 +309,12 @@ def __init__(self,
                                  1.0 = no summarization (use full text)
             max_tokens: Maximum number of tokens to keep even with summarization
             config: Configuration dictionary for templates and other settings
+            max_concurrent_requests: Enhancement requests kept in flight at once by
+                                     process_pages(); match the server's parallelism
+                                     (vLLM --max-num-seqs, OLLAMA_NUM_PARALLEL)
+            semantic_cache: Cache of enhancement analysis for near-duplicate pages;
+                            built from semantic_enhancement.cache config when omitted
+                            and enabled there (off by default)
         """
         self.extraction_backend = extraction_backend
         self.enhancement_backend = enhancement_backend
@@ -60,9 +324,43 @@ def __init__(self,
         # Validate and store summarization parameters
         self.summarization_ratio = max(0.0, min(1.0, summarization_ratio))  # Clamp to 0.0-1.0
         self.max_tokens = max(30, max_tokens)  # Ensure reasonable minimum
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        
+        # (text, line start offsets) of the last document sliced by line
+        self._line_offsets_cache = None
+        
+        # Images directory -> pre-extracted markdown directory
+        self._markdown_dir_cache: Dict[Path, str] = {}
+        
+        # Page text -> LexRank sentence scores from the last prepare_summaries() batch
+        self._sentence_scores: Dict[str, Any] = {}
         
         # Get the prompt templates from config if available
         self.prompt_templates = self.config.get("semantic_enhancement", {}).get("prompts", {})
+        self._render_unified_prompt = _compile_template(
+            self.prompt_templates.get("unified_prompt", DEFAULT_UNIFIED_PROMPT))
+        
+        # Semantic files are indented for reading; disable for machine-only output
+        self.indent_json = self.config.get("semantic_enhancement", {}).get("indent_json", True)
+        
+        # Constrain responses to the default template's format; a custom template
+        # documents its own format, so it needs an explicit response_schema
+        self.response_schema = self.config.get("semantic_enhancement", {}).get(
+            "response_schema",
+            None if "unified_prompt" in self.prompt_templates else PAGE_ANALYSIS_SCHEMA,
+        )
+        
+        # Optionally skip the LLM call for pages that repeat an earlier page
+        # (boilerplate, blank forms). Off by default: near-duplicates can still
+        # differ in details such as amounts, so only tags and insights are reused.
+        if semantic_cache is None:
+            cache_config = self.config.get("semantic_enhancement", {}).get("cache", {})
+            if cache_config.get("enabled", False):
+                semantic_cache = SemanticCache(
+                    threshold=cache_config.get("threshold", 0.92),
+                    max_hash_distance=cache_config.get("max_hash_distance", 4),
+                )
+        self.semantic_cache = semantic_cache
         
         # Track summarization info for logging and debugging
         self.last_summarization_info = {
@@ -89,23 +387,133 @@ def process_page(self,
         Returns:
             Comprehensive page analysis
         """
-        image_path = Path(image_path)
+        return self.process_pages([(image_path, page_number, context)], output_dir)[0]
+    
+    def process_pages(self,
+                      pages: List[Tuple[Union[str, Path], int, Optional[Dict[str, Any]]]],
+                      output_dir: Optional[Union[str, Path]] = None) -> List[Dict[str, Any]]:
+        """Process several pages, sending their enhancement requests concurrently.
         
-        # Phase 1: Extract text using markitdown
-        self.logger.info(f"Phase 1: Extracting text from page {page_number}")
-        extracted_text = self._extract_text(image_path)
+        Text extraction and prompt building run serially; the enhancement
+        calls are then issued together (up to max_concurrent_requests at a
+        time) so servers that batch concurrent requests, such as vLLM or
+        Ollama with OLLAMA_NUM_PARALLEL, can process them together.
         
-        # Save extracted text if output directory provided
+        Args:
+            pages: (image_path, page_number, context) tuples; page numbers are 1-based
+            output_dir: Optional directory to save intermediate files
+            
+        Returns:
+            Page analyses in the same order as pages
+        """
         if output_dir:
             output_dir = Path(output_dir)
+        
+        # Phase 1 for every page
+        pages = [(Path(image_path), page_number, context or {}) for image_path, page_number, context in pages]
+        texts = []
+        for image_path, page_number, _ in pages:
+            self.logger.info("Phase 1: Extracting text from page %s", page_number)
+            texts.append(self._extract_text(image_path))
+        
+        # Rank the sentences of every page that needs summarizing in one pass,
+        # then build the unified prompts if enhancement is enabled
+        if len(pages) > 1 and self._uses_enhancement():
+            self.prepare_summaries(texts)
+        prepared = [
+            self._prepare_page(image_path, page_number, context, output_dir, extracted_text)
+            for (image_path, page_number, context), extracted_text in zip(pages, texts)
+        ]
+        
+        # Phase 2: enhancement calls in flight together
+        requests = [(i, image_path, prompt) for i, (image_path, _, prompt, _) in enumerate(prepared)
+                    if prompt is not None]
+        responses = {}
+        if len(requests) == 1:
+            i, image_path, prompt = requests[0]
+            responses[i] = self._call_page_enhancement(image_path, prompt)
+        elif requests:
+            workers = min(self.max_concurrent_requests, len(requests))
+            self.logger.info("Sending %d enhancement requests (%s concurrent)", len(requests), workers)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._call_page_enhancement, image_path, prompt): i
+                    for i, image_path, prompt in requests
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    responses[futures[future]] = future.result()
+        
+        results = []
+        for i, (image_path, result, prompt, cache_key) in enumerate(prepared):
+            if prompt is not None:
+                self._apply_enhancement(result, prompt, responses[i], output_dir)
+                if (cache_key is not None and 'raw_response' not in result['semantic_enhancement']
+                        and not result.get('enhancement_truncated')):
+                    enhancement = result['semantic_enhancement']
+                    self.semantic_cache.put(cache_key, {key: enhancement[key] for key in _CACHE_REUSED_FIELDS
+                                                        if key in enhancement})
+            elif result.get('cache_hit'):
+                self._save_semantic_enhancement(result, output_dir)
+            results.append(result)
+        
+        return results
+    
+    def prepare_summaries(self, pages_text: List[str]) -> None:
+        """Rank the sentences of several pages' text in one batch.
+        
+        Pages longer than max_tokens are vectorized together, sharing one
+        vocabulary and IDF, and their sentence scores are kept for the
+        summaries built afterwards. Scores from a previous batch are dropped.
+        
+        Args:
+            pages_text: Extracted text of each page
+        """
+        self._sentence_scores = {}
+        if not SUMMARIZER_AVAILABLE or not (0.0 < self.summarization_ratio < 1.0):
+            return
+        
+        long_texts = list({text: None for text in pages_text
+                           if text and len(_WORD_RE.findall(text)) > self.max_tokens})
+        if not long_texts:
+            return
+        
+        self.logger.info("Ranking sentences of %d pages for summarization", len(long_texts))
+        try:
+            scores = summarizer.rank_texts(long_texts)
+        except Exception as e:
+            self.logger.error("Batch sentence ranking failed: %s", e)
+            return
+        self._sentence_scores = {text: score for text, score in zip(long_texts, scores) if score is not None}
+    
+    def _uses_enhancement(self) -> bool:
+        """Whether pages are sent to the enhancement backend."""
+        return bool(self.enhancement_backend and hasattr(self.enhancement_backend, 'process_page_with_context'))
+    
+    def _prepare_page(self,
+                      image_path: Path,
+                      page_number: int,
+                      context: Dict[str, Any],
+                      output_dir: Optional[Path],
+                      extracted_text: str) -> Tuple[Path, Dict[str, Any], Optional[str], Optional[Tuple]]:
+        """Record Phase 1 output for a page and build its enhancement prompt.
+        
+        Returns:
+            Tuple of (image path, partial result, unified prompt or None if no
+            enhancement call is needed, semantic cache key or None)
+        """
+        # Save extracted text if output directory provided
+        if output_dir:
             # Use 0-based page index for filename to match image files
             page_index = page_number - 1
             extraction_file = output_dir / f"page_{page_index:04d}_extracted.md"
-            self.logger.info(f"Saving extracted text to {extraction_file}")
+            self.logger.info("Saving extracted text to %s", extraction_file)
             with open(extraction_file, 'w', encoding='utf-8') as f:
                 f.write(f"# Page {page_number} - Extracted Text (Phase 1)\n\n")
                 f.write(extracted_text if extracted_text else "[No text extracted by markitdown]")
         
+        # Count words once; the summarizer and prompt builder reuse it
+        word_count = len(_WORD_RE.findall(extracted_text)) if extracted_text else 0
+        
         # Initialize result
         result = {
             'page_number': page_number,
@@ -113,75 +521,109 @@ def process_page(self,
             'extraction_method': self.extraction_backend.get_name(),
             'semantic_enhancement': None,
             'original_text_length': len(extracted_text) if extracted_text else 0,
-            'word_count': len(re.findall(r'\b\w+\b', extracted_text)) if extracted_text else 0
+            'word_count': word_count
         }
         
-        # Phase 2: Semantic enhancement with multimodal LLM - SINGLE UNIFIED CALL
-        if self.enhancement_backend and hasattr(self.enhancement_backend, 'process_page_with_context'):
-            self.logger.info(f"Phase 2: Semantic enhancement for page {page_number} (single call approach)")
-            
-            # Create a single comprehensive prompt that combines all steps
-            # This makes a single call to Ollama instead of multiple calls
-            unified_prompt = self._create_unified_prompt(extracted_text, context or {})
-            
-            # Make a single call to the enhancement backend
-            self.logger.debug(f"Making unified call to {self.enhancement_backend.get_name()} for page {page_number}")
-            unified_response = self.enhancement_backend.process_page_with_context(
-                image_path=image_path,
-                extracted_text=unified_prompt,  # We use the prompt as the "extracted_text" parameter
-                context={}  # No need for additional context since it's in the prompt
-            )
-            
-            # Parse the response
+        if not self._uses_enhancement():
+            return image_path, result, None, None
+        
+        cache_key = self.semantic_cache.key(extracted_text, image_path) if self.semantic_cache is not None else None
+        if cache_key is not None:
+            cached = self.semantic_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("Reusing semantic analysis of a near-duplicate page for page %s", page_number)
+                # The page keeps its own text; only the analysis fields are shared
+                cached['enhanced_text'] = extracted_text
+                result['semantic_enhancement'] = cached
+                result['enhancement_method'] = self.enhancement_backend.get_name()
+                result['cache_hit'] = True
+                return image_path, result, None, None
+        
+        # Create a single comprehensive prompt that combines all steps
+        # This makes a single call to Ollama instead of multiple calls
+        unified_prompt = self._create_unified_prompt(extracted_text, context, word_count)
+        
+        # Add summarization info
+        result['summarization_info'] = self.last_summarization_info
+        if self.last_summarization_info["was_summarized"]:
+            self.logger.info("Text was summarized from %s to %s words",
+                             self.last_summarization_info['original_word_count'],
+                             self.last_summarization_info['summarized_word_count'])
+        
+        return image_path, result, unified_prompt, cache_key
+    
+    def _call_page_enhancement(self, image_path: Path, unified_prompt: str) -> str:
+        """Make the single unified enhancement call for a page."""
+        self.logger.debug("Making unified call to %s for %s", self.enhancement_backend.get_name(), image_path.name)
+        return self.enhancement_backend.process_page_with_context(
+            image_path=image_path,
+            extracted_text=unified_prompt,  # We use the prompt as the "extracted_text" parameter
+            context={},  # No need for additional context since it's in the prompt
+            response_schema=self.response_schema
+        )
+    
+    def _apply_enhancement(self,
+                           result: Dict[str, Any],
+                           unified_prompt: str,
+                           unified_response: str,
+                           output_dir: Optional[Path]) -> None:
+        """Parse an enhancement response into the page result and save it."""
+        page_number = result['page_number']
+        self.logger.info("Phase 2: Semantic enhancement for page %s (single call approach)", page_number)
+        
+        # Parse the response
+        try:
             try:
-                import json
+                # Schema-constrained decoding returns bare JSON
+                json_text, complete = unified_response, True
+                semantic_data = _loads_json(json_text)
+            except ValueError:
                 # Look for JSON in the response - often LLaVA will wrap it in ```json ... ```
-                json_text = unified_response
-                if "```json" in json_text:
-                    json_parts = json_text.split("```json")
-                    if len(json_parts) > 1:
-                        json_text = json_parts[1].split("```")[0]
-                elif "```" in json_text:
-                    # Try to extract any code block that might contain JSON
-                    json_parts = json_text.split("```")
-                    if len(json_parts) > 1:
-                        for part in json_parts:
-                            if part.strip().startswith("{") and part.strip().endswith("}"):
-                                json_text = part
-                                break
+                fenced = _JSON_FENCE_RE.search(unified_response)
+                if fenced:
+                    json_text, complete = fenced.group(1), True
+                else:
+                    # Unfenced or truncated output: take the first (possibly repaired) object
+                    json_text, complete = _extract_first_json_object(unified_response)
+                    if json_text is None:
+                        raise ValueError("no JSON object in response")
                 
-                self.logger.debug(f"Attempting to parse JSON response of length {len(json_text)}")
-                semantic_data = json.loads(json_text)
-                self.logger.info(f"Successfully parsed JSON response with keys: {list(semantic_data.keys())}")
-                result['semantic_enhancement'] = semantic_data
-                result['enhancement_method'] = self.enhancement_backend.get_name()
-            except json.JSONDecodeError as e:
-                self.logger.warning(f"Failed to parse unified response as JSON: {e}")
-                # Store a fragment of the response for debugging
-                response_preview = unified_response[:500] + "..." if len(unified_response) > 500 else unified_response
-                self.logger.debug(f"Response preview: {response_preview}")
-                result['semantic_enhancement'] = {"raw_response": unified_response}
-            
-            # Ensure semantic_enhancement exists and save the prompt
-            result['semantic_enhancement'] = result.get('semantic_enhancement', {})
-            result['semantic_enhancement']['prompt'] = unified_prompt
-            
-            # Add summarization info
-            result['summarization_info'] = self.last_summarization_info
-            if self.last_summarization_info["was_summarized"]:
-                self.logger.info(f"Text was summarized from {self.last_summarization_info['original_word_count']} to {self.last_summarization_info['summarized_word_count']} words")
-            
-            # Save semantic enhancement if output directory provided
-            if output_dir:
-                try:
-                    semantic_file = output_dir / f"page_{page_index:04d}_semantic.json"
-                    self.logger.info(f"Saving semantic enhancement to {semantic_file}")
-                    with open(semantic_file, 'w', encoding='utf-8') as f:
-                        json.dump(result['semantic_enhancement'], f, indent=2)
-                except Exception as e:
-                    self.logger.warning(f"Failed to save semantic enhancement: {e}")
-        
-        return result
+                self.logger.debug("Attempting to parse JSON response of length %d", len(json_text))
+                semantic_data = _loads_json(json_text)
+            if not isinstance(semantic_data, dict):
+                raise ValueError("response is not a JSON object")
+            if not complete:
+                self.logger.warning("Response for page %s was truncated, keeping the complete fields", page_number)
+                result['enhancement_truncated'] = True
+            self.logger.info("Successfully parsed JSON response with keys: %s", list(semantic_data))
+            result['semantic_enhancement'] = semantic_data
+            result['enhancement_method'] = self.enhancement_backend.get_name()
+        except ValueError as e:
+            self.logger.warning("Failed to parse unified response as JSON: %s", e)
+            # Log a fragment of the response for debugging; %.500s truncates only if emitted
+            self.logger.debug("Response preview: %.500s%s", unified_response,
+                              "..." if len(unified_response) > 500 else "")
+            result['semantic_enhancement'] = {"raw_response": unified_response}
+        
+        # Ensure semantic_enhancement exists and save the prompt
+        result['semantic_enhancement'] = result.get('semantic_enhancement', {})
+        result['semantic_enhancement']['prompt'] = unified_prompt
+        
+        self._save_semantic_enhancement(result, output_dir)
+    
+    def _save_semantic_enhancement(self, result: Dict[str, Any], output_dir: Optional[Path]) -> None:
+        """Save a page's semantic enhancement if an output directory is provided."""
+        if output_dir:
+            try:
+                page_index = result['page_number'] - 1
+                semantic_file = output_dir / f"page_{page_index:04d}_semantic.json"
+                self.logger.info("Saving semantic enhancement to %s", semantic_file)
+                data = _dumps_json_bytes(result['semantic_enhancement'], indent=self.indent_json)
+                # Serialized up front so the file is written in one call
+                with open(semantic_file, 'wb') as f:
+                    f.write(data)
+            except Exception as e:
+                self.logger.warning("Failed to save semantic enhancement: %s", e)
     
     def _extract_text(self, image_path: Path) -> str:
         """Get extracted text for a specific page.
@@ -193,46 +635,58 @@ def _extract_text(self, image_path: Path) -> str:
             # Get page number from image filename
             page_number = int(image_path.stem.split('_')[-1])  # Extract page number from filename
             
-            # Look for pre-extracted markdown file
-            markdown_dir = image_path.parent.parent / "markdown"
-            extracted_file = markdown_dir / f"page_{page_number:04d}_extracted.md"
+            # Look for pre-extracted markdown file; every page of a document
+            # shares the same images directory, so resolve its markdown dir once
+            images_dir = image_path.parent
+            markdown_dir = self._markdown_dir_cache.get(images_dir)
+            if markdown_dir is None:
+                markdown_dir = self._markdown_dir_cache.setdefault(images_dir, str(images_dir.parent / "markdown"))
+            extracted_file = os.path.join(markdown_dir, f"page_{page_number:04d}_extracted.md")
+            
+            try:
+                mtime_ns = os.stat(extracted_file).st_mtime_ns
+            except FileNotFoundError:
+                mtime_ns = None
             
             # If the extracted file exists, read its content
-            if extracted_file.exists():
-                self.logger.debug(f"Using pre-extracted markdown for page {page_number}")
-                with open(extracted_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Skip the header (first 2 lines)
-                content_lines = content.split('\n')
-                if len(content_lines) > 2:
-                    content = '\n'.join(content_lines[2:])
+            if mtime_ns is not None:
+                self.logger.debug("Using pre-extracted markdown for page %s", page_number)
+                content = _read_extracted_markdown(extracted_file, mtime_ns)
             else:
                 # If no pre-extracted file, return empty string
-                self.logger.warning(f"No pre-extracted markdown found for page {page_number}")
+                self.logger.warning("No pre-extracted markdown found for page %s", page_number)
                 content = ""
                 
-            self.logger.debug(f"Extracted text length: {len(content)} characters")
+            self.logger.debug("Extracted text length: %d characters", len(content))
             return content
         except Exception as e:
-            self.logger.error(f"Text extraction failed: {e}")
+            self.logger.error("Text extraction failed: %s", e)
             raise ProcessingError(f"Failed to extract text: {e}")
             
-    def _smart_summarize(self, text: str, max_tokens: Optional[int] = None) -> Tuple[str, bool]:
+    def _smart_summarize(self,
+                         text: str,
+                         max_tokens: Optional[int] = None,
+                         word_count: Optional[int] = None) -> Tuple[str, bool, int, int]:
         """Intelligently summarize text if it's too long.
         
         Args:
             text: Original text to summarize
             max_tokens: Target maximum number of tokens (words), 
                         overrides self.max_tokens if provided
+            word_count: Word count of text if already known
             
         Returns:
-            Tuple of (summarized text, was_summarized flag)
+            Tuple of (summarized text, was_summarized flag, original word count,
+            summarized word count)
         """
-        # Use instance max_tokens if not provided
-        max_tokens = max_tokens or self.max_tokens
-        # Count words as a rough approximation of tokens
-        words = len(re.findall(r'\b\w+\b', text))
+        if word_count is None:
+            word_count = len(_WORD_RE.findall(text))
+        summary, was_summarized = self._summarize(text, max_tokens or self.max_tokens, word_count)
+        summary_count = len(_WORD_RE.findall(summary)) if was_summarized else word_count
+        return summary, was_summarized, word_count, summary_count
+    
+    def _summarize(self, text: str, max_tokens: int, words: int) -> Tuple[str, bool]:
+        """Summarize text of the given word count to about max_tokens words."""
         
         # If text is already short enough, return as is
         if words <= max_tokens:
@@ -249,7 +703,7 @@ def _smart_summarize(self, text: str, max_tokens: Optional[int] = None) -> Tuple
         first_sentences.append(title)
         
         # Add the first 1-2 sentences from the text if needed
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _SENT_RE.split(text)
         if len(sentences) > 1:
             # Add first sentence after title 
             first_sentences.append(sentences[1])
@@ -261,20 +715,20 @@ def _smart_summarize(self, text: str, max_tokens: Optional[int] = None) -> Tuple
         # Create fallback summary
         fallback_summary = " ".join(first_sentences)
         
-        # If summa is available, use it for summarization
+        # If the LexRank summarizer is available, use it for summarization
         if SUMMARIZER_AVAILABLE:
-            self.logger.info(f"Text is {words} words, summarizing to ~{max_tokens} words")
+            self.logger.info("Text is %s words, summarizing to ~%s words", words, max_tokens)
             
             # Calculate target ratio based on configured summarization_ratio
             # If ratio is 1.0, no summarization is done
             if self.summarization_ratio >= 1.0:
                 ratio = 1.0  # No summarization
-                self.logger.info(f"Summarization disabled (ratio=1.0), using full text")
+                self.logger.info("Summarization disabled (ratio=1.0), using full text")
                 return text, False
             
             # If ratio is 0.0, use minimal summary (title + first sentences)
             if self.summarization_ratio <= 0.0:
-                self.logger.info(f"Using maximum summarization (ratio=0.0)")
+                self.logger.info("Using maximum summarization (ratio=0.0)")
                 # The fallback summary (title + first sentences) will be used
                 return fallback_summary, True
             
@@ -300,59 +754,65 @@ def _smart_summarize(self, text: str, max_tokens: Optional[int] = None) -> Tuple
                 
             # Apply summarization
             try:
-                summary = summarizer.summarize(text, ratio=ratio)
-                
-                # If summary is empty or too short, try with a slightly higher ratio
-                if not summary or len(summary.split()) < min(30, max_tokens // 2):
-                    self.logger.warning(f"Summary too short, using higher ratio")
-                    summary = summarizer.summarize(text, ratio=min(1.0, ratio * 3))
+                # Ask for a little more than the target and truncate below, so a
+                # short first pick never needs a second summarizer pass
+                summary = summarizer.summarize(text, ratio=min(1.0, ratio * 1.5),
+                                               scores=self._sentence_scores.get(text))
+                summary_words_list = summary.split()
                     
-                # If still too short, use the fallback summary
-                if not summary or len(summary.split()) < 20:
-                    self.logger.warning(f"Summarization failed, using title and first sentences")
+                # If too short, use the fallback summary
+                if len(summary_words_list) < 20:
+                    self.logger.warning("Summarization failed, using title and first sentences")
                     return fallback_summary, True
                     
                 # If summary is still too long, truncate it
-                summary_words = len(summary.split())
+                summary_words = len(summary_words_list)
                 if summary_words > max_tokens:
-                    summary_words_list = summary.split()
                     summary = " ".join(summary_words_list[:max_tokens])
-                    summary_words = len(summary.split())
+                    summary_words = max_tokens
                 
-                self.logger.info(f"Summarized from {words} to {summary_words} words ({ratio:.3f} ratio)")
+                self.logger.info("Summarized from %s to %s words (%.3f ratio)", words, summary_words, ratio)
                 return summary, True
                 
             except Exception as e:
-                self.logger.error(f"Summarization error: {e}")
+                self.logger.error("Summarization error: %s", e)
                 # Fall back to title and first sentences
                 return fallback_summary, True
         else:
-            # If summa is not available, use title and first sentences
-            self.logger.warning(f"Text is {words} words but summarizer not available, using title and first sentences")
+            # If the summarizer is not available, use title and first sentences
+            self.logger.warning("Text is %s words but summarizer not available, using title and first sentences", words)
             return fallback_summary, True
 
-    def _create_unified_prompt(self, extracted_text: str, context: Dict[str, Any]) -> str:
+    def _create_unified_prompt(self,
+                               extracted_text: str,
+                               context: Dict[str, Any],
+                               word_count: Optional[int] = None) -> str:
         """Create a unified prompt for all semantic processing steps.
         
         This creates a single comprehensive prompt for the Ollama LLaVA model.
         """
         # Intelligently summarize long text to reduce computational load on LLaVA
         # Uses the instance's configured summarization_ratio and max_tokens
-        summarized_text, was_summarized = self._smart_summarize(extracted_text)
+        summarized_text, was_summarized, original_count, summarized_count = self._smart_summarize(
+            extracted_text or "", word_count=word_count)
         
         # Keep track of summarization metrics for logging
         self.last_summarization_info = {
             "was_summarized": was_summarized,
-            "original_word_count": len(re.findall(r'\b\w+\b', extracted_text)) if extracted_text else 0,
-            "summarized_word_count": len(re.findall(r'\b\w+\b', summarized_text)) if summarized_text else 0
+            "original_word_count": original_count,
+            "summarized_word_count": summarized_count
         }
         
         # Prepare previous page context (if available)
         previous_context = ""
         if "previous_summaries" in context and context["previous_summaries"]:
             previous_context = "## Context from Previous Pages\n\n"
-            for i, summary in enumerate(context["previous_summaries"]):
-                page_num = context.get('page_number', 0) - len(context['previous_summaries']) + i
+            # Summaries come from the pages just before this one unless numbered explicitly
+            page_numbers = context.get("previous_page_numbers") or [
+                context.get('page_number', 0) - len(context['previous_summaries']) + i
+                for i in range(len(context["previous_summaries"]))
+            ]
+            for page_num, summary in zip(page_numbers, context["previous_summaries"]):
                 previous_context += f"Page {page_num}: {summary}\n\n"
         
         # Add TOC context if available
@@ -368,68 +828,9 @@ def _create_unified_prompt(self, extracted_text: str, context: Dict[str, Any]) -
         if "current_section" in context:
             section_context = f"## Current Section: {context['current_section']}\n\n"
         
-        # Get the template from config if available, otherwise use the default
-        template = self.prompt_templates.get("unified_prompt", """# Semantic Analysis Task
-
-{toc_context}{section_context}## Page Number
-Page {page_number} of {total_pages}
-
-## Extracted Text
-The following {summarized_indicator}text was extracted from this document page:
-
-{extracted_text}
-
-{previous_context}
-
-## Visual Analysis Task
-I'll now provide the image of the page. Please analyze both the extracted text AND the image together to:
-
-1. Identify the main topic and purpose of this page
-2. Extract key concepts and relationships between them
-3. Identify ontological categories and tags
-4. Determine the content type and domain
-5. Provide a comprehensive semantic summary
-6. Note any visual elements (diagrams, tables, equations, etc.)
-7. Correct any errors in the extracted text based on the image
-
-## Response Format
-Provide your analysis in a structured JSON format. IMPORTANT: Your entire response should be valid JSON:
-
-{{
-    "main_topic": "Brief description of the main topic",
-    "purpose": "The purpose of the content on this page",
-    "semantic_summary": "Comprehensive summary of the page content",
-    "key_insights": [
-        "key insight 1",
-        "key insight 2",
-        "key insight 3"
-    ],
-    "relationships": [
-        {{
-            "concept1": "term1", 
-            "concept2": "term2", 
-            "relationship": "type of relationship"
-        }}
-    ],
-    "content_type": "research_paper|diagram|code|etc",
-    "domain_tags": ["tag1", "tag2", "tag3"],
-    "knowledge_domain": "field or domain of knowledge",
-    "complexity_level": "beginner|intermediate|advanced|expert",
-    "ontology_tags": ["hierarchical", "classification", "tags"],
-    "visual_elements": [
-        {{
-            "type": "figure|table|diagram|equation", 
-            "description": "what it shows"
-        }}
-    ],
-    "enhanced_text": "Improved version of the text with corrections",
-    "confidence_score": 0.95
-}}
-
-Carefully analyze the image now and provide your analysis ONLY in the specified JSON format. Do not include any text outside the JSON structure.""")
         
-        # Format the template with the dynamic values
-        prompt = template.format(
+        # Fill in the template, compiled once in __init__
+        prompt = self._render_unified_prompt(
             toc_context=toc_context,
             section_context=section_context,
             page_number=context.get('page_number', 0),
@@ -443,9 +844,6 @@ def _create_unified_prompt(self, extracted_text: str, context: Dict[str, Any]) -
         
     def _pre_extract_all_pages(self, full_markdown: str, pdf_path: str, output_dir: Path):
         """Pre-extract all pages from the full markdown and save to files."""
-        from pathlib import Path
-        import os
-        
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
@@ -453,75 +851,105 @@ def _pre_extract_all_pages(self, full_markdown: str, pdf_path: str, output_dir:
         total_pages = 50  # Default assumption
         try:
             # Try to get actual page count from PDF
-            import pypdf
-            with pypdf.PdfReader(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
+            total_pages = _pdf_page_count(str(pdf_path), os.stat(pdf_path).st_mtime_ns)
         except Exception as e:
-            self.logger.warning(f"Could not determine exact page count: {e}")
+            self.logger.warning("Could not determine exact page count: %s", e)
         
-        self.logger.info(f"Pre-extracting markdown for all {total_pages} pages")
+        self.logger.info("Pre-extracting markdown for all %s pages", total_pages)
         
         # Split content into pages (simple approach)
-        lines = full_markdown.split('\n')
-        lines_per_page = max(1, len(lines) // total_pages)
+        line_count = len(self._line_offsets(full_markdown)) - 1
+        lines_per_page = max(1, line_count // total_pages)
         
-        # Create extracted files for each page
+        # Build the extracted file contents for each page
+        files = []
         for page_num in range(total_pages):
             start_idx = page_num * lines_per_page
-            end_idx = min(len(lines), (page_num + 1) * lines_per_page)
+            end_idx = min(line_count, (page_num + 1) * lines_per_page)
             
             # Extract content for this page
-            page_content = '\n'.join(lines[start_idx:end_idx])
+            page_content = self._slice_lines(full_markdown, start_idx, end_idx)
             
-            # Save to extracted markdown file
             extraction_file = output_dir / f"page_{page_num:04d}_extracted.md"
-            with open(extraction_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Page {page_num + 1} - Extracted Text (Phase 1)\n\n")
-                f.write(page_content if page_content.strip() else "[No text extracted by markitdown]")
-                
-            self.logger.debug(f"Pre-extracted content for page {page_num}")
+            files.append((extraction_file,
+                          f"# Page {page_num + 1} - Extracted Text (Phase 1)\n\n"
+                          + (page_content if page_content.strip() else "[No text extracted by markitdown]")))
+        
+        # Many small independent writes: let the OS pipeline them
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(16, len(files) or 1)) as executor:
+            list(executor.map(_write_utf8, files))
+        self.logger.debug("Pre-extracted content for %d pages", len(files))
     
     def _extract_page_from_markdown(self, full_markdown: str, page_number: int) -> str:
         """Extract content for a specific page from the full markdown."""
         # This is a simplified approach - in a real implementation, we'd need to
         # properly parse the markdown structure to identify page boundaries
-        lines = full_markdown.split('\n')
+        offsets = self._line_offsets(full_markdown)
+        line_count = len(offsets) - 1
         
         # For now, just split by page headers or return a section
         # You might need to customize this based on how markitdown formats the output
         page_marker = f"Page {page_number + 1}"
         
         # Find page start
-        start_idx = -1
-        for i, line in enumerate(lines):
-            if page_marker in line:
-                start_idx = i
-                break
+        marker_pos = full_markdown.find(page_marker)
         
-        if start_idx == -1:
+        if marker_pos == -1:
             # If no page marker found, divide content by total pages
-            total_lines = len(lines)
-            lines_per_page = total_lines // 50  # Assuming ~50 pages
+            lines_per_page = line_count // 50  # Assuming ~50 pages
             start_idx = page_number * lines_per_page
             end_idx = (page_number + 1) * lines_per_page
-            return '\n'.join(lines[start_idx:end_idx])
+            return self._slice_lines(full_markdown, start_idx, end_idx)
+        
+        start_idx = bisect.bisect_right(offsets, marker_pos) - 1
         
-        # Find next page marker
-        end_idx = len(lines)
-        for i in range(start_idx + 1, len(lines)):
-            if f"Page {page_number + 2}" in lines[i]:
-                end_idx = i
-                break
+        # Find next page marker, starting on the following line
+        end_idx = line_count
+        if start_idx + 1 < line_count:
+            next_pos = full_markdown.find(f"Page {page_number + 2}", offsets[start_idx + 1])
+            if next_pos != -1:
+                end_idx = bisect.bisect_right(offsets, next_pos) - 1
         
-        return '\n'.join(lines[start_idx:end_idx])
+        return self._slice_lines(full_markdown, start_idx, end_idx)
+    
+    def _line_offsets(self, text: str) -> List[int]:
+        """Return the start offset of every line, plus a sentinel one past the end.
+        
+        The offsets for the most recent text are cached, so per-page slicing of
+        the same document does not rescan it.
+        """
+        cached = self._line_offsets_cache
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        
+        offsets = [0]
+        pos = text.find('\n')
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = text.find('\n', pos + 1)
+        offsets.append(len(text) + 1)
+        
+        self._line_offsets_cache = (text, offsets)
+        return offsets
+    
+    def _slice_lines(self, text: str, start: int, end: int) -> str:
+        """Return lines [start, end) of text, like '\\n'.join(text.split('\\n')[start:end])."""
+        offsets = self._line_offsets(text)
+        line_count = len(offsets) - 1
+        start, end = min(max(start, 0), line_count), min(max(end, 0), line_count)
+        if start >= end:
+            return ""
+        return text[offsets[start]:offsets[end] - 1]
     
     # The method below calls the enhancement backend to process an image and extract information
     def _call_enhancement_backend(self, image_path: Path, prompt: str) -> str:
         """Call the enhancement backend with image and prompt."""
+        # Let the backend pass the file by reference if it can
+        if hasattr(self.enhancement_backend, 'process_with_image_path'):
+            return self.enhancement_backend.process_with_image_path(prompt, image_path, json_mode=True)
+        
         # Read and encode image
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-        image_b64 = base64.b64encode(image_data).decode()
+        image_b64 = encode_image_base64(image_path)
         
         # Use the backend's process method
         return self.enhancement_backend.process(prompt, image_b64, json_mode=True)
@@ -529,7 +957,7 @@ def _call_enhancement_backend(self, image_path: Path, prompt: str) -> str:
     def _parse_json_response(self, response: str, step_name: str) -> Dict[str, Any]:
         """Parse JSON response from LLM."""
         try:
-            return json.loads(response)
+            return _loads_json(response)
         except json.JSONDecodeError:
-            self.logger.warning(f"Failed to parse JSON in {step_name}, returning raw response")
+            self.logger.warning("Failed to parse JSON in %s, returning raw response", step_name)
             return {"raw_response": response, "parse_error": True}
\ No newline at end of file
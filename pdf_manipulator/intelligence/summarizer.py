@@ -0,0 +1,146 @@
+"""Extractive summarization using LexRank over a sparse TF-IDF graph."""
+import re
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    SUMMARIZER_AVAILABLE = True
+except ImportError:
+    SUMMARIZER_AVAILABLE = False
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_TOKEN_RE = re.compile(r'\w+')
+
+# Sentences below this count are left to the caller's title + first sentences fallback
+MIN_SENTENCES = 5
+
+
+def summarize(text: str, ratio: float = 0.2, top_k: int = 10,
+              damping: float = 0.85, max_iterations: int = 100,
+              scores: Optional[np.ndarray] = None) -> str:
+    """Select the most central sentences of a text.
+
+    Sentences are TF-IDF vectors; each keeps edges to its `top_k` most similar
+    sentences, so the graph stays sparse and ranking is a sparse power
+    iteration instead of a dense all-pairs PageRank.
+
+    Args:
+        text: Text to summarize
+        ratio: Fraction of the text's words to keep
+        top_k: Similarity edges kept per sentence
+        damping: PageRank damping factor
+        max_iterations: Power iteration limit
+        scores: Sentence scores from rank_texts() for this text, if already computed
+
+    Returns:
+        Selected sentences in their original order, one per line, or an empty
+        string if the text has fewer than MIN_SENTENCES sentences
+    """
+    sentences = split_sentences(text)
+    if len(sentences) < MIN_SENTENCES:
+        return ""
+
+    if scores is None or len(scores) != len(sentences):
+        scores = _rank(_tfidf(sentences), top_k, damping, max_iterations)
+    lengths = [len(sentence.split()) for sentence in sentences]
+    target = ratio * sum(lengths)
+
+    selected: List[int] = []
+    kept = 0
+    for index in np.argsort(-scores, kind="stable"):
+        if kept >= target:
+            break
+        selected.append(index)
+        kept += lengths[index]
+
+    return "\n".join(sentences[i] for i in sorted(selected))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into non-empty sentences."""
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+
+
+def rank_texts(texts: List[str], top_k: int = 10, damping: float = 0.85,
+               max_iterations: int = 100) -> List[Optional[np.ndarray]]:
+    """Score the sentences of several texts with one shared vectorization pass.
+
+    All sentences are tokenized into a single TF-IDF matrix, so the vocabulary
+    and IDF weights are built once for the whole document rather than per
+    page; each text's sentence graph is then ranked from its block of rows.
+
+    Args:
+        texts: Texts to score, typically the pages of one document
+        top_k: Similarity edges kept per sentence
+        damping: PageRank damping factor
+        max_iterations: Power iteration limit
+
+    Returns:
+        Per text, the sentence scores to pass to summarize(), or None for texts
+        with fewer than MIN_SENTENCES sentences
+    """
+    per_text = [split_sentences(text) for text in texts]
+    all_sentences = [sentence for sentences in per_text for sentence in sentences]
+    if not all_sentences:
+        return [None] * len(texts)
+
+    tfidf = _tfidf(all_sentences)
+    results: List[Optional[np.ndarray]] = []
+    start = 0
+    for sentences in per_text:
+        end = start + len(sentences)
+        if len(sentences) < MIN_SENTENCES:
+            results.append(None)
+        else:
+            results.append(_rank(tfidf[start:end], top_k, damping, max_iterations))
+        start = end
+    return results
+
+
+def _tfidf(sentences: List[str]) -> "sparse.csr_matrix":
+    """Build L2-normalised TF-IDF rows for sentences."""
+    n = len(sentences)
+    vocabulary = {}
+    rows, cols = [], []
+    for i, sentence in enumerate(sentences):
+        for token in _TOKEN_RE.findall(sentence.lower()):
+            rows.append(i)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    counts = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, len(vocabulary)))
+    counts.sum_duplicates()
+    document_frequency = np.bincount(counts.indices, minlength=len(vocabulary))
+    idf = np.log((1 + n) / (1 + document_frequency)) + 1
+    tfidf = sparse.csr_matrix(counts.multiply(idf))
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ tfidf)
+
+
+def _rank(tfidf: "sparse.csr_matrix", top_k: int, damping: float, max_iterations: int) -> np.ndarray:
+    """Score sentences (rows of tfidf) by LexRank centrality."""
+    n = tfidf.shape[0]
+    similarity = sparse.csr_matrix(tfidf @ tfidf.T)
+    similarity.setdiag(0)
+    for i in range(n):
+        start, end = similarity.indptr[i], similarity.indptr[i + 1]
+        if end - start > top_k:
+            row = similarity.data[start:end]
+            row[np.argpartition(row, -top_k)[:-top_k]] = 0
+    similarity.eliminate_zeros()
+
+    # Row-stochastic transition matrix; sentences without edges jump uniformly
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    out_weight[dangling] = 1
+    transition = (sparse.diags(1 / out_weight) @ similarity).T.tocsr()
+
+    scores = np.full(n, 1 / n)
+    for _ in range(max_iterations):
+        updated = (1 - damping) / n + damping * (transition @ scores + scores[dangling].sum() / n)
+        if np.abs(updated - scores).sum() < 1e-6:
+            return updated
+        scores = updated
+    return scores
@@ -1,14 +1,90 @@
 """Enhanced knowledge graph builder with ontological tagging and edge scoring."""
+import itertools
 import json
 import uuid
+from collections import Counter, OrderedDict, defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Any, Union
 from datetime import datetime
 from enum import Enum
 import logging
 import math
+import re
+import sys
+import time
 
+import numpy as np
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Slotted dataclasses (3.10+) drop the per-instance __dict__ of every node, edge and tag
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _sorted_intersection_size(a, b):
+        """Count the values shared by two sorted, duplicate-free id arrays."""
+        i = 0
+        j = 0
+        count = 0
+        while i < a.size and j < b.size:
+            if a[i] == b[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return count
+
+
+def dumps_graph(graph_data: Dict[str, Any], indent: bool = True) -> bytes:
+    """Serialize an exported graph to UTF-8 JSON, with orjson when available.
+    
+    Args:
+        graph_data: Result of GraphBuilder.export_graph()
+        indent: Indent by 2 spaces
+        
+    Returns:
+        Encoded JSON document
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(graph_data, option=option)
+    return json.dumps(graph_data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _isoformat_timestamps(record: Union["Node", "Edge"]) -> Tuple[str, str]:
+    """Return a node's or edge's created_at and updated_at as ISO strings.
+
+    Formatting dominates to_dict() for small records, so the strings are
+    kept on the record and reused until either timestamp is reassigned.
+    """
+    stamp = (record.created_at, record.updated_at)
+    cache = record._timestamp_cache
+    if cache is None or cache[0] != stamp:
+        cache = (stamp, (record.created_at.isoformat(), record.updated_at.isoformat()))
+        record._timestamp_cache = cache
+    return cache[1]
+
+
+# Serialization and statistics read member values through Enum's _value_
+# attribute; .value is a property and costs an order of magnitude more per access
 class NodeType(Enum):
     """Types of nodes in the knowledge graph."""
     DOCUMENT = "document"
@@ -36,7 +112,7 @@ class EdgeType(Enum):
     EXAMPLE_OF = "example_of"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class OntologyTag:
     """Represents an ontological classification."""
     category: str
@@ -45,7 +121,7 @@ class OntologyTag:
     attributes: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Node:
     """Represents a node in the knowledge graph."""
     id: str
@@ -56,12 +132,26 @@ class Node:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     confidence: float = 1.0
+    # (text, word set) from the last lexical comparison; stale once content["text"] is replaced
+    _token_cache: Optional[Tuple[Any, FrozenSet[str]]] = field(default=None, init=False, repr=False, compare=False)
+    # (text, vocabulary, sorted word ids) for the compiled similarity path
+    _word_ids_cache: Optional[Tuple[Any, Dict[str, int], np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # ((created_at, updated_at), their ISO strings) from the last to_dict() call
+    _timestamp_cache: Optional[Tuple[Tuple[datetime, datetime], Tuple[str, str]]] = field(
+        default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert node to dictionary representation."""
+        """Convert node to dictionary representation.
+        
+        Built fresh on every call except for the ISO timestamp strings, which
+        are reused while the timestamps are unchanged; content and metadata
+        are shared by reference.
+        """
+        created_at, updated_at = _isoformat_timestamps(self)
         return {
             "id": self.id,
-            "type": self.type.value,
+            "type": self.type._value_,
             "content": self.content,
             "ontology_tags": [
                 {
@@ -73,13 +163,13 @@ def to_dict(self) -> Dict[str, Any]:
                 for tag in self.ontology_tags
             ],
             "metadata": self.metadata,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": created_at,
+            "updated_at": updated_at,
             "confidence": self.confidence
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Edge:
     """Represents an edge in the knowledge graph."""
     id: str
@@ -92,19 +182,27 @@ class Edge:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     evidence: List[str] = field(default_factory=list)
+    # ((created_at, updated_at), their ISO strings) from the last to_dict() call
+    _timestamp_cache: Optional[Tuple[Tuple[datetime, datetime], Tuple[str, str]]] = field(
+        default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert edge to dictionary representation."""
+        """Convert edge to dictionary representation.
+        
+        Built fresh on every call except for the ISO timestamp strings, which
+        are reused while the timestamps are unchanged.
+        """
+        created_at, updated_at = _isoformat_timestamps(self)
         return {
             "id": self.id,
             "source_id": self.source_id,
             "target_id": self.target_id,
-            "type": self.type.value,
+            "type": self.type._value_,
             "weight": self.weight,
             "confidence": self.confidence,
             "metadata": self.metadata,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": created_at,
+            "updated_at": updated_at,
             "evidence": self.evidence
         }
 
@@ -112,14 +210,18 @@ def to_dict(self) -> Dict[str, Any]:
 class EdgeScorer:
     """Manages dynamic edge scoring with recency factors."""
     
-    def __init__(self, decay_rate: float = 0.1):
+    def __init__(self, decay_rate: float = 0.1, min_decay_interval: float = 1.0):
         """Initialize edge scorer.
         
         Args:
             decay_rate: Rate at which old edges decay (0-1)
+            min_decay_interval: Seconds since an edge was last touched before
+                                decay_old_edges() decays it again
         """
         self.decay_rate = decay_rate
-        self.edge_timestamps: Dict[str, datetime] = {}
+        self.min_decay_interval = min_decay_interval
+        # time.monotonic() seconds at which each edge's weight was last brought up to date
+        self.edge_timestamps: Dict[str, float] = {}
     
     def calculate_score(self, 
                        lexical_similarity: float,
@@ -140,29 +242,76 @@ def calculate_score(self,
         
         return min(final_score, 1.0)  # Cap at 1.0
     
+    def calculate_scores(self,
+                         lexical_similarities: np.ndarray,
+                         semantic_strengths: np.ndarray) -> np.ndarray:
+        """Calculate scores for new edges in one vectorized pass.
+        
+        New edges have no timestamp yet, so their recency factor is 1.0.
+        """
+        return np.minimum(lexical_similarities * (1.0 + semantic_strengths), 1.0)
+    
     def update_edge_timestamp(self, edge_id: str):
         """Update timestamp for edge recency calculation."""
-        self.edge_timestamps[edge_id] = datetime.now()
+        self.edge_timestamps[edge_id] = time.monotonic()
     
     def decay_old_edges(self, edges: List[Edge]) -> List[Edge]:
-        """Apply decay to old edges based on recency."""
-        current_time = datetime.now()
+        """Apply decay to old edges based on recency.
         
-        for edge in edges:
-            if edge.id in self.edge_timestamps:
-                time_diff = (current_time - self.edge_timestamps[edge.id]).total_seconds()
-                decay_factor = math.exp(-self.decay_rate * time_diff / 3600)  # Hourly decay
+        Each edge is decayed only by the time since it was last touched, and
+        its timestamp then moves to now: weight(t) = exp(-rate * (t - t_last))
+        * weight(t_last). Repeated calls therefore compose instead of decaying
+        the same interval twice, and edges touched within min_decay_interval
+        are skipped.
+        """
+        now = time.monotonic()
+        
+        timed = [edge for edge in edges if edge.id in self.edge_timestamps]
+        if not timed:
+            return edges
+        
+        elapsed, decay_factors = self._decay_factors(timed, now)
+        for edge, age, decay_factor in zip(timed, elapsed.tolist(), decay_factors.tolist()):
+            if age >= self.min_decay_interval:
                 edge.weight *= decay_factor
+                self.edge_timestamps[edge.id] = now
         
         return edges
     
+    def effective_weights(self, edges: List[Edge], now: Optional[float] = None) -> List[float]:
+        """Get edges' weights decayed to now without modifying them.
+        
+        Args:
+            edges: Edges to weigh
+            now: time.monotonic() time to decay to (defaults to the current time)
+            
+        Returns:
+            Decayed weights in the order of edges; edges without a timestamp
+            keep their stored weight
+        """
+        weights = [edge.weight for edge in edges]
+        timed = [i for i, edge in enumerate(edges) if edge.id in self.edge_timestamps]
+        if timed:
+            _, decay_factors = self._decay_factors([edges[i] for i in timed],
+                                                now if now is not None else time.monotonic())
+            for i, decay_factor in zip(timed, decay_factors.tolist()):
+                weights[i] *= decay_factor
+        return weights
+    
+    def _decay_factors(self, edges: List[Edge], now: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute seconds since last touch and decay factors for timestamped edges."""
+        # One vectorized exp over all edge ages
+        stamps = np.fromiter((self.edge_timestamps[edge.id] for edge in edges),
+                             dtype=np.float64, count=len(edges))
+        elapsed = now - stamps
+        return elapsed, np.exp(-self.decay_rate * elapsed / 3600)  # Hourly decay
+    
     def _calculate_recency_factor(self, edge_id: str) -> float:
         """Calculate recency factor for edge."""
         if edge_id not in self.edge_timestamps:
             return 1.0  # New edge gets full weight
         
-        current_time = datetime.now()
-        time_diff = (current_time - self.edge_timestamps[edge_id]).total_seconds()
+        time_diff = time.monotonic() - self.edge_timestamps[edge_id]
         
         # Exponential decay based on time
         recency_factor = math.exp(-self.decay_rate * time_diff / 3600)  # Hourly decay
@@ -173,6 +322,14 @@ def _calculate_recency_factor(self, edge_id: str) -> float:
 class GraphBuilder:
     """Enhanced graph builder with ontological tagging and dynamic scoring."""
     
+    # Inference rules: tag category -> (inferred category, domain, confidence
+    # threshold, confidence multiplier) applied when the tag's confidence exceeds
+    # the threshold
+    _INFERENCE_TABLE: Dict[str, Tuple[Tuple[str, str, float, float], ...]] = {
+        "algorithm": (("computational", "technical", 0.8, 0.9),),
+        "hypothesis": (("research_question", "academic", 0.7, 0.8),),
+    }
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         """Initialize the graph builder."""
         self.logger = logger or logging.getLogger(__name__)
@@ -180,6 +337,20 @@ def __init__(self, logger: Optional[logging.Logger] = None):
         self.edges: Dict[str, Edge] = {}
         self.edge_scorer = EdgeScorer()
         
+        # IDs are a per-builder random prefix plus a counter: unique across
+        # exported graphs without drawing a random UUID for every insertion
+        self._id_prefix = uuid.uuid4().hex[:12]
+        self._id_counter = itertools.count()
+        
+        # Running statistics for export metadata
+        self._node_type_counts: Counter = Counter()
+        self._edge_type_counts: Counter = Counter()
+        self._tagged_nodes_count = 0
+        
+        # Adjacency index: node id -> ids of its outgoing / incoming edges
+        self._out: Dict[str, List[str]] = defaultdict(list)
+        self._in: Dict[str, List[str]] = defaultdict(list)
+        
         # Ontology configuration
         self.ontology_domains = {
             "technical": ["algorithm", "data_structure", "system", "protocol"],
@@ -187,6 +358,31 @@ def __init__(self, logger: Optional[logging.Logger] = None):
             "academic": ["theory", "methodology", "research", "hypothesis"],
             "general": ["concept", "definition", "example", "summary"]
         }
+        
+        # Word -> id for the compiled lexical similarity
+        self._vocabulary: Dict[str, int] = {}
+        
+        # (source id, target id) -> (source text, target text, similarity), least
+        # recently used first; entries are valid while both texts are unchanged
+        self._similarity_cache: "OrderedDict[Tuple[str, str], Tuple[Any, Any, float]]" = OrderedDict()
+        self._similarity_cache_size = 100_000
+        
+        # All domain keywords in one pattern, in domain priority order. The
+        # lookahead reports a match at every start position, so overlapping
+        # keywords are all seen in a single scan of the tag name
+        self._keyword_domains: Dict[str, Tuple[int, str]] = {}
+        for priority, (domain, keywords) in enumerate(self.ontology_domains.items()):
+            for keyword in keywords:
+                self._keyword_domains.setdefault(keyword, (priority, domain))
+        self._keyword_pattern = re.compile(
+            "(?=(" + "|".join(map(re.escape, self._keyword_domains)) + "))")
+        
+        # Lower-cased tag name -> domain, seeded with every keyword so exact
+        # keyword tags resolve without scanning; other names are added as seen
+        self._tag_domains: Dict[str, str] = {}
+        for keywords in self.ontology_domains.values():
+            for keyword in keywords:
+                self._tag_domains[keyword] = self._scan_domain(keyword)
     
     def create_node(self, 
                    content: Dict[str, Any],
@@ -194,7 +390,7 @@ def create_node(self,
                    ontology_tags: Optional[List[str]] = None,
                    confidence: float = 1.0) -> Node:
         """Create a node with ontological tagging."""
-        node_id = str(uuid.uuid4())
+        node_id = self._new_id("n")
         
         # Process ontology tags
         tags = []
@@ -221,7 +417,10 @@ def create_node(self,
         
         # Add to graph
         self.nodes[node_id] = node
-        self.logger.debug(f"Created node {node_id} of type {node_type.value}")
+        self._node_type_counts[node_type._value_] += 1
+        if tags:
+            self._tagged_nodes_count += 1
+        self.logger.debug("Created node %s of type %s", node_id, node_type._value_)
         
         return node
     
@@ -233,7 +432,7 @@ def create_edge(self,
                    semantic_strength: float = 0.0,
                    evidence: Optional[List[str]] = None) -> Edge:
         """Create weighted edge between nodes."""
-        edge_id = str(uuid.uuid4())
+        edge_id = self._new_id("e")
         
         # Calculate initial weight
         lexical_similarity = self._calculate_lexical_similarity(source, target)
@@ -259,10 +458,62 @@ def create_edge(self,
         
         # Add to graph
         self.edges[edge_id] = edge
-        self.logger.debug(f"Created edge {edge_id} from {source.id} to {target.id}")
+        self._edge_type_counts[edge_type._value_] += 1
+        self._out[source.id].append(edge_id)
+        self._in[target.id].append(edge_id)
+        self.logger.debug("Created edge %s from %s to %s", edge_id, source.id, target.id)
         
         return edge
     
+    def create_edges_bulk(self,
+                          pairs: List[Tuple[Node, Node, EdgeType, float, float]]) -> List[Edge]:
+        """Create many weighted edges at once.
+        
+        Equivalent to calling create_edge for each pair, with the weights
+        scored in one vectorized pass and a single timestamp for the batch.
+        
+        Args:
+            pairs: (source, target, edge_type, confidence, semantic_strength) tuples
+            
+        Returns:
+            The created edges, in the order of pairs
+        """
+        if not pairs:
+            return []
+        
+        lexical = np.fromiter(
+            (self._calculate_lexical_similarity(source, target) for source, target, _, _, _ in pairs),
+            dtype=np.float64, count=len(pairs))
+        semantic = np.fromiter((strength for _, _, _, _, strength in pairs),
+                               dtype=np.float64, count=len(pairs))
+        weights = self.edge_scorer.calculate_scores(lexical, semantic).tolist()
+        
+        now = datetime.now()
+        new_edges = [
+            Edge(
+                id=self._new_id("e"),
+                source_id=source.id,
+                target_id=target.id,
+                type=edge_type,
+                weight=weight,
+                confidence=confidence,
+                created_at=now,
+                updated_at=now
+            )
+            for (source, target, edge_type, confidence, _), weight in zip(pairs, weights)
+        ]
+        
+        self.edges.update((edge.id, edge) for edge in new_edges)
+        touched = time.monotonic()
+        self.edge_scorer.edge_timestamps.update((edge.id, touched) for edge in new_edges)
+        self._edge_type_counts.update(edge.type._value_ for edge in new_edges)
+        for edge in new_edges:
+            self._out[edge.source_id].append(edge.id)
+            self._in[edge.target_id].append(edge.id)
+        self.logger.debug(f"Created {len(new_edges)} edges")
+        
+        return new_edges
+    
     def update_scores(self, edge: Edge, new_confidence: float, 
                      semantic_boost: float = 0.0):
         """Dynamically update edge confidence scores."""
@@ -291,20 +542,13 @@ def apply_ontological_inference(self, node: Node) -> List[OntologyTag]:
         
         # Check existing tags for inference rules
         for tag in node.ontology_tags:
-            # Example inference rules
-            if tag.category == "algorithm" and tag.confidence > 0.8:
-                inferred_tags.append(OntologyTag(
-                    category="computational",
-                    confidence=tag.confidence * 0.9,
-                    domain="technical"
-                ))
-            
-            if tag.category == "hypothesis" and tag.confidence > 0.7:
-                inferred_tags.append(OntologyTag(
-                    category="research_question",
-                    confidence=tag.confidence * 0.8,
-                    domain="academic"
-                ))
+            for category, domain, threshold, multiplier in self._INFERENCE_TABLE.get(tag.category, ()):
+                if tag.confidence > threshold:
+                    inferred_tags.append(OntologyTag(
+                        category=category,
+                        confidence=tag.confidence * multiplier,
+                        domain=domain
+                    ))
         
         # Add inferred tags to node
         node.ontology_tags.extend(inferred_tags)
@@ -319,39 +563,52 @@ def build_subgraph(self, root_node_id: str,
             "edges": {}
         }
         
-        visited = set()
-        queue = [(root_node_id, 0)]
+        if max_depth < 0:
+            return subgraph
+        
+        # Nodes are marked when enqueued, so each is queued once, at its BFS depth
+        visited = {root_node_id}
+        queue = deque([(root_node_id, 0)])
         
         while queue:
-            node_id, depth = queue.pop(0)
-            
-            if node_id in visited or depth > max_depth:
-                continue
-            
-            visited.add(node_id)
+            node_id, depth = queue.popleft()
+            expand = depth < max_depth
             
             # Add node to subgraph
             if node_id in self.nodes:
                 subgraph["nodes"][node_id] = self.nodes[node_id].to_dict()
             
-            # Find connected edges
-            for edge_id, edge in self.edges.items():
+            # Follow connected edges through the adjacency index; edges of the
+            # deepest nodes are included, their far ends are not
+            for edge_id in self._out.get(node_id, ()):
+                edge = self.edges[edge_id]
+                subgraph["edges"][edge_id] = edge.to_dict()
+                if expand and edge.target_id not in visited:
+                    visited.add(edge.target_id)
+                    queue.append((edge.target_id, depth + 1))
+            for edge_id in self._in.get(node_id, ()):
+                edge = self.edges[edge_id]
                 if edge.source_id == node_id:
-                    subgraph["edges"][edge_id] = edge.to_dict()
-                    if edge.target_id not in visited:
-                        queue.append((edge.target_id, depth + 1))
-                elif edge.target_id == node_id:
-                    subgraph["edges"][edge_id] = edge.to_dict()
-                    if edge.source_id not in visited:
-                        queue.append((edge.source_id, depth + 1))
+                    continue  # Self-loop, already added as outgoing
+                subgraph["edges"][edge_id] = edge.to_dict()
+                if expand and edge.source_id not in visited:
+                    visited.add(edge.source_id)
+                    queue.append((edge.source_id, depth + 1))
         
         return subgraph
     
     def export_graph(self) -> Dict[str, Any]:
-        """Export the entire graph as JSON-compatible structure."""
-        # Apply decay to old edges
+        """Export the entire graph as JSON-compatible structure.
+        
+        Edge weights are exported decayed to the current time; the stored
+        weights are left as they are (see compact_decay()).
+        """
         edge_list = list(self.edges.values())
-        self.edge_scorer.decay_old_edges(edge_list)
+        edges = {}
+        for edge, weight in zip(edge_list, self.edge_scorer.effective_weights(edge_list)):
+            edge_data = edge.to_dict()
+            edge_data["weight"] = weight
+            edges[edge.id] = edge_data
         
         # Calculate traversal statistics
         page_traversal_stats = self._calculate_traversal_stats(NodeType.PAGE)
@@ -367,7 +624,7 @@ def export_graph(self) -> Dict[str, Any]:
         
         return {
             "nodes": {node_id: node.to_dict() for node_id, node in self.nodes.items()},
-            "edges": {edge_id: edge.to_dict() for edge_id, edge in self.edges.items()},
+            "edges": edges,
             "metadata": {
                 "created_at": datetime.now().isoformat(),
                 "total_nodes": len(self.nodes),
@@ -386,53 +643,101 @@ def export_graph(self) -> Dict[str, Any]:
             }
         }
     
+    def compact_decay(self) -> None:
+        """Fold elapsed decay into the stored weights of all edges."""
+        self.edge_scorer.decay_old_edges(list(self.edges.values()))
+    
+    def _new_id(self, kind: str) -> str:
+        """Allocate a unique node ("n") or edge ("e") ID."""
+        return f"{self._id_prefix}-{kind}{next(self._id_counter)}"
+    
+    def export_graph_bytes(self, indent: bool = True) -> bytes:
+        """Export the entire graph as encoded JSON (see export_graph())."""
+        return dumps_graph(self.export_graph(), indent=indent)
+    
     def _determine_domain(self, tag_name: str) -> Optional[str]:
         """Determine the domain for an ontology tag."""
-        for domain, keywords in self.ontology_domains.items():
-            if any(keyword in tag_name.lower() for keyword in keywords):
-                return domain
-        return "general"
+        name = tag_name.lower()
+        domain = self._tag_domains.get(name)
+        if domain is None:
+            domain = self._tag_domains[name] = self._scan_domain(name)
+        return domain
+    
+    def _scan_domain(self, name: str) -> str:
+        """Find the first domain with a keyword contained in a lower-cased tag name."""
+        matches = [self._keyword_domains[match.group(1)] for match in self._keyword_pattern.finditer(name)]
+        return min(matches)[1] if matches else "general"
     
     def _calculate_lexical_similarity(self, source: Node, target: Node) -> float:
-        """Calculate lexical similarity between nodes."""
-        # Simple implementation - can be enhanced
-        source_text = str(source.content.get("text", "")).lower()
-        target_text = str(target.content.get("text", "")).lower()
-        
-        if not source_text or not target_text:
-            return 0.0
-        
-        # Word overlap similarity
-        source_words = set(source_text.split())
-        target_words = set(target_text.split())
-        
-        intersection = source_words.intersection(target_words)
-        union = source_words.union(target_words)
-        
-        if not union:
+        """Calculate lexical similarity between nodes, reusing earlier results for the pair."""
+        key = (source.id, target.id)
+        source_text = source.content.get("text", "")
+        target_text = target.content.get("text", "")
+        cached = self._similarity_cache.get(key)
+        if cached is not None and cached[0] is source_text and cached[1] is target_text:
+            self._similarity_cache.move_to_end(key)
+            return cached[2]
+        
+        similarity = self._compute_lexical_similarity(source, target)
+        self._similarity_cache[key] = (source_text, target_text, similarity)
+        self._similarity_cache.move_to_end(key)
+        if len(self._similarity_cache) > self._similarity_cache_size:
+            self._similarity_cache.popitem(last=False)
+        return similarity
+    
+    def _compute_lexical_similarity(self, source: Node, target: Node) -> float:
+        """Compute the Jaccard similarity of two nodes' words."""
+        if NUMBA_AVAILABLE:
+            source_ids = self._word_ids(source)
+            target_ids = self._word_ids(target)
+            if not source_ids.size or not target_ids.size:
+                return 0.0
+            intersection = _sorted_intersection_size(source_ids, target_ids)
+            return intersection / (source_ids.size + target_ids.size - intersection)
+        
+        source_words = self._tokens(source)
+        target_words = self._tokens(target)
+        
+        if not source_words or not target_words:
             return 0.0
         
-        return len(intersection) / len(union)
+        # Word overlap (Jaccard) similarity
+        intersection = len(source_words & target_words)
+        return intersection / (len(source_words) + len(target_words) - intersection)
+    
+    def _tokens(self, node: Node) -> FrozenSet[str]:
+        """Get the lower-cased word set of a node's text, tokenizing it at most once."""
+        text = node.content.get("text", "")
+        cached = node._token_cache
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        words = frozenset(str(text).lower().split())
+        node._token_cache = (text, words)
+        return words
+    
+    def _word_ids(self, node: Node) -> np.ndarray:
+        """Get the sorted vocabulary ids of a node's words, computing them at most once."""
+        text = node.content.get("text", "")
+        cached = node._word_ids_cache
+        if cached is not None and cached[0] is text and cached[1] is self._vocabulary:
+            return cached[2]
+        vocabulary = self._vocabulary
+        ids = np.array(sorted(vocabulary.setdefault(word, len(vocabulary)) for word in set(str(text).lower().split())),
+                       dtype=np.int64)
+        node._word_ids_cache = (text, vocabulary, ids)
+        return ids
     
     def _get_node_type_stats(self) -> Dict[str, int]:
         """Get statistics on node types."""
-        stats = {}
-        for node in self.nodes.values():
-            node_type = node.type.value
-            stats[node_type] = stats.get(node_type, 0) + 1
-        return stats
+        return dict(self._node_type_counts)
     
     def _get_edge_type_stats(self) -> Dict[str, int]:
         """Get statistics on edge types."""
-        stats = {}
-        for edge in self.edges.values():
-            edge_type = edge.type.value
-            stats[edge_type] = stats.get(edge_type, 0) + 1
-        return stats
+        return dict(self._edge_type_counts)
     
     def _calculate_ontology_coverage(self) -> float:
         """Calculate the percentage of nodes with ontology tags."""
-        tagged_nodes = sum(1 for node in self.nodes.values() if node.ontology_tags)
+        tagged_nodes = self._tagged_nodes_count
         total_nodes = len(self.nodes)
         
         if total_nodes == 0:
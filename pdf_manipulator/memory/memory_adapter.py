@@ -1,12 +1,155 @@
 """Adapter for integrating memory-graph storage with PDF processing."""
 import sqlite3
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from pathlib import Path
+import hashlib
 import json
 import uuid
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Connection settings for the write-heavy ingestion path. page_size only
+# applies to a new database and must be set before switching to WAL.
+# trusted_schema is left on: the FTS sync triggers write to an FTS5 table,
+# which SQLite rejects as unsafe when it is off.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA page_size = 8192",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16384",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+)
+
+
+def _content_memory_id(domain: str, path: str, content: str) -> str:
+    """Derive a memory ID from its domain, path and content.
+
+    A 16 byte BLAKE2b digest formatted as a UUID string, so IDs keep the
+    shape memory-graph uses while storing the same memory twice is a no-op.
+    """
+    digest = hashlib.blake2b(f"{domain}\0{path}\0{content}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest))
+
+
+def _json_array(rows: List[Any]) -> str:
+    """Encode rows as a JSON array for a json_each() parameter.
+
+    Returned as str so it is bound as TEXT: SQLite reads a BLOB argument as
+    binary JSONB.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(rows).decode()
+    return json.dumps(rows)
+
+
+def _json_each_insert(insert: str, width: int) -> str:
+    """Build an INSERT that reads its rows from one JSON array parameter.
+
+    Each element of the array is a row array with `width` values, so a whole
+    batch is bound and run as a single statement.
+    """
+    if sqlite3.sqlite_version_info >= (3, 38, 0):
+        columns = [f"value ->> {i}" for i in range(width)]
+    else:
+        columns = [f"json_extract(value, '$[{i}]')" for i in range(width)]
+    return f"{insert} SELECT {', '.join(columns)} FROM json_each(?)"
+
+
+# Node IDs are content-addressed, so storing a node again only refreshes its
+# timestamp and fills in a summary; a missing summary keeps the stored one
+_SQL_UPSERT_NODES = _json_each_insert(
+    "INSERT INTO MEMORY_NODES "
+    "(id, domain, content, timestamp, path, content_summary, summary_timestamp)", 7
+) + """ WHERE true
+   ON CONFLICT (id) DO UPDATE SET
+       timestamp = excluded.timestamp,
+       content_summary = coalesce(excluded.content_summary, content_summary),
+       summary_timestamp = CASE WHEN excluded.content_summary IS NULL
+                                THEN summary_timestamp ELSE excluded.summary_timestamp END"""
+# Tags of re-stored nodes that the new (nodeId, tag) rows no longer include
+_SQL_DELETE_STALE_TAGS = """DELETE FROM MEMORY_TAGS
+   WHERE nodeId IN (SELECT value FROM json_each(?))
+     AND (nodeId, tag) NOT IN (
+         SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]') FROM json_each(?)
+     )"""
+_SQL_INSERT_TAGS = _json_each_insert("INSERT OR IGNORE INTO MEMORY_TAGS (nodeId, tag)", 2)
+# An existing edge is updated in place rather than deleted and re-inserted
+_SQL_UPSERT_EDGES = _json_each_insert(
+    "INSERT INTO MEMORY_EDGES (id, source, target, type, strength, timestamp, domain)", 7
+) + """ WHERE true
+   ON CONFLICT (id) DO UPDATE SET
+       strength = excluded.strength, timestamp = excluded.timestamp, domain = excluded.domain"""
+
+# Full text search table with proper structure
+_SQL_CREATE_FTS = """CREATE VIRTUAL TABLE IF NOT EXISTS memory_content_fts USING fts5(
+    id UNINDEXED,     -- Memory ID (stored for joins, not tokenized)
+    content,          -- Memory content
+    content_summary,  -- Memory summary
+    path,             -- Organization path
+    tags,             -- Concatenated tags for searching
+    domain UNINDEXED, -- Domain ID (stored for filtering, not tokenized)
+    tokenize="porter unicode61"  -- Use Porter stemming algorithm
+)"""
+_SQL_REBUILD_FTS = """INSERT INTO memory_content_fts (id, content, content_summary, path, tags, domain)
+   SELECT m.id, m.content, m.content_summary, m.path,
+          (SELECT group_concat(tag, ' ') FROM MEMORY_TAGS WHERE nodeId = m.id), m.domain
+   FROM MEMORY_NODES m"""
+# A new node's FTS row takes the tags already stored for it, so a batch that
+# inserts tags before their nodes indexes each node once
+_SQL_CREATE_NODES_AI = """CREATE TRIGGER IF NOT EXISTS memory_nodes_ai AFTER INSERT ON MEMORY_NODES BEGIN
+    INSERT INTO memory_content_fts(id, content, content_summary, path, tags, domain)
+    VALUES (new.id, new.content, new.content_summary, new.path,
+            (SELECT group_concat(tag, ' ') FROM MEMORY_TAGS WHERE nodeId = new.id), new.domain);
+END"""
+# Re-index a node only when an indexed column changes, updating its FTS row
+# in place so the tags column is kept
+_SQL_CREATE_NODES_AU = """CREATE TRIGGER IF NOT EXISTS memory_nodes_au AFTER UPDATE ON MEMORY_NODES
+    WHEN old.id IS NOT new.id OR old.content IS NOT new.content
+      OR old.content_summary IS NOT new.content_summary
+      OR old.path IS NOT new.path OR old.domain IS NOT new.domain
+BEGIN
+    UPDATE memory_content_fts
+    SET id = new.id, content = new.content, content_summary = new.content_summary,
+        path = new.path, domain = new.domain
+    WHERE id = old.id;
+END"""
+_SQL_NODES_AI_TRIGGER = "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'memory_nodes_ai'"
+_SQL_NODES_AU_TRIGGER = "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'memory_nodes_au'"
+_SQL_UPDATE_SUMMARY = "UPDATE MEMORY_NODES SET content_summary = ?, summary_timestamp = ? WHERE id = ?"
+# Ranking and the limit run inside FTS5 (rank is bm25), so nodes and tags are
+# only read for the returned hits
+_SQL_SEARCH = """WITH hits AS (
+       SELECT id, rank FROM memory_content_fts
+       WHERE memory_content_fts MATCH ? AND domain = ?
+       ORDER BY rank
+       LIMIT ?
+   )
+   SELECT m.*,
+       (SELECT GROUP_CONCAT(tag) FROM MEMORY_TAGS WHERE nodeId = m.id) as tags
+   FROM hits JOIN MEMORY_NODES m ON m.id = hits.id
+   ORDER BY hits.rank"""
+# Tags are aggregated per returned row so the (domain, timestamp) index
+# supplies the order and the scan stops at the limit
+_SQL_RECENT = """SELECT m.*,
+       (SELECT GROUP_CONCAT(tag) FROM MEMORY_TAGS WHERE nodeId = m.id) as tags
+   FROM MEMORY_NODES m
+   WHERE m.domain = ?
+   ORDER BY m.timestamp DESC
+   LIMIT ?"""
+
+# Compiled statements kept per connection, covering the adapter's SQL and callers' queries
+_CACHED_STATEMENTS = 256
+
 
 @dataclass
 class MemoryConfig:
@@ -28,11 +171,18 @@ def __init__(self, config: MemoryConfig):
         self.config = config
         self.conn: Optional[sqlite3.Connection] = None
         self.domain_id: Optional[str] = None
+        self._transaction_depth = 0
         
     def connect(self) -> None:
         """Connect to the database and initialize domain."""
-        self.conn = sqlite3.connect(str(self.config.database_path))
-        self.conn.execute("PRAGMA foreign_keys = ON")
+        # Not bound to the connecting thread: MemoryProcessor writes from a
+        # single writer thread while the caller holds the transaction
+        self.conn = sqlite3.connect(
+            str(self.config.database_path), cached_statements=_CACHED_STATEMENTS,
+            check_same_thread=False
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            self.conn.execute(pragma)
         
         # Create schema if it doesn't exist
         self._create_schema()
@@ -78,8 +228,52 @@ def connect(self) -> None:
     def disconnect(self) -> None:
         """Disconnect from the database."""
         if self.conn:
+            # Let the planner refresh statistics gathered during this session
+            self.conn.execute("PRAGMA optimize")
             self.conn.close()
             self.conn = None
+            self._transaction_depth = 0
+
+    def begin(self) -> None:
+        """Open an explicit transaction unless one is already active."""
+        if not self.conn:
+            raise RuntimeError("Not connected to database")
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+
+    def commit(self) -> None:
+        """Commit the active transaction."""
+        if not self.conn:
+            raise RuntimeError("Not connected to database")
+        self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into a single transaction.
+
+        Writes made inside the block, including nested transaction() blocks
+        and the store/relationship methods, are committed once when the
+        outermost block exits, or rolled back if it raises.
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self.begin()
+        self._transaction_depth = 1
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.commit()
+        finally:
+            self._transaction_depth = 0
     
     def _create_schema(self) -> None:
         """Create the database schema if it doesn't exist."""
@@ -111,12 +305,14 @@ def _create_schema(self) -> None:
             FOREIGN KEY (domain) REFERENCES DOMAINS(id)
         );
 
+        -- Clustered on (nodeId, tag): rows live in the primary key b-tree instead of
+        -- a rowid table plus a copy in the key's index
         CREATE TABLE IF NOT EXISTS MEMORY_TAGS (
             nodeId TEXT NOT NULL,
             tag TEXT NOT NULL,
             PRIMARY KEY (nodeId, tag),
             FOREIGN KEY (nodeId) REFERENCES MEMORY_NODES(id) ON DELETE CASCADE
-        );
+        ) WITHOUT ROWID;
 
         CREATE TABLE IF NOT EXISTS MEMORY_EDGES (
             id TEXT PRIMARY KEY,
@@ -145,38 +341,24 @@ def _create_schema(self) -> None:
         );
 
         -- Indexes for performance
-        CREATE INDEX IF NOT EXISTS idx_memory_nodes_domain ON MEMORY_NODES(domain);
+        -- (domain, timestamp) also serves domain-only lookups
+        DROP INDEX IF EXISTS idx_memory_nodes_domain;
+        CREATE INDEX IF NOT EXISTS idx_memory_nodes_domain_ts ON MEMORY_NODES(domain, timestamp DESC);
         CREATE INDEX IF NOT EXISTS idx_memory_tags_tag ON MEMORY_TAGS(tag);
         CREATE INDEX IF NOT EXISTS idx_memory_edges_source ON MEMORY_EDGES(source, domain);
         CREATE INDEX IF NOT EXISTS idx_memory_edges_target ON MEMORY_EDGES(target, domain);
         CREATE INDEX IF NOT EXISTS idx_domain_refs_target ON DOMAIN_REFS(targetDomain, targetNodeId);
 
-        -- Full text search table with proper structure
-        CREATE VIRTUAL TABLE IF NOT EXISTS memory_content_fts USING fts5(
-            id,              -- Memory ID
-            content,         -- Memory content
-            content_summary, -- Memory summary
-            path,            -- Organization path
-            tags,            -- Concatenated tags for searching
-            domain,          -- Domain ID
-            tokenize="porter unicode61"  -- Use Porter stemming algorithm
-        );
+        """ + _SQL_CREATE_FTS + """;
 
         -- Triggers to maintain FTS synchronization
-        CREATE TRIGGER IF NOT EXISTS memory_nodes_ai AFTER INSERT ON MEMORY_NODES BEGIN
-            INSERT INTO memory_content_fts(id, content, content_summary, path, domain)
-            VALUES (new.id, new.content, new.content_summary, new.path, new.domain);
-        END;
+        """ + _SQL_CREATE_NODES_AI + """;
 
         CREATE TRIGGER IF NOT EXISTS memory_nodes_ad AFTER DELETE ON MEMORY_NODES BEGIN
             DELETE FROM memory_content_fts WHERE id = old.id;
         END;
 
-        CREATE TRIGGER IF NOT EXISTS memory_nodes_au AFTER UPDATE ON MEMORY_NODES BEGIN
-            DELETE FROM memory_content_fts WHERE id = old.id;
-            INSERT INTO memory_content_fts(id, content, content_summary, path, domain)
-            VALUES (new.id, new.content, new.content_summary, new.path, new.domain);
-        END;
+        """ + _SQL_CREATE_NODES_AU + """;
 
         CREATE TRIGGER IF NOT EXISTS memory_tags_ai AFTER INSERT ON MEMORY_TAGS BEGIN
             UPDATE memory_content_fts 
@@ -193,7 +375,61 @@ def _create_schema(self) -> None:
         
         # Execute schema creation
         self.conn.executescript(schema_sql)
+        self._reindex_tokenized_ids()
+        self._replace_insert_trigger()
+        self._replace_update_trigger()
+        
+        # Gather planner statistics once; PRAGMA optimize keeps them current
+        has_stats = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stats:
+            self.conn.execute("ANALYZE")
         self.conn.commit()
+    
+    def _reindex_tokenized_ids(self) -> None:
+        """Rebuild an FTS table created with tokenized id and domain columns.
+        
+        Older databases indexed both UUID columns as full-text terms, adding
+        ten unique tokens per memory to the index. The table is recreated with
+        those columns UNINDEXED and refilled from MEMORY_NODES and MEMORY_TAGS
+        in one transaction.
+        """
+        [sql] = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'memory_content_fts'"
+        ).fetchone()
+        if 'UNINDEXED' in sql:
+            return
+        with self.transaction():
+            self.conn.execute("DROP TABLE memory_content_fts")
+            self.conn.execute(_SQL_CREATE_FTS)
+            self.conn.execute(_SQL_REBUILD_FTS)
+    
+    def _replace_insert_trigger(self) -> None:
+        """Replace an insert trigger that indexes new nodes without their tags.
+        
+        With the older trigger, tags had to be inserted after their node and
+        each one rewrote the node's FTS row.
+        """
+        [sql] = self.conn.execute(_SQL_NODES_AI_TRIGGER).fetchone()
+        if 'MEMORY_TAGS' in sql:
+            return
+        with self.transaction():
+            self.conn.execute("DROP TRIGGER memory_nodes_ai")
+            self.conn.execute(_SQL_CREATE_NODES_AI)
+    
+    def _replace_update_trigger(self) -> None:
+        """Replace an update trigger that re-indexes nodes on every UPDATE.
+        
+        The older trigger deleted and re-inserted the FTS row for any change,
+        including timestamp-only updates, and dropped the row's tags.
+        """
+        [sql] = self.conn.execute(_SQL_NODES_AU_TRIGGER).fetchone()
+        if 'WHEN' in sql:
+            return
+        with self.transaction():
+            self.conn.execute("DROP TRIGGER memory_nodes_au")
+            self.conn.execute(_SQL_CREATE_NODES_AU)
             
     def store_memory(
         self,
@@ -202,7 +438,9 @@ def store_memory(
         tags: Optional[List[str]] = None,
         summary: Optional[str] = None,
         relationships: Optional[Dict[str, List[Dict[str, Any]]]] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        now: Optional[str] = None,
+        memory_id: Optional[str] = None
     ) -> str:
         """Store a memory node in the graph.
         
@@ -213,60 +451,102 @@ def store_memory(
             summary: Optional summary of the content
             relationships: Dictionary of relationship types to target memories
             metadata: Optional metadata (stored in content as JSON prefix)
+            now: ISO timestamp to record, so a batch can share one (defaults to now)
+            memory_id: ID to store the node under (defaults to one derived
+                from the domain, path and content)
             
         Returns:
-            The ID of the created memory node
+            The ID of the memory node
         """
         if not self.conn:
             raise RuntimeError("Not connected to database")
             
-        # Skip if content too short
-        if len(content.strip()) < self.config.min_content_length:
-            return None
-            
-        # Generate ID
-        memory_id = str(uuid.uuid4())
-        now = datetime.utcnow().isoformat()
-        
-        # Metadata is stored separately in the database schema
-        # We don't prepend it to content to avoid contaminating the graph
-        
-        # Insert memory node
-        self.conn.execute(
-            """INSERT INTO MEMORY_NODES 
-               (id, domain, content, timestamp, path, content_summary, summary_timestamp)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (memory_id, self.domain_id, content, now, path, summary, now if summary else None)
-        )
-        
-        # Add tags
-        if tags:
-            for tag in tags:
+        return self.store_memories_bulk([{
+            'content': content,
+            'path': path,
+            'tags': tags,
+            'summary': summary,
+            'relationships': relationships,
+            'id': memory_id,
+        }], now=now)[0]
+
+    def store_memories_bulk(
+        self,
+        memories: List[Dict[str, Any]],
+        now: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """Store several memory nodes in one transaction.
+
+        Node, tag and edge rows are collected first and written with one
+        statement per table. Storing a memory whose ID is already stored
+        updates it in place: its timestamp is refreshed, a new summary
+        replaces the stored one (a missing summary keeps it), and its tags
+        are replaced by the new ones, so tags dropped upstream are removed.
+
+        Args:
+            memories: Dictionaries with a 'content' key and optional 'path',
+                'tags', 'summary', 'relationships' and 'id' keys, as accepted by
+                store_memory
+            now: ISO timestamp to record (defaults to the current time)
+
+        Returns:
+            The ID of each memory node, or None where the content was
+            shorter than min_content_length
+        """
+        if not self.conn:
+            raise RuntimeError("Not connected to database")
+
+        now = now or datetime.utcnow().isoformat()
+        memory_ids: List[Optional[str]] = []
+        node_rows = []
+        tag_rows = []
+        edge_rows = []
+
+        for memory in memories:
+            content = memory['content']
+            # Skip if content too short
+            if len(content.strip()) < self.config.min_content_length:
+                memory_ids.append(None)
+                continue
+
+            path = memory.get('path', '/')
+            memory_id = memory.get('id') or _content_memory_id(self.domain_id, path, content)
+            memory_ids.append(memory_id)
+            summary = memory.get('summary')
+
+            # Metadata is stored separately in the database schema
+            # We don't prepend it to content to avoid contaminating the graph
+            node_rows.append((memory_id, self.domain_id, content, now, path,
+                              summary, now if summary else None))
+
+            for tag in memory.get('tags') or ():
                 # Add prefix if configured
                 if self.config.tags_prefix and not tag.startswith(self.config.tags_prefix):
                     tag = f"{self.config.tags_prefix}{tag}"
-                    
-                self.conn.execute(
-                    "INSERT INTO MEMORY_TAGS (nodeId, tag) VALUES (?, ?)",
-                    (memory_id, tag)
-                )
-        
-        # Add relationships
-        if relationships and self.config.enable_relationships:
-            for rel_type, targets in relationships.items():
-                for target in targets:
-                    edge_id = f"{memory_id}-{target['targetId']}-{rel_type}"
-                    strength = target.get('strength', 0.8)
-                    
-                    self.conn.execute(
-                        """INSERT INTO MEMORY_EDGES 
-                           (id, source, target, type, strength, timestamp, domain)
-                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                        (edge_id, memory_id, target['targetId'], rel_type, strength, now, self.domain_id)
-                    )
-        
-        self.conn.commit()
-        return memory_id
+                tag_rows.append((memory_id, tag))
+
+            relationships = memory.get('relationships')
+            if relationships and self.config.enable_relationships:
+                for rel_type, targets in relationships.items():
+                    for target in targets:
+                        edge_id = f"{memory_id}-{target['targetId']}-{rel_type}"
+                        strength = target.get('strength', 0.8)
+                        edge_rows.append((edge_id, memory_id, target['targetId'], rel_type,
+                                          strength, now, self.domain_id))
+
+        with self.transaction():
+            # Tags go in before their nodes, with foreign keys checked at commit:
+            # memory_tags_ai finds no FTS row to rewrite for a new node, and
+            # memory_nodes_ai then indexes the node with all its tags at once
+            self.conn.execute("PRAGMA defer_foreign_keys = ON")
+            if node_rows:
+                self.conn.execute(_SQL_DELETE_STALE_TAGS, (
+                    _json_array([row[0] for row in node_rows]), _json_array(tag_rows)
+                ))
+            self._insert_rows(_SQL_INSERT_TAGS, tag_rows)
+            self._insert_rows(_SQL_UPSERT_NODES, node_rows)
+            self._insert_rows(_SQL_UPSERT_EDGES, edge_rows)
+        return memory_ids
     
     def update_memory_summary(self, memory_id: str, summary: str) -> None:
         """Update the summary of an existing memory."""
@@ -274,33 +554,49 @@ def update_memory_summary(self, memory_id: str, summary: str) -> None:
             raise RuntimeError("Not connected to database")
             
         now = datetime.utcnow().isoformat()
-        self.conn.execute(
-            "UPDATE MEMORY_NODES SET content_summary = ?, summary_timestamp = ? WHERE id = ?",
-            (summary, now, memory_id)
-        )
-        self.conn.commit()
+        with self.transaction():
+            self.conn.execute(_SQL_UPDATE_SUMMARY, (summary, now, memory_id))
     
     def create_relationship(
         self,
         source_id: str,
         target_id: str,
         rel_type: str = "relates_to",
-        strength: float = 0.8
+        strength: float = 0.8,
+        now: Optional[str] = None
     ) -> None:
         """Create a relationship between two memory nodes."""
         if not self.conn:
             raise RuntimeError("Not connected to database")
             
-        edge_id = f"{source_id}-{target_id}-{rel_type}"
-        now = datetime.utcnow().isoformat()
-        
-        self.conn.execute(
-            """INSERT OR REPLACE INTO MEMORY_EDGES 
-               (id, source, target, type, strength, timestamp, domain)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (edge_id, source_id, target_id, rel_type, strength, now, self.domain_id)
-        )
-        self.conn.commit()
+        self.create_relationships_bulk([(source_id, target_id, rel_type, strength)], now=now)
+
+    def create_relationships_bulk(
+        self,
+        relationships: List[Tuple[str, str, str, float]],
+        now: Optional[str] = None
+    ) -> None:
+        """Create several relationships in one transaction.
+
+        Args:
+            relationships: (source_id, target_id, rel_type, strength) tuples
+            now: ISO timestamp to record (defaults to the current time)
+        """
+        if not self.conn:
+            raise RuntimeError("Not connected to database")
+
+        now = now or datetime.utcnow().isoformat()
+        with self.transaction():
+            self._insert_rows(_SQL_UPSERT_EDGES, [
+                (f"{source_id}-{target_id}-{rel_type}", source_id, target_id, rel_type,
+                 strength, now, self.domain_id)
+                for source_id, target_id, rel_type, strength in relationships
+            ])
+
+    def _insert_rows(self, sql: str, rows: List[tuple]) -> None:
+        """Run a json_each INSERT with all rows passed as one JSON array."""
+        if rows:
+            self.conn.execute(sql, (_json_array(rows),))
     
     def search_memories(
         self,
@@ -324,18 +620,7 @@ def search_memories(
         domain = domain or self.domain_id
         
         # Use MATCH for FTS5
-        cursor = self.conn.execute(
-            """SELECT m.*, 
-                      GROUP_CONCAT(mt.tag) as tags
-               FROM MEMORY_NODES m
-               JOIN memory_content_fts fts ON m.id = fts.id
-               LEFT JOIN MEMORY_TAGS mt ON m.id = mt.nodeId
-               WHERE memory_content_fts MATCH ? AND m.domain = ?
-               GROUP BY m.id
-               ORDER BY rank
-               LIMIT ?""",
-            (query, domain, limit)
-        )
+        cursor = self.conn.execute(_SQL_SEARCH, (query, domain, limit))
         
         results = []
         for row in cursor:
@@ -372,17 +657,7 @@ def get_recent_memories(
             
         domain = domain or self.domain_id
         
-        cursor = self.conn.execute(
-            """SELECT m.*, 
-                      GROUP_CONCAT(mt.tag) as tags
-               FROM MEMORY_NODES m
-               LEFT JOIN MEMORY_TAGS mt ON m.id = mt.nodeId
-               WHERE m.domain = ?
-               GROUP BY m.id
-               ORDER BY m.timestamp DESC
-               LIMIT ?""",
-            (domain, limit)
-        )
+        cursor = self.conn.execute(_SQL_RECENT, (domain, limit))
         
         results = []
         for row in cursor:
@@ -1,16 +1,176 @@
 """Memory processor for storing PDF content in knowledge graph."""
+import bisect
+import concurrent.futures
+import functools
 import re
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 import json
 import hashlib
 import logging
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 from ..core.document import PDFDocument
 from ..intelligence.processor import DocumentProcessor as IntelligenceProcessor
 from .memory_adapter import MemoryAdapter, MemoryConfig
 from .toc_processor import TOCProcessor, TOCStructure, TOCEntry
 
+# Heading lines in a multi-line text, tried in order: markdown, numbered,
+# formal, all caps. Surrounding whitespace on the line is not part of any group.
+# Each match starts at the newline before the line: a literal prefix lets the
+# scanner skip between lines instead of trying ^ at every character.
+_HEADING_RE = re.compile(
+    r'\n[^\S\n]*(?:'
+    r'(?P<md>#+)[^\S\n]+(?P<md_t>\S.*?)'
+    r'|(?P<num>(?:\d+\.)+)[^\S\n]+(?P<num_t>\S.*?)'
+    r'|(?:CHAPTER|Chapter|Section|SECTION)[^\S\n]+\d+[:.]?[^\S\n]*(?P<formal>\S.*?)'
+    r'|(?P<caps>[A-Z](?:[^\S\n]*[A-Z])+)'
+    r')[^\S\n]*$',
+    re.MULTILINE
+)
+
+# Sentence boundary for the extractive fallback summary
+_SENT_SPLIT = re.compile(r'[.!?]\s+')
+
+# The same heading forms as byte patterns for hyperscan, one per line. Each
+# reports the start of its line; _HEADING_RE then classifies the line.
+_HS_SPACE = rb'[\t\x0b\x0c\r\x1c-\x1f ]'
+_HS_HEADING_PATTERNS = [
+    rb'^' + _HS_SPACE + rb'*#+' + _HS_SPACE + rb'+\S.*$',
+    rb'^' + _HS_SPACE + rb'*(?:\d+\.)+' + _HS_SPACE + rb'+\S.*$',
+    rb'^' + _HS_SPACE + rb'*(?:CHAPTER|Chapter|Section|SECTION)' + _HS_SPACE
+    + rb'+\d+[:.]?' + _HS_SPACE + rb'*\S.*$',
+    rb'^' + _HS_SPACE + rb'*[A-Z](?:' + _HS_SPACE + rb'*[A-Z])+' + _HS_SPACE + rb'*$',
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _heading_database() -> "hyperscan.Database":
+    """Compile the hyperscan heading database once per process."""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=_HS_HEADING_PATTERNS,
+        ids=list(range(len(_HS_HEADING_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SOM_LEFTMOST]
+        * len(_HS_HEADING_PATTERNS)
+    )
+    return database
+
+
+def _find_headings(blob: str) -> List[re.Match]:
+    """Return the _HEADING_RE matches in blob, in order.
+
+    With hyperscan installed, ASCII text is scanned with the compiled
+    database and only the reported lines are matched with _HEADING_RE;
+    otherwise _HEADING_RE scans the whole text.
+    """
+    if not HYPERSCAN_AVAILABLE or not blob.isascii():
+        return list(_HEADING_RE.finditer(blob))
+    
+    line_starts = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        line_starts.add(start)
+    
+    _heading_database().scan(blob.encode('ascii'), match_event_handler=on_match)
+    # Each heading match begins at the newline before its line
+    matches = (_HEADING_RE.match(blob, start - 1) for start in sorted(line_starts) if start)
+    return [match for match in matches if match]
+
+
+def _short_hash(text: str) -> str:
+    """Return an 8 hex digit hash of text for section IDs.
+
+    Uses xxh32 when xxhash is installed, which has a much lower per-call cost
+    for these short inputs; otherwise a 4 byte BLAKE2b digest, which is
+    cheaper than MD5 and needs no truncation.
+    """
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh32_hexdigest(text.encode())
+    return hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+
+
+def _append_section_lines(
+    section: Dict[str, Any],
+    blob: str,
+    starts: List[int],
+    texts: List[str],
+    page_nums: List[int],
+    page_index: int,
+    position: int,
+    end: int
+) -> None:
+    """Add the non-blank lines of blob[position:end] to a section, page by page.
+
+    blob is the pages' texts joined as by _scan_sections, with starts[i] the
+    offset of page_nums[i]; a page joins the section's pages when it
+    contributes a line.
+    """
+    lines = section['lines']
+    pages = section['pages']
+    while position < end:
+        page_end = min(end, starts[page_index] + len(texts[page_index]))
+        line_count = len(lines)
+        lines.extend(filter(None, map(str.strip, blob[position:page_end].split('\n'))))
+        if len(lines) > line_count and page_nums[page_index] != pages[-1]:
+            pages.append(page_nums[page_index])
+        page_index += 1
+        if page_index < len(starts):
+            position = starts[page_index]
+        else:
+            break
+
+
+def _finish_section(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a scanned section into a section dictionary with joined content."""
+    return {
+        'id': section['id'],
+        'title': section['title'],
+        'level': section['level'],
+        'content': '\n'.join(section['lines']) + '\n',
+        'pages': section['pages']
+    }
+
+
+# Memory rows per bulk write handed to the writer thread
+_WRITE_BATCH_SIZE = 100
+
+# Concurrent AI summary requests per document, bounded to spare the backend
+_SUMMARY_WORKERS = 8
+
+# Nodes reachable from a document within max_depth edges, nearest first; content
+# is truncated in SQL so full page text is never copied out
+_SQL_GRAPH_NODES = """WITH RECURSIVE walk(id, depth) AS (
+       VALUES (?, 0)
+       UNION
+       SELECT e.target, walk.depth + 1
+       FROM MEMORY_EDGES e JOIN walk ON e.source = walk.id
+       WHERE walk.depth < ?
+   )
+   SELECT m.id,
+          CASE WHEN length(m.content) > 200 THEN substr(m.content, 1, 200) || '...'
+               ELSE m.content END,
+          m.path, m.content_summary,
+          (SELECT GROUP_CONCAT(tag) FROM MEMORY_TAGS WHERE nodeId = m.id)
+   FROM (SELECT id, MIN(depth) AS depth FROM walk GROUP BY id) w
+   JOIN MEMORY_NODES m ON m.id = w.id
+   ORDER BY w.depth"""
+_SQL_GRAPH_EDGES = """SELECT source, target, type, strength
+   FROM MEMORY_EDGES
+   WHERE source IN (SELECT value FROM json_each(?))"""
+
 
 class MemoryProcessor:
     """Process PDF documents and store extracted content as memories."""
@@ -74,17 +234,7 @@ def process_document(
             'structure_method': 'pattern-based'  # Default
         }
         
-        # Extract document metadata
-        pdf_info = pdf_document.get_info()
-        doc_metadata = {
-            'filename': pdf_document.filename,
-            'pages': pdf_document.num_pages,
-            'title': pdf_info.get('Title', Path(pdf_document.filename).stem),
-            'author': pdf_info.get('Author'),
-            'subject': pdf_info.get('Subject'),
-            'creation_date': pdf_info.get('CreationDate'),
-            **(document_metadata or {})
-        }
+        doc_metadata = self._document_metadata(pdf_document, document_metadata)
         
         # Try to detect and use TOC structure first
         toc_structure = None
@@ -103,107 +253,316 @@ def process_document(
                     results['structure_method'] = 'toc-based'
                     self.logger.info(f"Successfully parsed TOC with {len(toc_structure.entries)} entries")
         
-        # Create document-level memory
-        doc_content = self._create_document_summary(page_content, doc_metadata)
-        doc_memory_id = self.adapter.store_memory(
-            content=doc_content,
-            path=f"/documents/{Path(pdf_document.filename).stem}",
-            tags=['document', 'root', pdf_document.filename],
-            summary=self._generate_summary(doc_content) if self.intelligence else None,
-            # Don't pass metadata as it gets prepended to content, contaminating the graph
-            metadata=None
+        # Collect node and edge rows first, then write them in one transaction
+        with self.adapter.transaction():
+            self._store_document_memories(
+                pdf_document, page_content, doc_metadata, semantic_analysis,
+                toc_structure, results
+            )
+        
+        return results
+    
+    def process_document_stream(
+        self,
+        pdf_document: PDFDocument,
+        pages: Iterable[Tuple[int, str]],
+        document_metadata: Optional[Dict[str, Any]] = None,
+        semantic_analysis: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500
+    ) -> Dict[str, Any]:
+        """Process a PDF document from a stream of pages in bounded windows.
+        
+        Stores the same memories and relationships as process_document, but
+        holds at most batch_size pages at a time: each window's pages and
+        finished sections are written before the next window is read. Only
+        the section still open at the end of a window (its heading, lines so
+        far and pages) is carried into the next; earlier pages are not
+        scanned again. Sections are pattern-based, since TOC detection needs
+        the whole document.
+        
+        Args:
+            pdf_document: The PDF document object
+            pages: (page number, extracted text) pairs in page order
+            document_metadata: Optional metadata about the document
+            semantic_analysis: Optional semantic analysis keyed by page number
+            batch_size: Pages per window
+            
+        Returns:
+            Dictionary with processing results and memory IDs
+        """
+        results = {
+            'document_id': None,
+            'page_memories': {},
+            'section_memories': {},
+            'relationships': [],
+            'metadata': document_metadata or {},
+            'toc_structure': None,
+            'structure_method': 'pattern-based'
+        }
+        doc_metadata = self._document_metadata(pdf_document, document_metadata)
+        now = datetime.utcnow().isoformat()
+        
+        with self.adapter.transaction(), concurrent.futures.ThreadPoolExecutor(
+            max_workers=_SUMMARY_WORKERS, thread_name_prefix="memory-summary"
+        ) as summarizer, concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="memory-writer"
+        ) as writer:
+            open_section = None
+            window = {}
+            first = True
+            for page_num, content in pages:
+                window[page_num] = content
+                if len(window) >= batch_size:
+                    open_section = self._store_page_window(
+                        writer, summarizer, pdf_document, doc_metadata, window, open_section,
+                        semantic_analysis, results, now, first=first, final=False
+                    )
+                    window = {}
+                    first = False
+            self._store_page_window(
+                writer, summarizer, pdf_document, doc_metadata, window, open_section,
+                semantic_analysis, results, now, first=first, final=True
+            )
+        
+        return results
+    
+    def _store_page_window(
+        self,
+        writer: concurrent.futures.Executor,
+        summarizer: concurrent.futures.Executor,
+        pdf_document: PDFDocument,
+        doc_metadata: Dict[str, Any],
+        window: Dict[int, str],
+        open_section: Optional[Dict[str, Any]],
+        semantic_analysis: Optional[Dict[str, Any]],
+        results: Dict[str, Any],
+        now: str,
+        first: bool,
+        final: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Store one window of a page stream and its finished sections.
+        
+        Returns the section left open at the end of the window, as scanned
+        by _scan_sections, to continue in the next one.
+        """
+        if first:
+            doc_future = self._queue_document_row(
+                writer, summarizer, pdf_document, window, doc_metadata, now
+            )
+        page_batches = self._queue_page_rows(
+            writer, summarizer, pdf_document, window, semantic_analysis, now
+        )
+        
+        scanned = self._scan_sections(window, open_section)
+        # The last section may continue on the next window's pages
+        open_section = scanned.pop() if scanned and not final else None
+        sections = [_finish_section(section) for section in scanned]
+        section_future = self._queue_section_rows(
+            writer, summarizer, pdf_document, sections, semantic_analysis, now
         )
+        
+        if first:
+            [results['document_id']] = doc_future.result()
+        relationships = self._link_pages(page_batches, results)
+        relationships.extend(self._link_sections(sections, section_future, results))
+        writer.submit(self.adapter.create_relationships_bulk, relationships, now).result()
+        return open_section
+    
+    def _document_metadata(
+        self,
+        pdf_document: PDFDocument,
+        document_metadata: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Collect document metadata from the PDF info and caller overrides."""
+        pdf_info = pdf_document.get_info()
+        return {
+            'filename': pdf_document.filename,
+            'pages': pdf_document.num_pages,
+            'title': pdf_info.get('Title', Path(pdf_document.filename).stem),
+            'author': pdf_info.get('Author'),
+            'subject': pdf_info.get('Subject'),
+            'creation_date': pdf_info.get('CreationDate'),
+            **(document_metadata or {})
+        }
+    
+    def _store_document_memories(
+        self,
+        pdf_document: PDFDocument,
+        page_content: Dict[int, str],
+        doc_metadata: Dict[str, Any],
+        semantic_analysis: Optional[Dict[str, Any]],
+        toc_structure: Optional[TOCStructure],
+        results: Dict[str, Any]
+    ) -> None:
+        """Store the document, page and section memories and their relationships.
+        
+        Rows are handed to a single writer thread in bulk batches, so database
+        writes overlap with building the next rows and extracting sections.
+        AI summaries are requested concurrently on a separate pool and
+        resolved by the writer just before each batch is stored.
+        Relationships are written last, once every memory ID is known.
+        """
+        # One timestamp for every row written for this document
+        now = datetime.utcnow().isoformat()
+        
+        # Pool threads start on first submit, so no summary threads run
+        # without an intelligence processor
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=_SUMMARY_WORKERS, thread_name_prefix="memory-summary"
+        ) as summarizer, concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="memory-writer"
+        ) as writer:
+            self._queue_document_memories(
+                writer, summarizer, pdf_document, page_content, doc_metadata,
+                semantic_analysis, toc_structure, results, now
+            )
+    
+    def _queue_document_memories(
+        self,
+        writer: concurrent.futures.Executor,
+        summarizer: concurrent.futures.Executor,
+        pdf_document: PDFDocument,
+        page_content: Dict[int, str],
+        doc_metadata: Dict[str, Any],
+        semantic_analysis: Optional[Dict[str, Any]],
+        toc_structure: Optional[TOCStructure],
+        results: Dict[str, Any],
+        now: str
+    ) -> None:
+        """Build memory rows and submit their writes to the writer thread."""
+        doc_future = self._queue_document_row(
+            writer, summarizer, pdf_document, page_content, doc_metadata, now
+        )
+        page_batches = self._queue_page_rows(
+            writer, summarizer, pdf_document, page_content, semantic_analysis, now
+        )
+        
+        # Extract and process sections while the page batches are written
+        if toc_structure:
+            # Use TOC-based structure
+            sections = self._process_toc_sections(toc_structure, page_content)
+        else:
+            # Fallback to pattern-based extraction
+            sections = self._extract_sections(page_content)
+        section_future = self._queue_section_rows(
+            writer, summarizer, pdf_document, sections, semantic_analysis, now
+        )
+        
+        [doc_memory_id] = doc_future.result()
         results['document_id'] = doc_memory_id
         
-        # Process each page
-        for page_num, content in page_content.items():
-            if not content.strip():
-                continue
-                
-            # Store page memory
-            page_path = f"/documents/{Path(pdf_document.filename).stem}/pages/{page_num}"
+        relationships = self._link_pages(page_batches, results)
+        relationships.extend(self._link_sections(sections, section_future, results))
+        writer.submit(self.adapter.create_relationships_bulk, relationships, now).result()
+    
+    def _queue_document_row(
+        self,
+        writer: concurrent.futures.Executor,
+        summarizer: concurrent.futures.Executor,
+        pdf_document: PDFDocument,
+        page_content: Dict[int, str],
+        doc_metadata: Dict[str, Any],
+        now: str
+    ) -> concurrent.futures.Future:
+        """Submit the document-level memory; the future yields a one-ID list."""
+        doc_content = self._create_document_summary(page_content, doc_metadata)
+        # No metadata: it would be prepended to content, contaminating the graph
+        return writer.submit(self._store_memory_rows, [{
+            'content': doc_content,
+            'path': f"/documents/{Path(pdf_document.filename).stem}",
+            'tags': ['document', 'root', pdf_document.filename],
+            'summary': self._submit_summary(summarizer, doc_content),
+        }], now)
+    
+    def _queue_page_rows(
+        self,
+        writer: concurrent.futures.Executor,
+        summarizer: concurrent.futures.Executor,
+        pdf_document: PDFDocument,
+        page_content: Dict[int, str],
+        semantic_analysis: Optional[Dict[str, Any]],
+        now: str
+    ) -> List[Tuple[List[int], concurrent.futures.Future]]:
+        """Submit page memories in batches as they are built.
+        
+        Returns (page numbers, future of memory IDs) for each batch.
+        """
+        doc_stem = Path(pdf_document.filename).stem
+        page_batches = []
+        page_numbers = []
+        page_rows = []
+        # In page order, so each page's predecessor is stored before it;
+        # isspace() avoids copying every page just to test for blank text
+        nonempty_pages = [
+            (page_num, content) for page_num, content in sorted(page_content.items())
+            if content and not content.isspace()
+        ]
+        for page_num, content in nonempty_pages:
+            page_path = f"/documents/{doc_stem}/pages/{page_num}"
             page_tags = ['page', f'page:{page_num}', pdf_document.filename]
+            memory_content = content
             
             # Use semantic analysis if available
-            if semantic_analysis and page_num in semantic_analysis:
-                semantic_data = semantic_analysis[page_num]
+            semantic_data = semantic_analysis.get(page_num) if semantic_analysis else None
+            if semantic_data is not None:
                 self.logger.info(f"Using semantic analysis for page {page_num}")
                 
                 # Extract semantic summary
                 semantic_summary = None
-                if "semantic_enhancement" in semantic_data:
-                    enhancement = semantic_data["semantic_enhancement"]
+                enhancement = semantic_data.get("semantic_enhancement")
+                if enhancement is not None:
                     semantic_summary = enhancement.get("semantic_summary", "")
                     self.logger.info(f"Found semantic summary: '{semantic_summary[:100]}...'")
                     
-                    # Add key insights to tags
-                    key_insights = enhancement.get("key_insights", [])
-                    for insight in key_insights[:3]:  # Limit to top 3 insights
-                        page_tags.append(f"insight:{insight}")
+                    # Add the top 3 key insights to tags
+                    key_insights = enhancement.get("key_insights") or ()
+                    page_tags.extend(f"insight:{insight}" for insight in key_insights[:3])
                     
-                    # Add ontology tags if available
-                    if "metadata" in enhancement and "ontology_tags" in enhancement["metadata"]:
-                        ontology_tags = enhancement["metadata"]["ontology_tags"]
-                        if isinstance(ontology_tags, list):
-                            for tag in ontology_tags[:5]:  # Limit to top 5 ontology tags
-                                page_tags.append(f"ontology:{tag}")
+                    # Add the top 5 ontology tags if available
+                    ontology_tags = (enhancement.get("metadata") or {}).get("ontology_tags")
+                    if isinstance(ontology_tags, list):
+                        page_tags.extend(f"ontology:{tag}" for tag in ontology_tags[:5])
                 
                 # Create a rich semantic content including both summary and markitdown text
                 if semantic_summary:
                     memory_content = f"# Semantic Summary\n\n{semantic_summary}\n\n# Original Content\n\n{content[:2000]}"
-                else:
-                    memory_content = content
-                
-                page_memory_id = self.adapter.store_memory(
-                    content=memory_content,
-                    path=page_path,
-                    tags=page_tags,
-                    summary=self._generate_summary(memory_content) if self.intelligence else None,
-                    # Page metadata is already encoded in tags and path
-                    metadata=None
-                )
-            else:
-                page_memory_id = self.adapter.store_memory(
-                    content=content,
-                    path=page_path,
-                    tags=page_tags,
-                    summary=self._generate_summary(content) if self.intelligence else None,
-                    # Page metadata is already encoded in tags and path
-                    metadata=None
-                )
             
-            if page_memory_id:
-                results['page_memories'][page_num] = page_memory_id
-                
-                # Create relationship to document
-                self.adapter.create_relationship(
-                    source_id=page_memory_id,
-                    target_id=doc_memory_id,
-                    rel_type='part_of',
-                    strength=1.0
+            page_numbers.append(page_num)
+            page_rows.append({
+                'content': memory_content,
+                'path': page_path,
+                'tags': page_tags,
+                'summary': self._submit_summary(summarizer, memory_content),
+            })
+            if len(page_rows) >= _WRITE_BATCH_SIZE:
+                page_batches.append(
+                    (page_numbers, writer.submit(self._store_memory_rows, page_rows, now))
                 )
-                
-                # Create relationship to previous page
-                if page_num > 0 and (page_num - 1) in results['page_memories']:
-                    prev_page_id = results['page_memories'][page_num - 1]
-                    self.adapter.create_relationship(
-                        source_id=prev_page_id,
-                        target_id=page_memory_id,
-                        rel_type='precedes',
-                        strength=1.0
-                    )
+                page_numbers = []
+                page_rows = []
+        if page_rows:
+            page_batches.append(
+                (page_numbers, writer.submit(self._store_memory_rows, page_rows, now))
+            )
         
-        # Extract and process sections
-        if toc_structure:
-            # Use TOC-based structure
-            sections = self._process_toc_sections(toc_structure, page_content)
-        else:
-            # Fallback to pattern-based extraction
-            sections = self._extract_sections(page_content)
-            
+        return page_batches
+    
+    def _queue_section_rows(
+        self,
+        writer: concurrent.futures.Executor,
+        summarizer: concurrent.futures.Executor,
+        pdf_document: PDFDocument,
+        sections: List[Dict[str, Any]],
+        semantic_analysis: Optional[Dict[str, Any]],
+        now: str
+    ) -> concurrent.futures.Future:
+        """Submit section memories; the future yields IDs in section order."""
+        doc_stem = Path(pdf_document.filename).stem
+        
+        section_rows = []
         for section in sections:
             section_content = section['content']
-            section_path = f"/documents/{Path(pdf_document.filename).stem}/sections/{section['id']}"
+            section_path = f"/documents/{doc_stem}/sections/{section['id']}"
             section_tags = ['section', f"section:{section['level']}", section['title']]
             
             # Use semantic analysis if available for section pages
@@ -223,37 +582,85 @@ def process_document(
                 if semantic_summaries:
                     section_content = f"## {section['title']}\n\n" + "\n\n".join(semantic_summaries)
             
-            section_memory_id = self.adapter.store_memory(
-                content=section_content,
-                path=section_path,
-                tags=section_tags,
-                summary=self._generate_summary(section_content) if self.intelligence else None,
-                # Section metadata is already encoded in tags and content
-                metadata=None
-            )
-            
-            if section_memory_id:
-                results['section_memories'][section['id']] = section_memory_id
+            section_rows.append({
+                'content': section_content,
+                'path': section_path,
+                'tags': section_tags,
+                'summary': self._submit_summary(summarizer, section_content),
+            })
+        
+        return writer.submit(self._store_memory_rows, section_rows, now)
+    
+    def _link_pages(
+        self,
+        page_batches: List[Tuple[List[int], concurrent.futures.Future]],
+        results: Dict[str, Any]
+    ) -> List[Tuple[str, str, str, float]]:
+        """Record stored page IDs and return their relationship rows."""
+        doc_memory_id = results['document_id']
+        relationships = []
+        for page_numbers, page_future in page_batches:
+            for page_num, page_memory_id in zip(page_numbers, page_future.result()):
+                if not page_memory_id:
+                    continue
+                results['page_memories'][page_num] = page_memory_id
                 
-                # Create relationship to document
-                self.adapter.create_relationship(
-                    source_id=section_memory_id,
-                    target_id=doc_memory_id,
-                    rel_type='part_of',
-                    strength=0.9
-                )
+                # Relationship to document
+                if doc_memory_id:
+                    relationships.append((page_memory_id, doc_memory_id, 'part_of', 1.0))
                 
-                # Create relationships to pages
-                for page_num in section['pages']:
-                    if page_num in results['page_memories']:
-                        self.adapter.create_relationship(
-                            source_id=section_memory_id,
-                            target_id=results['page_memories'][page_num],
-                            rel_type='contains',
-                            strength=0.8
-                        )
-        
-        return results
+                # Relationship to previous page
+                if page_num > 0 and (page_num - 1) in results['page_memories']:
+                    prev_page_id = results['page_memories'][page_num - 1]
+                    relationships.append((prev_page_id, page_memory_id, 'precedes', 1.0))
+        return relationships
+    
+    def _link_sections(
+        self,
+        sections: List[Dict[str, Any]],
+        section_future: concurrent.futures.Future,
+        results: Dict[str, Any]
+    ) -> List[Tuple[str, str, str, float]]:
+        """Record stored section IDs and return their relationship rows."""
+        doc_memory_id = results['document_id']
+        relationships = []
+        for section, section_memory_id in zip(sections, section_future.result()):
+            if not section_memory_id:
+                continue
+            results['section_memories'][section['id']] = section_memory_id
+            
+            # Relationship to document
+            if doc_memory_id:
+                relationships.append((section_memory_id, doc_memory_id, 'part_of', 0.9))
+            
+            # Relationships to pages
+            for page_num in section['pages']:
+                if page_num in results['page_memories']:
+                    relationships.append(
+                        (section_memory_id, results['page_memories'][page_num], 'contains', 0.8)
+                    )
+        return relationships
+    
+    def _submit_summary(
+        self,
+        summarizer: concurrent.futures.Executor,
+        content: str
+    ) -> Optional[concurrent.futures.Future]:
+        """Start an AI summary of content, or return None without intelligence."""
+        if not self.intelligence:
+            return None
+        return summarizer.submit(self._generate_summary, content)
+    
+    def _store_memory_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        now: str
+    ) -> List[Optional[str]]:
+        """Resolve pending summaries in rows, then store them in bulk."""
+        for row in rows:
+            if isinstance(row['summary'], concurrent.futures.Future):
+                row['summary'] = row['summary'].result()
+        return self.adapter.store_memories_bulk(rows, now)
     
     def _create_document_summary(
         self,
@@ -273,11 +680,11 @@ def _create_document_summary(
         summary_parts.append("")
         
         # Add first page excerpt
-        if 0 in page_content and page_content[0]:
-            excerpt = page_content[0][:500].strip()
+        first_page = page_content.get(0)
+        if first_page:
             summary_parts.append("First page excerpt:")
-            summary_parts.append(excerpt)
-            if len(page_content[0]) > 500:
+            summary_parts.append(first_page[:500].strip())
+            if len(first_page) > 500:
                 summary_parts.append("...")
         
         return "\n".join(summary_parts)
@@ -295,75 +702,72 @@ def _extract_sections(
         - content: Section content
         - pages: List of pages the section spans
         """
-        sections = []
-        
-        # Common heading patterns
-        heading_patterns = [
-            (r'^#+\s+(.+)$', 'markdown'),  # Markdown headings
-            (r'^(\d+\.)+\s+(.+)$', 'numbered'),  # Numbered sections
-            (r'^(?:CHAPTER|Chapter|Section|SECTION)\s+\d+[:.]?\s*(.+)$', 'formal'),
-            (r'^[A-Z][A-Z\s]+$', 'allcaps'),  # All caps headings
-        ]
+        return [_finish_section(section) for section in self._scan_sections(page_content)]
+    
+    def _scan_sections(
+        self,
+        page_content: Dict[int, str],
+        open_section: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Find the sections in page_content, keeping their lines unjoined.
         
-        current_section = None
-        all_content = []
+        Sections carry 'lines' (the title, then each non-blank body line)
+        instead of 'content', so a section can be extended by later pages.
         
-        # Combine all pages into one text for section extraction
-        for page_num in sorted(page_content.keys()):
-            content = page_content[page_num]
-            all_content.append((page_num, content))
+        Args:
+            page_content: Dictionary mapping page numbers to extracted text
+            open_section: A section from earlier pages that these pages
+                continue; it is extended with the lines before the first
+                heading and returned first
+            
+        Returns:
+            Scanned sections in document order
+        """
+        sections = []
         
-        # Extract sections
-        for page_num, content in all_content:
-            lines = content.split('\n')
+        # Scan all pages as one text; page starts map match offsets back to pages
+        page_nums = sorted(page_content.keys())
+        texts = [page_content[page_num] for page_num in page_nums]
+        starts = []
+        offset = 1
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        blob = '\n' + '\n'.join(texts)
+        
+        headings = _find_headings(blob)
+        if open_section is not None:
+            sections.append(open_section)
+            if page_nums:
+                end = headings[0].start() if headings else len(blob)
+                _append_section_lines(open_section, blob, starts, texts, page_nums, 0, starts[0], end)
+        
+        for index, match in enumerate(headings):
+            page_index = bisect.bisect_right(starts, match.start() + 1) - 1
+            page_num = page_nums[page_index]
             
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Check if line is a heading
-                is_heading = False
-                heading_text = line
+            # The title group closes last in every branch
+            kind = match.lastgroup
+            heading_text = match.group(kind)
+            if kind == 'md_t':
+                heading_level = len(match.group('md'))
+            elif kind == 'num_t':
+                heading_level = match.group('num').count('.')
+            else:
                 heading_level = 1
-                
-                for pattern, pattern_type in heading_patterns:
-                    match = re.match(pattern, line)
-                    if match:
-                        is_heading = True
-                        if pattern_type == 'markdown':
-                            heading_level = line.count('#')
-                            heading_text = match.group(1)
-                        elif pattern_type == 'numbered':
-                            heading_level = match.group(1).count('.')
-                            heading_text = match.group(2)
-                        else:
-                            heading_text = match.group(1) if match.groups() else line
-                        break
-                
-                if is_heading:
-                    # Save previous section
-                    if current_section and current_section['content']:
-                        sections.append(current_section)
-                    
-                    # Create new section
-                    section_id = hashlib.md5(f"{heading_text}-{page_num}".encode()).hexdigest()[:8]
-                    current_section = {
-                        'id': section_id,
-                        'title': heading_text,
-                        'level': heading_level,
-                        'content': heading_text + '\n',
-                        'pages': [page_num]
-                    }
-                elif current_section:
-                    # Add content to current section
-                    current_section['content'] += line + '\n'
-                    if page_num not in current_section['pages']:
-                        current_section['pages'].append(page_num)
-        
-        # Save last section
-        if current_section and current_section['content']:
-            sections.append(current_section)
+            
+            section = {
+                'id': _short_hash(f"{heading_text}-{page_num}"),
+                'title': heading_text,
+                'level': heading_level,
+                'lines': [heading_text],
+                'pages': [page_num]
+            }
+            sections.append(section)
+            
+            # Non-blank lines up to the next heading, page by page
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(blob)
+            _append_section_lines(section, blob, starts, texts, page_nums, page_index, match.end(), end)
         
         return sections
     
@@ -386,6 +790,10 @@ def _process_toc_sections(
         
         # Create blueprint for mapping
         blueprint = self.toc_processor.create_blueprint(toc_structure, page_content)
+        # Sorted page numbers, so each entry's pages are found by bisection
+        # rather than probing every number in its range
+        page_numbers = sorted(page_content)
+        last_page = page_numbers[-1]
         
         # Process each TOC entry
         for i, entry in enumerate(flat_entries):
@@ -393,7 +801,7 @@ def _process_toc_sections(
             start_page = entry.page
             
             # Find next entry's page to determine end
-            end_page = max(page_content.keys())  # Default to last page
+            end_page = last_page  # Default to last page
             if i + 1 < len(flat_entries):
                 end_page = flat_entries[i + 1].page - 1
             
@@ -401,17 +809,18 @@ def _process_toc_sections(
             section_content = []
             pages_in_section = []
             
-            for page_num in range(start_page, end_page + 1):
-                if page_num in page_content:
-                    content = page_content[page_num]
-                    if content.strip():
-                        section_content.append(content)
-                        pages_in_section.append(page_num)
+            first = bisect.bisect_left(page_numbers, start_page)
+            last = bisect.bisect_right(page_numbers, end_page)
+            for page_num in page_numbers[first:last]:
+                content = page_content[page_num]
+                if content and not content.isspace():
+                    section_content.append(content)
+                    pages_in_section.append(page_num)
             
             if section_content:
                 # Create section ID using TOC entry number or title
                 section_id = entry.number.replace('.', '_') if entry.number else \
-                            hashlib.md5(entry.title.encode()).hexdigest()[:8]
+                            _short_hash(entry.title)
                 
                 sections.append({
                     'id': section_id,
@@ -443,11 +852,10 @@ def _process_toc_sections(
     def _generate_summary(self, content: str, max_length: int = 500) -> Optional[str]:
         """Generate a summary of the content using AI if available."""
         if not self.intelligence:
-            # Simple extractive summary
-            sentences = re.split(r'[.!?]\s+', content)
-            if sentences:
-                return sentences[0][:max_length]
-            return content[:max_length]
+            # Simple extractive summary: the first sentence, cut to max_length.
+            # A boundary past max_length can't shorten it, so only search that far
+            boundary = _SENT_SPLIT.search(content, 0, max_length + 1)
+            return content[:boundary.start() if boundary else max_length]
         
         # Use AI for summarization
         prompt = f"""Summarize this content in 1-2 sentences, capturing the key information:
@@ -504,50 +912,27 @@ def get_document_graph(
             'edges': []
         }
         
-        # Recursive function to traverse the graph
-        def traverse(node_id: str, depth: int = 0):
-            if depth > max_depth or node_id in graph['nodes']:
-                return
-            
-            # Get node data
-            cursor = self.adapter.conn.execute(
-                """SELECT m.*, GROUP_CONCAT(mt.tag) as tags
-                   FROM MEMORY_NODES m
-                   LEFT JOIN MEMORY_TAGS mt ON m.id = mt.nodeId
-                   WHERE m.id = ?
-                   GROUP BY m.id""",
-                (node_id,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                graph['nodes'][node_id] = {
-                    'id': row[0],
-                    'content': row[2][:200] + '...' if len(row[2]) > 200 else row[2],
-                    'path': row[4],
-                    'summary': row[5],
-                    'tags': row[7].split(',') if row[7] else []
-                }
-                
-                # Get edges
-                cursor = self.adapter.conn.execute(
-                    """SELECT target, type, strength
-                       FROM MEMORY_EDGES
-                       WHERE source = ?""",
-                    (node_id,)
-                )
-                
-                for edge_row in cursor:
-                    target_id, rel_type, strength = edge_row
-                    graph['edges'].append({
-                        'source': node_id,
-                        'target': target_id,
-                        'type': rel_type,
-                        'strength': strength
-                    })
-                    
-                    # Traverse to connected nodes
-                    traverse(target_id, depth + 1)
+        if max_depth < 0:
+            return graph
+        
+        # Walk the graph in SQL, then fetch the outgoing edges of every node found
+        cursor = self.adapter.conn.execute(_SQL_GRAPH_NODES, (document_id, max_depth))
+        for row in cursor:
+            graph['nodes'][row[0]] = {
+                'id': row[0],
+                'content': row[1],
+                'path': row[2],
+                'summary': row[3],
+                'tags': row[4].split(',') if row[4] else []
+            }
+        
+        cursor = self.adapter.conn.execute(_SQL_GRAPH_EDGES, (json.dumps(list(graph['nodes'])),))
+        for source_id, target_id, rel_type, strength in cursor:
+            graph['edges'].append({
+                'source': source_id,
+                'target': target_id,
+                'type': rel_type,
+                'strength': strength
+            })
         
-        traverse(document_id)
         return graph
\ No newline at end of file
@@ -26,12 +26,14 @@ CREATE TABLE IF NOT EXISTS MEMORY_NODES (
     FOREIGN KEY (domain) REFERENCES DOMAINS(id)
 );
 
+-- Clustered on (nodeId, tag): rows live in the primary key b-tree instead of
+-- a rowid table plus a copy in the key's index
 CREATE TABLE IF NOT EXISTS MEMORY_TAGS (
     nodeId TEXT NOT NULL,
     tag TEXT NOT NULL,
     PRIMARY KEY (nodeId, tag),
     FOREIGN KEY (nodeId) REFERENCES MEMORY_NODES(id) ON DELETE CASCADE
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS MEMORY_EDGES (
     id TEXT PRIMARY KEY,
@@ -60,7 +62,9 @@ CREATE TABLE IF NOT EXISTS DOMAIN_REFS (
 );
 
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_memory_nodes_domain ON MEMORY_NODES(domain);
+-- (domain, timestamp) also serves domain-only lookups
+DROP INDEX IF EXISTS idx_memory_nodes_domain;
+CREATE INDEX IF NOT EXISTS idx_memory_nodes_domain_ts ON MEMORY_NODES(domain, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_memory_tags_tag ON MEMORY_TAGS(tag);
 CREATE INDEX IF NOT EXISTS idx_memory_edges_source ON MEMORY_EDGES(source, domain);
 CREATE INDEX IF NOT EXISTS idx_memory_edges_target ON MEMORY_EDGES(target, domain);
@@ -68,29 +72,35 @@ CREATE INDEX IF NOT EXISTS idx_domain_refs_target ON DOMAIN_REFS(targetDomain, t
 
 -- Full text search table with proper structure
 CREATE VIRTUAL TABLE IF NOT EXISTS memory_content_fts USING fts5(
-    id,              -- Memory ID
-    content,         -- Memory content
-    content_summary, -- Memory summary
-    path,            -- Organization path
-    tags,            -- Concatenated tags for searching
-    domain,          -- Domain ID
+    id UNINDEXED,     -- Memory ID (stored for joins, not tokenized)
+    content,          -- Memory content
+    content_summary,  -- Memory summary
+    path,             -- Organization path
+    tags,             -- Concatenated tags for searching
+    domain UNINDEXED, -- Domain ID (stored for filtering, not tokenized)
     tokenize="porter unicode61"  -- Use Porter stemming algorithm
 );
 
 -- Triggers to maintain FTS synchronization
 CREATE TRIGGER IF NOT EXISTS memory_nodes_ai AFTER INSERT ON MEMORY_NODES BEGIN
-    INSERT INTO memory_content_fts(id, content, content_summary, path, domain)
-    VALUES (new.id, new.content, new.content_summary, new.path, new.domain);
+    INSERT INTO memory_content_fts(id, content, content_summary, path, tags, domain)
+    VALUES (new.id, new.content, new.content_summary, new.path,
+            (SELECT group_concat(tag, ' ') FROM MEMORY_TAGS WHERE nodeId = new.id), new.domain);
 END;
 
 CREATE TRIGGER IF NOT EXISTS memory_nodes_ad AFTER DELETE ON MEMORY_NODES BEGIN
     DELETE FROM memory_content_fts WHERE id = old.id;
 END;
 
-CREATE TRIGGER IF NOT EXISTS memory_nodes_au AFTER UPDATE ON MEMORY_NODES BEGIN
-    DELETE FROM memory_content_fts WHERE id = old.id;
-    INSERT INTO memory_content_fts(id, content, content_summary, path, domain)
-    VALUES (new.id, new.content, new.content_summary, new.path, new.domain);
+CREATE TRIGGER IF NOT EXISTS memory_nodes_au AFTER UPDATE ON MEMORY_NODES
+    WHEN old.id IS NOT new.id OR old.content IS NOT new.content
+      OR old.content_summary IS NOT new.content_summary
+      OR old.path IS NOT new.path OR old.domain IS NOT new.domain
+BEGIN
+    UPDATE memory_content_fts
+    SET id = new.id, content = new.content, content_summary = new.content_summary,
+        path = new.path, domain = new.domain
+    WHERE id = old.id;
 END;
 
 CREATE TRIGGER IF NOT EXISTS memory_tags_ai AFTER INSERT ON MEMORY_TAGS BEGIN
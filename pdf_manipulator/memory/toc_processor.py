@@ -200,11 +200,9 @@ def _is_toc_page(self, content: str) -> bool:
     
     def _continues_on_next_page(self, content: str) -> bool:
         """Check if TOC continues on next page."""
-        lines = content.strip().split('\n')
-        if lines:
-            last_line = lines[-1].lower()
-            return 'continued' in last_line or 'cont.' in last_line
-        return False
+        # Only the last line matters, so don't split the whole page
+        last_line = content.rstrip().rpartition('\n')[2].lower()
+        return 'continued' in last_line or 'cont.' in last_line
     
     def _is_toc_continuation(self, content: str) -> bool:
         """Check if page is a continuation of TOC."""
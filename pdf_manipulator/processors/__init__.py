@@ -1,14 +1,32 @@
-"""Semantic processing components for Memory Graph Extract."""
-
-# Import renamed processors for easier access
-from pdf_manipulator.core.pipeline import DocumentProcessor as SemanticOrchestrator
-from pdf_manipulator.intelligence.processor import DocumentProcessor as ContentExtractor
-from pdf_manipulator.memory.memory_processor import MemoryProcessor as GraphBuilder
-from pdf_manipulator.memory.toc_processor import TOCProcessor as StructureAnalyzer
-
-__all__ = [
-    'SemanticOrchestrator',
-    'ContentExtractor',
-    'GraphBuilder',
-    'StructureAnalyzer'
-]
\ No newline at end of file
+"""Semantic processing components for Memory Graph Extract.
+
+The renamed processors are resolved on first access, so importing a
+submodule such as processors.structure_analyzer does not also import the
+pipeline, intelligence and memory packages.
+
+GraphBuilder is the memory-graph MemoryProcessor; the ontology-aware graph
+builder in memory.graph_builder is exported as OntologyGraphBuilder.
+"""
+from importlib import import_module
+
+# Public name -> (module, attribute) for the renamed processors
+_EXPORTS = {
+    'SemanticOrchestrator': ('pdf_manipulator.core.pipeline', 'DocumentProcessor'),
+    'ContentExtractor': ('pdf_manipulator.intelligence.processor', 'DocumentProcessor'),
+    'GraphBuilder': ('pdf_manipulator.memory.memory_processor', 'MemoryProcessor'),
+    'OntologyGraphBuilder': ('pdf_manipulator.memory.graph_builder', 'GraphBuilder'),
+    'StructureAnalyzer': ('pdf_manipulator.memory.toc_processor', 'TOCProcessor'),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import a renamed processor the first time it is accessed."""
+    try:
+        module_name, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), attribute)
+    globals()[name] = value
+    return value
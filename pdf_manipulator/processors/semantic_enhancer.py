@@ -2,7 +2,7 @@
 import base64
 import json
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
 import logging
 from pathlib import Path
 
@@ -10,6 +10,9 @@
 from ..memory.graph_builder import Node, Edge, NodeType, EdgeType
 from .structure_analyzer import TOCStructure
 
+if TYPE_CHECKING:
+    from ..memory.graph_builder import GraphBuilder
+
 
 @dataclass
 class Context:
@@ -147,11 +147,12 @@ class LogMessages:
     STAGE_COMPLETE = "[green]Completed:[/green] {stage} ({duration:.2f}s)"
     STAGE_FAILED = "[red]Failed:[/red] {stage} - {error}"
     
-    # Page processing
-    PAGE_RENDER = "Rendering page {current}/{total}"
-    PAGE_TRANSCRIBE = "Transcribing page {current}/{total}"
-    PAGE_MARKDOWN = "Creating markdown for page {current}/{total}"
-    PAGE_COMPLETE = "Page {page} processed successfully"
+    # Page processing (%-style: pass arguments to the logger so formatting
+    # is skipped when the level is disabled)
+    PAGE_RENDER = "Rendering page %d/%d"
+    PAGE_TRANSCRIBE = "Transcribing page %d/%d"
+    PAGE_MARKDOWN = "Creating markdown for page %d/%d"
+    PAGE_COMPLETE = "Page %d processed successfully"
     
     # Document processing
     DOC_LOAD = "Loading document: {filename}"
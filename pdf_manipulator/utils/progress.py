@@ -156,9 +156,9 @@ def update_page_status(self, current_page: int):
             
             # Log the progress for detailed tracking
             if self._current_stage == "rendering":
-                logger.info(LogMessages.PAGE_RENDER.format(current=current_page, total=self._page_total))
+                logger.info(LogMessages.PAGE_RENDER, current_page, self._page_total)
             elif self._current_stage == "transcription":
-                logger.info(LogMessages.PAGE_TRANSCRIBE.format(current=current_page, total=self._page_total))
+                logger.info(LogMessages.PAGE_TRANSCRIBE, current_page, self._page_total)
             else:
                 logger.info(f"{stage_name}: Page {current_page}/{self._page_total}")
             
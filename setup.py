@@ -25,6 +25,8 @@
 extras_require = {
     "dev": ["pytest>=7.0.0", "pytest-cov>=4.0.0"],
     "test": ["pytest>=7.0.0", "pytest-cov>=4.0.0", "pytest-mock>=3.0.0"],
+    "http2": ["httpx[http2]>=0.24.0"],  # Multiplexed concurrent page requests to TLS backends
+    "speedups": ["numba>=0.57.0", "orjson>=3.9", "pybase64>=1.3.0", "xxhash>=3.0.0", "hyperscan>=0.4.0"],  # Compiled text scanning, fast JSON, SIMD image encoding, fast hashing, heading scans
 }
 
 setup(
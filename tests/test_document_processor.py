@@ -0,0 +1,183 @@
+"""Tests for the intelligence DocumentProcessor page loop."""
+import base64
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import pytest
+
+from pdf_manipulator.intelligence.base import IntelligenceBackend, encode_image_base64
+from pdf_manipulator.intelligence.memory_enhanced import MemoryEnhancedBackend
+from pdf_manipulator.intelligence.processor import DocumentProcessor, _text_stats
+from pdf_manipulator.memory import MemoryConfig
+
+
+class FakeBackend(IntelligenceBackend):
+    """Backend returning a fixed transcription for every page."""
+
+    def __init__(self, text: str = "Heading\nsome page text"):
+        self.text = text
+        self.images = []
+
+    def transcribe_image(self, image_path, prompt: Optional[str] = None) -> str:
+        self.images.append(image_path)
+        return self.text
+
+    def transcribe_text(self, text: str, prompt_template: Optional[str] = None) -> str:
+        return text
+
+    def supports_image_input(self) -> bool:
+        return True
+
+    def get_name(self) -> str:
+        return "fake"
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"model": "fake"}
+
+
+@pytest.fixture
+def page_images(tmp_path):
+    """Create three dummy page images."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"page_{i:04d}.png"
+        path.write_bytes(b"image-%d" % i)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "single",
+    "  leading space\nsecond line",
+    "tabs\tand\x0bvertical\x1cseparators\n" * 5000,
+    "non-ascii é　words " * 8000,
+])
+def test_text_stats_matches_split(text):
+    """First line and word count agree with str.split() semantics."""
+    assert _text_stats(text) == (text.split('\n')[0], len(text.split()))
+
+
+def test_process_image_passes_bytes(page_images):
+    """The image is read once and handed to the backend as bytes."""
+    backend = FakeBackend()
+    DocumentProcessor(backend).process_image(page_images[0])
+
+    assert backend.images == [b"image-0"]
+
+
+class FlakyBackend(FakeBackend):
+    """Backend that times out a fixed number of times before succeeding."""
+
+    def __init__(self, failures: int, error: Exception):
+        super().__init__()
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def transcribe_image(self, image_path, prompt: Optional[str] = None) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return super().transcribe_image(image_path, prompt)
+
+
+def test_process_image_retries_transient_errors(page_images):
+    """Transient backend failures are retried until the call succeeds."""
+    backend = FlakyBackend(failures=2, error=TimeoutError("timed out"))
+    processor = DocumentProcessor(backend, max_attempts=3, retry_backoff=0)
+
+    assert processor.process_image(page_images[0]) == backend.text
+    assert backend.calls == 3
+
+
+def test_process_image_does_not_retry_permanent_errors(page_images):
+    """Non-transient failures are raised on the first attempt."""
+    backend = FlakyBackend(failures=1, error=ValueError("bad request"))
+    processor = DocumentProcessor(backend, max_attempts=3, retry_backoff=0)
+
+    with pytest.raises(ValueError):
+        processor.process_image(page_images[0])
+    assert backend.calls == 1
+
+
+def test_failed_run_resumes_from_checkpoint(page_images, tmp_path):
+    """Pages completed before a failure are checkpointed and skipped on rerun."""
+    output_dir = tmp_path / "md"
+
+    class FailOnThirdPage(FakeBackend):
+        def transcribe_image(self, image_path, prompt: Optional[str] = None) -> str:
+            if image_path == b"image-2":
+                raise ValueError("backend crashed")
+            return super().transcribe_image(image_path, prompt)
+
+    with pytest.raises(Exception):
+        DocumentProcessor(FailOnThirdPage()).transcribe_document_pages(page_images, output_dir, "doc")
+
+    checkpoint = output_dir / "doc_toc_checkpoint.json"
+    assert checkpoint.exists()
+
+    backend = FakeBackend()
+    toc = DocumentProcessor(backend).transcribe_document_pages(page_images, output_dir, "doc")
+
+    assert backend.images == [b"image-2"]
+    assert [page["page_number"] for page in toc["pages"]] == [1, 2, 3]
+    assert not checkpoint.exists()
+
+
+def test_identical_images_reuse_transcription(tmp_path):
+    """A repeated page image is transcribed by the backend only once."""
+    paths = []
+    for name in ("blank_a.png", "blank_b.png"):
+        path = tmp_path / name
+        path.write_bytes(b"same-pixels")
+        paths.append(path)
+
+    backend = FakeBackend()
+    processor = DocumentProcessor(backend)
+
+    assert processor.process_image(paths[0]) == processor.process_image(paths[1])
+    assert backend.images == [b"same-pixels"]
+
+
+def test_unchanged_markdown_is_not_rewritten(page_images, tmp_path):
+    """Rerunning with identical output leaves existing markdown files untouched."""
+    output_dir = tmp_path / "md"
+    processor = DocumentProcessor(FakeBackend())
+    processor.transcribe_document_pages(page_images, output_dir, "doc")
+
+    md_path = output_dir / "page_0000.md"
+    os.utime(md_path, ns=(0, 0))
+    processor.transcribe_document_pages(page_images, output_dir, "doc")
+    assert md_path.stat().st_mtime_ns == 0
+
+    DocumentProcessor(FakeBackend("Changed text")).transcribe_document_pages(page_images, output_dir, "doc")
+    assert md_path.read_text(encoding="utf-8") == "# Page 1\n\nChanged text"
+
+
+def test_encode_image_base64_matches_stdlib(page_images):
+    """Memory-mapped files and raw bytes encode the same as base64.b64encode."""
+    expected = base64.b64encode(b"image-0").decode()
+    assert encode_image_base64(page_images[0]) == expected
+    assert encode_image_base64(b"image-0") == expected
+
+
+def test_memory_enhanced_backend_forwards_lifecycle(tmp_path):
+    """Warmup and close reach the backend wrapped by MemoryEnhancedBackend."""
+    calls = []
+
+    class PooledBackend(FakeBackend):
+        def warmup(self):
+            calls.append("warmup")
+
+        def close(self):
+            calls.append("close")
+
+    backend = MemoryEnhancedBackend(PooledBackend(), MemoryConfig(database_path=tmp_path / "memory.db"))
+    with DocumentProcessor(backend) as processor:
+        processor.start_warmup()
+        assert processor.ready(timeout=5)
+
+    assert calls == ["warmup", "close"]
+    assert backend.get_name() == "memory_enhanced:fake"
@@ -0,0 +1,290 @@
+"""Tests for the ontology-aware knowledge graph builder."""
+import json
+import math
+import sys
+
+import pytest
+
+from pdf_manipulator.memory import graph_builder
+from pdf_manipulator.memory.graph_builder import EdgeType, GraphBuilder, NodeType
+
+
+@pytest.fixture
+def chain():
+    """A graph of four pages linked in reading order, plus an unrelated node."""
+    graph = GraphBuilder()
+    pages = [graph.create_node({"text": f"page {i} text"}, NodeType.PAGE) for i in range(4)]
+    for source, target in zip(pages, pages[1:]):
+        graph.create_edge(source, target, EdgeType.PRECEDES)
+    graph.create_node({"text": "unrelated"}, NodeType.CONCEPT)
+    return graph, pages
+
+
+def test_build_subgraph_follows_edges_both_ways_up_to_max_depth(chain):
+    """Nodes are reached through outgoing and incoming edges within max_depth."""
+    graph, pages = chain
+
+    subgraph = graph.build_subgraph(pages[1].id, max_depth=1)
+
+    assert set(subgraph["nodes"]) == {pages[0].id, pages[1].id, pages[2].id}
+    assert len(subgraph["edges"]) == 3
+
+    full = graph.build_subgraph(pages[0].id, max_depth=5)
+    assert set(full["nodes"]) == {page.id for page in pages}
+    assert set(full["edges"]) == set(graph.edges)
+
+
+def test_decay_old_edges_scales_weights_by_age():
+    """Edges decay exponentially by hours since their last update."""
+    graph = GraphBuilder()
+    a = graph.create_node({"text": "shared words here"}, NodeType.PAGE)
+    b = graph.create_node({"text": "shared words there"}, NodeType.PAGE)
+    fresh = graph.create_edge(a, b, EdgeType.RELATES_TO)
+    old = graph.create_edge(b, a, EdgeType.RELATES_TO)
+    untracked = graph.create_edge(a, a, EdgeType.RELATES_TO)
+
+    scorer = graph.edge_scorer
+    scorer.edge_timestamps[old.id] -= 10 * 3600
+    del scorer.edge_timestamps[untracked.id]
+    weights = {edge.id: edge.weight for edge in graph.edges.values()}
+
+    scorer.decay_old_edges(list(graph.edges.values()))
+
+    assert fresh.weight == pytest.approx(weights[fresh.id], rel=1e-4)
+    assert old.weight == pytest.approx(weights[old.id] * math.exp(-scorer.decay_rate * 10), rel=1e-4)
+    assert untracked.weight == weights[untracked.id]
+
+
+def test_ids_are_unique_within_and_across_builders(chain):
+    """Counter-based IDs never repeat, even between separately built graphs."""
+    graph, _ = chain
+    other_node = GraphBuilder().create_node({"text": "x"}, NodeType.PAGE)
+
+    ids = list(graph.nodes) + list(graph.edges)
+    assert len(set(ids)) == len(ids)
+    assert other_node.id not in ids
+
+
+def test_lexical_similarity_tracks_replaced_text():
+    """Cached word sets are rebuilt when a node's text is replaced."""
+    graph = GraphBuilder()
+    a = graph.create_node({"text": "Graph nodes and edges"}, NodeType.PAGE)
+    b = graph.create_node({"text": "graph edges"}, NodeType.PAGE)
+
+    assert graph._calculate_lexical_similarity(a, b) == pytest.approx(2 / 4)
+
+    b.content["text"] = "nothing shared"
+    assert graph._calculate_lexical_similarity(a, b) == 0.0
+    assert graph._calculate_lexical_similarity(a, graph.create_node({}, NodeType.PAGE)) == 0.0
+
+
+def test_repeated_decay_does_not_compound_the_same_interval():
+    """A second decay right after the first leaves weights unchanged."""
+    graph = GraphBuilder()
+    a = graph.create_node({"text": "shared words"}, NodeType.PAGE)
+    edge = graph.create_edge(a, a, EdgeType.RELATES_TO)
+    scorer = graph.edge_scorer
+    scorer.edge_timestamps[edge.id] -= 5 * 3600
+    initial = edge.weight
+
+    scorer.decay_old_edges([edge])
+    once = edge.weight
+    scorer.decay_old_edges([edge])
+
+    assert once == pytest.approx(initial * math.exp(-scorer.decay_rate * 5), rel=1e-4)
+    assert edge.weight == once
+
+
+@pytest.mark.parametrize("tag, domain", [
+    ("algorithm", "technical"),
+    ("Sorting_Algorithms", "technical"),
+    ("growth strategy", "business"),
+    ("strategy_for_algorithm_design", "technical"),
+    ("hypothesis", "academic"),
+    ("unrelated", "general"),
+])
+def test_determine_domain_matches_keyword_substrings(tag, domain):
+    """Tags map to the first domain with a keyword inside the tag name."""
+    graph = GraphBuilder()
+    assert graph._determine_domain(tag) == domain
+    assert graph._determine_domain(tag) == domain
+
+
+def test_to_dict_is_refreshed_when_edge_changes():
+    """Cached serializations follow weight, confidence and tag changes."""
+    graph = GraphBuilder()
+    node = graph.create_node({"text": "a b"}, NodeType.CONCEPT, ontology_tags=["algorithm"], confidence=0.9)
+    edge = graph.create_edge(node, node, EdgeType.RELATES_TO)
+
+    first = edge.to_dict()
+    first["weight"] = "caller edit"
+    assert edge.to_dict()["weight"] == edge.weight
+
+    graph.update_scores(edge, new_confidence=0.5)
+    assert edge.to_dict()["confidence"] == 0.5
+
+    assert len(node.to_dict()["ontology_tags"]) == 1
+    graph.apply_ontological_inference(node)
+    node.content["page"] = 3
+    exported = node.to_dict()
+    assert [tag["category"] for tag in exported["ontology_tags"]] == ["algorithm", "computational"]
+    assert exported["content"]["page"] == 3
+
+
+def test_to_dict_reflects_in_place_changes():
+    """Edited tags, a changed type and caller edits never leak into later exports."""
+    graph = GraphBuilder()
+    node = graph.create_node({"text": "a b"}, NodeType.CONCEPT, ontology_tags=["algorithm"])
+    node.to_dict()
+
+    node.ontology_tags[0].category = "method"
+    node.type = NodeType.ENTITY
+    exported = node.to_dict()
+    assert [tag["category"] for tag in exported["ontology_tags"]] == ["method"]
+    assert exported["type"] == "entity"
+
+    exported["ontology_tags"].append({"category": "caller edit"})
+    exported["ontology_tags"][0]["category"] = "caller edit"
+    assert [tag["category"] for tag in node.to_dict()["ontology_tags"]] == ["method"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses need Python 3.10")
+def test_graph_records_have_no_instance_dict(chain):
+    """Nodes and edges are slotted records."""
+    graph, pages = chain
+    assert not hasattr(pages[0], "__dict__")
+    assert not hasattr(next(iter(graph.edges.values())), "__dict__")
+
+
+def test_create_edges_bulk_matches_create_edge():
+    """Bulk-created edges get the same weights and indexing as single ones."""
+    single, bulk = GraphBuilder(), GraphBuilder()
+    texts = ["graph nodes edges", "graph edges", "unrelated words"]
+    pairs = [(0, 1, EdgeType.RELATES_TO, 0.9, 0.5), (1, 2, EdgeType.PRECEDES, 1.0, 0.0), (0, 1, EdgeType.SUPPORTS, 0.7, 2.0)]
+
+    single_nodes = [single.create_node({"text": text}, NodeType.PAGE) for text in texts]
+    bulk_nodes = [bulk.create_node({"text": text}, NodeType.PAGE) for text in texts]
+    expected = [single.create_edge(single_nodes[s], single_nodes[t], kind, confidence, strength)
+                for s, t, kind, confidence, strength in pairs]
+    created = bulk.create_edges_bulk([(bulk_nodes[s], bulk_nodes[t], kind, confidence, strength)
+                                      for s, t, kind, confidence, strength in pairs])
+
+    assert [(e.type, e.weight, e.confidence) for e in created] == [
+        (e.type, pytest.approx(e.weight), e.confidence) for e in expected]
+    assert list(bulk.edges.values()) == created
+    assert set(bulk.build_subgraph(bulk_nodes[2].id)["edges"]) == set(bulk.edges)
+
+
+@pytest.mark.skipif(not graph_builder.NUMBA_AVAILABLE, reason="numba not installed")
+def test_compiled_similarity_matches_set_similarity(monkeypatch):
+    """The numba word-id path gives the same Jaccard scores as Python sets."""
+    graph = GraphBuilder()
+    texts = ["graph nodes and edges", "Graph EDGES carry weights", "", "weights weights and nodes"]
+    nodes = [graph.create_node({"text": text}, NodeType.PAGE) for text in texts]
+    pairs = [(a, b) for a in nodes for b in nodes]
+
+    compiled = [graph._calculate_lexical_similarity(a, b) for a, b in pairs]
+    monkeypatch.setattr(graph_builder, "NUMBA_AVAILABLE", False)
+    assert compiled == pytest.approx([graph._calculate_lexical_similarity(a, b) for a, b in pairs])
+
+
+def test_ontological_inference_applies_confident_rules():
+    """Rules fire only above their confidence threshold."""
+    graph = GraphBuilder()
+    confident = graph.create_node({}, NodeType.CONCEPT, ontology_tags=["hypothesis", "algorithm"], confidence=0.9)
+    unsure = graph.create_node({}, NodeType.CONCEPT, ontology_tags=["algorithm"], confidence=0.75)
+
+    inferred = graph.apply_ontological_inference(confident)
+
+    assert [(tag.category, tag.domain) for tag in inferred] == [
+        ("research_question", "academic"), ("computational", "technical")]
+    assert inferred[0].confidence == pytest.approx(0.72)
+    assert graph.apply_ontological_inference(unsure) == []
+
+
+def test_export_reports_decayed_weights_without_mutating_edges():
+    """Exports decay weights on read; compact_decay stores the decay."""
+    graph = GraphBuilder()
+    node = graph.create_node({"text": "shared words"}, NodeType.PAGE)
+    edge = graph.create_edge(node, node, EdgeType.RELATES_TO)
+    graph.edge_scorer.edge_timestamps[edge.id] -= 2 * 3600
+    stored = edge.weight
+    decayed = stored * math.exp(-graph.edge_scorer.decay_rate * 2)
+
+    for _ in range(2):
+        assert graph.export_graph()["edges"][edge.id]["weight"] == pytest.approx(decayed, rel=1e-4)
+    assert edge.weight == stored
+
+    graph.compact_decay()
+    assert edge.weight == pytest.approx(decayed, rel=1e-4)
+    assert graph.export_graph()["edges"][edge.id]["weight"] == pytest.approx(decayed, rel=1e-4)
+
+
+def test_export_graph_bytes_round_trips(chain):
+    """The encoded export decodes to the same structure as export_graph()."""
+    graph, pages = chain
+    pages[0].content["title"] = "Über"
+
+    decoded = json.loads(graph.export_graph_bytes())
+    exported = graph.export_graph()
+
+    assert decoded["nodes"] == exported["nodes"]
+    assert decoded["edges"].keys() == exported["edges"].keys()
+    assert decoded["nodes"][pages[0].id]["content"]["title"] == "Über"
+
+
+def test_export_metadata_counts_types_and_tagged_nodes(chain):
+    """Running type and coverage statistics match the graph contents."""
+    graph, pages = chain
+    concept = graph.create_node({"text": "x"}, NodeType.CONCEPT, ontology_tags=["theory"])
+    graph.create_edges_bulk([(concept, pages[0], EdgeType.DEFINES, 1.0, 0.0)])
+
+    metadata = graph.export_graph()["metadata"]
+
+    assert metadata["node_types"] == {"page": 4, "concept": 2}
+    assert metadata["edge_types"] == {"precedes": 3, "defines": 1}
+    assert metadata["ontology_coverage"] == pytest.approx(1 / 6)
+
+
+def test_build_subgraph_visits_hub_neighbours_once():
+    """Densely connected nodes are expanded once each."""
+    graph = GraphBuilder()
+    nodes = [graph.create_node({"text": str(i)}, NodeType.CONCEPT) for i in range(6)]
+    graph.create_edges_bulk([(a, b, EdgeType.RELATES_TO, 1.0, 0.0) for a in nodes for b in nodes if a is not b])
+
+    expanded = []
+
+    class RecordingIndex(dict):
+        def get(self, key, default=None):
+            expanded.append(key)
+            return super().get(key, default)
+
+    graph._out = RecordingIndex(graph._out)
+
+    subgraph = graph.build_subgraph(nodes[0].id, max_depth=3)
+
+    assert sorted(expanded) == sorted(node.id for node in nodes)
+    assert len(subgraph["edges"]) == 30
+    assert graph.build_subgraph(nodes[0].id, max_depth=-1) == {"nodes": {}, "edges": {}}
+
+
+def test_rescoring_reuses_pair_similarity_until_text_changes(monkeypatch):
+    """update_scores recomputes similarity only after a node's text is replaced."""
+    graph = GraphBuilder()
+    a = graph.create_node({"text": "graph nodes"}, NodeType.PAGE)
+    b = graph.create_node({"text": "graph edges"}, NodeType.PAGE)
+    edge = graph.create_edge(a, b, EdgeType.RELATES_TO)
+
+    computed = []
+    compute = graph._compute_lexical_similarity
+    monkeypatch.setattr(graph, "_compute_lexical_similarity",
+                        lambda source, target: computed.append(1) or compute(source, target))
+
+    graph.update_scores(edge, 0.9)
+    graph.update_scores(edge, 0.8)
+    assert computed == []
+
+    b.content["text"] = "graph nodes"
+    graph.update_scores(edge, 0.7)
+    assert computed == [1]
+    assert edge.weight == pytest.approx(1.0)
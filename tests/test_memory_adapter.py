@@ -0,0 +1,307 @@
+"""Tests for MemoryAdapter storage."""
+import sqlite3
+import uuid
+
+import pytest
+
+from pdf_manipulator.memory import MemoryAdapter, MemoryConfig, memory_adapter
+
+LONG_TEXT = "This page describes the storage layer and how memories are written. " * 2
+
+
+@pytest.fixture
+def config(tmp_path):
+    return MemoryConfig(database_path=tmp_path / "memory.db")
+
+
+@pytest.fixture
+def adapter(config):
+    adapter = MemoryAdapter(config)
+    adapter.connect()
+    yield adapter
+    adapter.disconnect()
+
+
+def count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_store_memories_bulk_returns_ids_in_order(adapter):
+    target = adapter.store_memory(LONG_TEXT, path="/target")
+
+    ids = adapter.store_memories_bulk([
+        {'content': LONG_TEXT, 'path': '/a', 'tags': ['page', 'pdf:raw'],
+         'relationships': {'part_of': [{'targetId': target, 'strength': 0.5}]}},
+        {'content': 'too short'},
+        {'content': LONG_TEXT, 'path': '/b', 'summary': 'b'},
+    ])
+
+    assert ids[1] is None
+    assert ids[0] and ids[2] and ids[0] != ids[2]
+    assert adapter.conn.execute(
+        "SELECT path FROM MEMORY_NODES WHERE id = ?", (ids[2],)
+    ).fetchone()[0] == '/b'
+    tags = {row[0] for row in adapter.conn.execute(
+        "SELECT tag FROM MEMORY_TAGS WHERE nodeId = ?", (ids[0],)
+    )}
+    assert tags == {'pdf:page', 'pdf:raw'}
+    assert adapter.conn.execute(
+        "SELECT target, type, strength FROM MEMORY_EDGES WHERE source = ?", (ids[0],)
+    ).fetchall() == [(target, 'part_of', 0.5)]
+
+
+def test_writes_inside_transaction_commit_once(adapter, config):
+    reader = sqlite3.connect(str(config.database_path))
+    try:
+        with adapter.transaction():
+            first = adapter.store_memory(LONG_TEXT, path='/first')
+            second = adapter.store_memory(LONG_TEXT, path='/second')
+            adapter.create_relationship(first, second)
+            # Nothing is visible to other connections until the outer block exits
+            assert count(reader, "MEMORY_NODES") == 0
+        assert count(reader, "MEMORY_NODES") == 2
+        assert count(reader, "MEMORY_EDGES") == 1
+    finally:
+        reader.close()
+
+
+def test_transaction_rolls_back_on_error(adapter):
+    with pytest.raises(RuntimeError):
+        with adapter.transaction():
+            adapter.store_memory(LONG_TEXT)
+            with adapter.transaction():
+                adapter.store_memory(LONG_TEXT)
+            raise RuntimeError("abort")
+
+    assert count(adapter.conn, "MEMORY_NODES") == 0
+    # The adapter is usable again after the rollback
+    adapter.store_memory(LONG_TEXT)
+    assert count(adapter.conn, "MEMORY_NODES") == 1
+
+
+def test_connect_enables_wal(adapter):
+    assert adapter.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert adapter.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert adapter.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert adapter.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert adapter.conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+
+
+def test_tags_are_indexed_once_per_node(adapter):
+    [schema_version] = adapter.conn.execute("PRAGMA schema_version").fetchone()
+    memory_id = adapter.store_memory(LONG_TEXT, tags=['glossary', 'pdf:glossary', 'appendix'])
+    single_id = adapter.store_memory(LONG_TEXT, path='/index', tags=['index'])
+
+    assert adapter.conn.execute(
+        "SELECT tags FROM memory_content_fts WHERE id = ?", (memory_id,)
+    ).fetchone()[0] == 'pdf:appendix pdf:glossary'
+    assert [m['id'] for m in adapter.search_memories('tags:glossary')] == [memory_id]
+    assert [m['id'] for m in adapter.search_memories('tags:index')] == [single_id]
+
+    # Storing runs no DDL, so other connections keep their compiled statements
+    assert adapter.conn.execute("PRAGMA schema_version").fetchone() == (schema_version,)
+
+    # Retagging an existing node, by this adapter or another writer, is indexed too
+    adapter.store_memory(LONG_TEXT, tags=['appendix', 'reviewed'])
+    adapter.conn.execute("INSERT INTO MEMORY_TAGS (nodeId, tag) VALUES (?, 'pdf:late')", (memory_id,))
+    assert adapter.conn.execute(
+        "SELECT tags FROM memory_content_fts WHERE id = ?", (memory_id,)
+    ).fetchone()[0] == 'pdf:appendix pdf:late pdf:reviewed'
+
+
+@pytest.mark.parametrize("orjson_available", [True, False])
+def test_bulk_insert_preserves_values(adapter, monkeypatch, orjson_available):
+    monkeypatch.setattr(memory_adapter, "ORJSON_AVAILABLE", orjson_available)
+    content = "Überblick über die Speicherschicht — “quoted” text and emoji ✓. " * 2
+    [memory_id] = adapter.store_memories_bulk([{'content': content, 'path': '/ü'}])
+
+    row = adapter.conn.execute(
+        "SELECT content, path, content_summary, typeof(content_summary) FROM MEMORY_NODES WHERE id = ?",
+        (memory_id,)
+    ).fetchone()
+    assert row == (content, '/ü', None, 'null')
+
+    adapter.create_relationship(memory_id, memory_id, 'self', 1)
+    assert adapter.conn.execute(
+        "SELECT strength, typeof(strength) FROM MEMORY_EDGES"
+    ).fetchone() == (1.0, 'real')
+
+
+def test_recent_memories_use_domain_timestamp_index(adapter):
+    older = adapter.store_memory(LONG_TEXT, tags=['a', 'b'], now='2024-01-01T00:00:00')
+    newer = adapter.store_memory(LONG_TEXT, path='/newer', now='2024-02-01T00:00:00')
+    recent = adapter.get_recent_memories()
+    assert [m['id'] for m in recent] == [newer, older]
+    assert sorted(recent[1]['tags']) == ['pdf:a', 'pdf:b']
+
+    plan = adapter.conn.execute(
+        "EXPLAIN QUERY PLAN " + memory_adapter._SQL_RECENT, (adapter.domain_id, 10)
+    ).fetchall()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "idx_memory_nodes_domain_ts" in details
+    assert "TEMP B-TREE" not in details
+    assert adapter.conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone()[0] == 1
+
+
+def test_create_relationship_updates_existing_edge_in_place(adapter):
+    source, target = adapter.store_memories_bulk([{'content': LONG_TEXT}, {'content': LONG_TEXT}])
+    adapter.create_relationship(source, target, 'cites', 0.4)
+    adapter.create_relationship(target, source, 'cited_by', 0.4)
+    before = adapter.conn.execute("SELECT rowid, id FROM MEMORY_EDGES WHERE type = 'cites'").fetchone()
+
+    adapter.create_relationship(source, target, 'cites', 0.9)
+
+    # Updated in place, not deleted and re-inserted under a new rowid
+    assert adapter.conn.execute(
+        "SELECT rowid, id, strength FROM MEMORY_EDGES WHERE type = 'cites'"
+    ).fetchall() == [(*before, 0.9)]
+    assert before[1] == f"{source}-{target}-cites"
+
+
+def test_tags_table_is_clustered_on_node(adapter):
+    [sql] = adapter.conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'MEMORY_TAGS'"
+    ).fetchone()
+    assert sql.rstrip().endswith("WITHOUT ROWID")
+
+    plan = adapter.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT tag FROM MEMORY_TAGS WHERE nodeId = ?", ('x',)
+    ).fetchall()
+    assert "PRIMARY KEY" in plan[0][-1]
+
+
+def test_connect_reindexes_fts_with_tokenized_ids(config):
+    adapter = MemoryAdapter(config)
+    adapter.connect()
+    memory_id = adapter.store_memory(LONG_TEXT, tags=['legacy', 'index'])
+    adapter.disconnect()
+
+    conn = sqlite3.connect(str(config.database_path))
+    conn.executescript("""
+        DROP TABLE memory_content_fts;
+        CREATE VIRTUAL TABLE memory_content_fts USING fts5(
+            id, content, content_summary, path, tags, domain, tokenize="porter unicode61"
+        );
+    """)
+    conn.commit()
+    conn.close()
+
+    adapter.connect()
+    try:
+        assert [m['id'] for m in adapter.search_memories('tags:legacy')] == [memory_id]
+        adapter.conn.execute(
+            "CREATE VIRTUAL TABLE temp.fts_terms USING fts5vocab(main, memory_content_fts, 'col')"
+        )
+        indexed = {row[0] for row in adapter.conn.execute("SELECT DISTINCT col FROM fts_terms")}
+        assert indexed == {'content', 'tags'}  # no id or domain terms
+    finally:
+        adapter.disconnect()
+
+
+def test_search_memories_ranks_and_limits_hits(adapter):
+    weak = adapter.store_memory(LONG_TEXT + " wal mentioned once.", tags=['weak'])
+    strong = adapter.store_memory(LONG_TEXT + " wal wal wal checkpoints wal.", tags=['strong', 'wal'])
+    adapter.store_memory(LONG_TEXT)
+
+    results = adapter.search_memories('wal')
+    assert [m['id'] for m in results] == [strong, weak]
+    assert sorted(results[0]['tags']) == ['pdf:strong', 'pdf:wal']
+
+    assert [m['id'] for m in adapter.search_memories('wal', limit=1)] == [strong]
+    assert adapter.search_memories('wal', domain='other') == []
+
+
+def test_update_memory_summary_keeps_tags_indexed(adapter):
+    memory_id = adapter.store_memory(LONG_TEXT, tags=['archive'])
+    adapter.update_memory_summary(memory_id, "Quarterly ledger reconciliation")
+
+    assert [m['id'] for m in adapter.search_memories('tags:archive')] == [memory_id]
+    assert [m['id'] for m in adapter.search_memories('ledger')] == [memory_id]
+
+
+def test_connect_replaces_unconditional_update_trigger(config):
+    adapter = MemoryAdapter(config)
+    adapter.connect()
+    adapter.disconnect()
+
+    conn = sqlite3.connect(str(config.database_path))
+    conn.executescript("""
+        DROP TRIGGER memory_nodes_au;
+        CREATE TRIGGER memory_nodes_au AFTER UPDATE ON MEMORY_NODES BEGIN
+            DELETE FROM memory_content_fts WHERE id = old.id;
+            INSERT INTO memory_content_fts(id, content, content_summary, path, domain)
+            VALUES (new.id, new.content, new.content_summary, new.path, new.domain);
+        END;
+    """)
+    conn.close()
+
+    adapter.connect()
+    try:
+        [sql] = adapter.conn.execute(memory_adapter._SQL_NODES_AU_TRIGGER).fetchone()
+        assert 'WHEN' in sql
+    finally:
+        adapter.disconnect()
+
+
+def test_connect_replaces_insert_trigger_without_tags(config):
+    adapter = MemoryAdapter(config)
+    adapter.connect()
+    adapter.disconnect()
+
+    conn = sqlite3.connect(str(config.database_path))
+    conn.executescript("""
+        DROP TRIGGER memory_nodes_ai;
+        CREATE TRIGGER memory_nodes_ai AFTER INSERT ON MEMORY_NODES BEGIN
+            INSERT INTO memory_content_fts(id, content, content_summary, path, domain)
+            VALUES (new.id, new.content, new.content_summary, new.path, new.domain);
+        END;
+    """)
+    conn.close()
+
+    adapter.connect()
+    try:
+        memory_id = adapter.store_memory(LONG_TEXT, tags=['glossary', 'appendix'])
+        assert [m['id'] for m in adapter.search_memories('tags:glossary')] == [memory_id]
+    finally:
+        adapter.disconnect()
+
+
+def test_store_memory_ids_are_content_addressed(adapter):
+    first = adapter.store_memory(LONG_TEXT, path='/a', tags=['one'], summary="First")
+    again = adapter.store_memory(LONG_TEXT, path='/a', tags=['two'], summary="Second")
+    other = adapter.store_memory(LONG_TEXT, path='/b')
+    chosen = adapter.store_memory(LONG_TEXT, path='/c', memory_id='chosen-id')
+
+    assert first == again != other
+    assert chosen == 'chosen-id'
+    assert str(uuid.UUID(first)) == first
+    assert count(adapter.conn, "MEMORY_NODES") == 3
+    assert adapter.conn.execute(
+        "SELECT content_summary FROM MEMORY_NODES WHERE id = ?", (first,)
+    ).fetchone()[0] == "Second"
+    assert [m['id'] for m in adapter.search_memories('tags:two')] == [first]
+
+
+def test_restoring_memory_fills_summary_and_replaces_tags(adapter):
+    memory_id = adapter.store_memory(LONG_TEXT, path='/x', tags=['a', 'kept'], now='2024-01-01T00:00:00')
+    again = adapter.store_memory(LONG_TEXT, path='/x', summary="AI summary", tags=['b', 'kept'],
+                                 now='2024-02-01T00:00:00')
+
+    def stored():
+        node = adapter.conn.execute(
+            "SELECT content_summary, summary_timestamp, timestamp FROM MEMORY_NODES WHERE id = ?", (memory_id,)
+        ).fetchone()
+        tags = {tag for [tag] in adapter.conn.execute("SELECT tag FROM MEMORY_TAGS WHERE nodeId = ?", (memory_id,))}
+        return node, tags
+
+    assert again == memory_id
+    assert stored() == (("AI summary", '2024-02-01T00:00:00', '2024-02-01T00:00:00'), {'pdf:b', 'pdf:kept'})
+    assert [m['id'] for m in adapter.search_memories('tags:b')] == [memory_id]
+    assert adapter.search_memories('tags:a') == []
+
+    # Storing without a summary keeps the stored one
+    adapter.store_memory(LONG_TEXT, path='/x', now='2024-03-01T00:00:00')
+    assert stored() == (("AI summary", '2024-02-01T00:00:00', '2024-03-01T00:00:00'), set())
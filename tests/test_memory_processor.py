@@ -0,0 +1,396 @@
+"""Tests for MemoryProcessor ingestion and section extraction."""
+import hashlib
+import threading
+
+import pytest
+
+from pdf_manipulator.memory import MemoryAdapter, MemoryConfig, MemoryProcessor, memory_processor
+from pdf_manipulator.memory.toc_processor import TOCEntry, TOCFormat, TOCStructure
+
+LONG_TEXT = "This page describes the storage layer and how memories are written. " * 2
+
+
+class FakePDFDocument:
+    """Minimal stand-in for PDFDocument."""
+
+    filename = "report.pdf"
+    num_pages = 3
+
+    def get_info(self):
+        return {'Title': 'Report'}
+
+
+@pytest.fixture
+def config(tmp_path):
+    return MemoryConfig(database_path=tmp_path / "memory.db")
+
+
+@pytest.fixture
+def adapter(config):
+    adapter = MemoryAdapter(config)
+    adapter.connect()
+    yield adapter
+    adapter.disconnect()
+
+
+def count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_process_document_stores_pages_sections_and_edges(config):
+    page_content = {
+        0: "# Introduction\n" + LONG_TEXT,
+        1: LONG_TEXT,
+        2: "# Results\n" + LONG_TEXT,
+    }
+
+    with MemoryProcessor(config, use_toc_first=False) as processor:
+        results = processor.process_document(FakePDFDocument(), page_content)
+        conn = processor.adapter.conn
+
+        assert results['document_id']
+        assert sorted(results['page_memories']) == [0, 1, 2]
+        assert len(results['section_memories']) == 2
+        assert count(conn, "MEMORY_NODES") == 6
+
+        edges = conn.execute("SELECT type, COUNT(*) FROM MEMORY_EDGES GROUP BY type").fetchall()
+        # 3 pages + 2 sections belong to the document; sections span pages 0-1 and 2
+        assert dict(edges) == {'part_of': 5, 'precedes': 2, 'contains': 3}
+
+        timestamps = conn.execute(
+            "SELECT timestamp FROM MEMORY_NODES UNION SELECT timestamp FROM MEMORY_EDGES"
+        ).fetchall()
+        assert len(timestamps) == 1
+
+
+@pytest.mark.parametrize("line, title, level", [
+    ("## Storage Layer", "Storage Layer", 2),
+    ("# C# Bindings", "C# Bindings", 1),
+    ("1.2. Write Path", "Write Path", 2),
+    ("Chapter 3: Indexes", "Indexes", 1),
+    ("APPENDIX A", "APPENDIX A", 1),
+])
+def test_extract_sections_classifies_headings(config, line, title, level):
+    processor = MemoryProcessor(config)
+
+    sections = processor._extract_sections({0: f"{line}\nbody text\n\nmore text"})
+
+    assert len(sections) == 1
+    assert sections[0]['title'] == title
+    assert sections[0]['level'] == level
+    assert sections[0]['content'] == f"{title}\nbody text\nmore text\n"
+    assert sections[0]['pages'] == [0]
+
+
+def test_extract_sections_tracks_spanned_pages(config):
+    processor = MemoryProcessor(config)
+    page_content = {0: "# Intro\nfirst", 1: "second\nthird", 2: "fourth", 3: "# Next\nfifth"}
+
+    sections = processor._extract_sections(page_content)
+
+    assert [section['pages'] for section in sections] == [[0, 1, 2], [3]]
+    assert all(set(section) == {'id', 'title', 'level', 'content', 'pages'} for section in sections)
+
+
+def test_get_document_graph_walks_to_max_depth(config):
+    with MemoryProcessor(config) as processor:
+        adapter = processor.adapter
+        doc, page, section, far = adapter.store_memories_bulk(
+            [{'content': LONG_TEXT, 'path': f'/{name}', 'tags': [name]}
+             for name in ('doc', 'page', 'section', 'far')]
+        )
+        adapter.create_relationships_bulk([
+            (doc, page, 'contains', 1.0),
+            (page, section, 'part_of', 0.9),
+            (section, far, 'relates_to', 0.5),
+            (section, doc, 'part_of', 0.9),
+        ])
+
+        graph = processor.get_document_graph(doc, max_depth=1)
+        assert list(graph['nodes']) == [doc, page]
+        assert graph['nodes'][page]['tags'] == ['pdf:page']
+        assert {(e['source'], e['target']) for e in graph['edges']} == {(doc, page), (page, section)}
+
+        graph = processor.get_document_graph(doc, max_depth=2)
+        assert list(graph['nodes']) == [doc, page, section]
+        assert len(graph['edges']) == 4
+
+        assert processor.get_document_graph(doc, max_depth=-1) == {'nodes': {}, 'edges': []}
+
+
+def test_get_document_graph_truncates_long_content(config):
+    with MemoryProcessor(config) as processor:
+        long_text = "Ä" + LONG_TEXT * 3
+        short_id, long_id = processor.adapter.store_memories_bulk(
+            [{'content': LONG_TEXT}, {'content': long_text}]
+        )
+        processor.adapter.create_relationship(short_id, long_id)
+
+        nodes = processor.get_document_graph(short_id)['nodes']
+        assert nodes[short_id]['content'] == LONG_TEXT
+        assert nodes[long_id]['content'] == long_text[:200] + '...'
+
+
+def test_graph_queries_seek_edges_and_tags_by_index(adapter):
+    plans = [
+        adapter.conn.execute(
+            "EXPLAIN QUERY PLAN " + sql, params
+        ).fetchall()
+        for sql, params in (
+            (memory_processor._SQL_GRAPH_NODES, ('doc', 2)),
+            (memory_processor._SQL_GRAPH_EDGES, ('[]',)),
+        )
+    ]
+
+    details = [row[-1] for plan in plans for row in plan]
+    assert any("idx_memory_edges_source" in detail for detail in details)
+    assert any("MEMORY_TAGS USING PRIMARY KEY (nodeId=?)" in detail for detail in details)
+    # Only the CTE, its seed row and the json_each ID list are scanned
+    scanned = {detail.split()[1] for detail in details if detail.startswith("SCAN")}
+    assert scanned <= {'CONSTANT', 'walk', 'w', 'json_each'}
+
+
+def test_extract_sections_handles_indented_headings_and_page_edges(config):
+    processor = MemoryProcessor(config)
+    page_content = {
+        4: "preamble without heading\n  ## Scope  \n",
+        5: "",
+        6: "\tdetails\n1.2.3. Deep Dive\nSUMMARY",
+    }
+
+    sections = processor._extract_sections(page_content)
+
+    assert [(s['title'], s['level'], s['pages'], s['content']) for s in sections] == [
+        ('Scope', 2, [4, 6], 'Scope\ndetails\n'),
+        ('Deep Dive', 3, [6], 'Deep Dive\n'),
+        ('SUMMARY', 1, [6], 'SUMMARY\n'),
+    ]
+
+
+@pytest.mark.parametrize("xxhash_available", [True, False])
+def test_section_ids_are_short_stable_hashes(config, monkeypatch, xxhash_available):
+    if xxhash_available and not memory_processor.XXHASH_AVAILABLE:
+        pytest.skip("xxhash not installed")
+    monkeypatch.setattr(memory_processor, "XXHASH_AVAILABLE", xxhash_available)
+    processor = MemoryProcessor(config)
+
+    first = processor._extract_sections({3: "# Scope\nbody"})
+    second = processor._extract_sections({3: "# Scope\nother body"})
+
+    assert first[0]['id'] == second[0]['id']
+    assert len(first[0]['id']) == 8
+    assert int(first[0]['id'], 16) >= 0
+    if not xxhash_available:
+        assert first[0]['id'] == hashlib.blake2b(b"Scope-3", digest_size=4).hexdigest()
+
+
+def test_process_document_writes_batches_on_writer_thread(config, monkeypatch):
+    monkeypatch.setattr(memory_processor, "_WRITE_BATCH_SIZE", 2)
+    page_content = {page: LONG_TEXT for page in range(5)}
+
+    with MemoryProcessor(config, use_toc_first=False) as processor:
+        batches = []
+        store_bulk = processor.adapter.store_memories_bulk
+
+        def record(rows, now=None):
+            batches.append((threading.current_thread().name, len(rows)))
+            return store_bulk(rows, now)
+
+        monkeypatch.setattr(processor.adapter, "store_memories_bulk", record)
+        results = processor.process_document(FakePDFDocument(), page_content)
+
+        assert sorted(results['page_memories']) == list(range(5))
+        assert all(name.startswith("memory-writer") for name, _ in batches)
+        # Document row first, then the pages in batches of two
+        assert [size for _, size in batches][:4] == [1, 2, 2, 1]
+        edges = processor.adapter.conn.execute(
+            "SELECT COUNT(*) FROM MEMORY_EDGES WHERE type = 'precedes'"
+        ).fetchone()[0]
+        assert edges == 4
+
+
+def test_find_headings_with_hyperscan_matches_regex_scan():
+    pytest.importorskip("hyperscan")
+    blob = "\n# Intro\ntext\n  2.1. Scope \nCHAPTER 3: Methods\nA B C\nplain line\n# \n"
+
+    expected = [match.span() for match in memory_processor._HEADING_RE.finditer(blob)]
+    assert [match.span() for match in memory_processor._find_headings(blob)] == expected
+
+
+def test_process_document_links_pages_given_out_of_order(config):
+    page_content = {2: LONG_TEXT, 0: LONG_TEXT, 1: "  \n\t", 3: LONG_TEXT}
+
+    with MemoryProcessor(config, use_toc_first=False) as processor:
+        results = processor.process_document(FakePDFDocument(), page_content)
+        pages = results['page_memories']
+
+        assert sorted(pages) == [0, 2, 3]
+        edges = processor.adapter.conn.execute(
+            "SELECT source, target FROM MEMORY_EDGES WHERE type = 'precedes'"
+        ).fetchall()
+        assert edges == [(pages[2], pages[3])]
+
+
+def test_process_document_requests_summaries_concurrently(config):
+    class PairedIntelligence:
+        """Answers only once two requests are in flight at the same time."""
+
+        def __init__(self):
+            self.barrier = threading.Barrier(2, timeout=5)
+
+        def process(self, prompt, max_tokens=None):
+            self.barrier.wait()
+            return " Paired summary. "
+
+    page_content = {page: LONG_TEXT for page in range(3)}
+
+    with MemoryProcessor(config, PairedIntelligence(), use_toc_first=False) as processor:
+        processor.process_document(FakePDFDocument(), page_content)
+
+        summaries = processor.adapter.conn.execute(
+            "SELECT DISTINCT content_summary FROM MEMORY_NODES"
+        ).fetchall()
+        assert summaries == [("Paired summary.",)]
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("Contents\n1 Intro .... 1\n(continued)\n\n  ", True),
+    ("  Contents cont.", True),
+    ("Contents\n(continued)\n9 Index .... 80", False),
+    ("", False),
+])
+def test_toc_continuation_checks_last_line(config, content, expected):
+    processor = MemoryProcessor(config)
+
+    assert processor.toc_processor._continues_on_next_page(content) is expected
+
+
+def test_process_document_tags_pages_from_semantic_analysis(config):
+    semantic_analysis = {
+        0: {"semantic_enhancement": {
+            "semantic_summary": "Storage overview",
+            "key_insights": ["wal", "bulk", "fts", "extra"],
+            "metadata": {"ontology_tags": ["database", "sqlite"]},
+        }},
+        1: {"semantic_enhancement": {"key_insights": None, "metadata": None}},
+    }
+
+    with MemoryProcessor(config, use_toc_first=False) as processor:
+        results = processor.process_document(
+            FakePDFDocument(), {0: LONG_TEXT, 1: LONG_TEXT}, semantic_analysis=semantic_analysis
+        )
+        tags = dict(processor.adapter.conn.execute(
+            "SELECT nodeId, GROUP_CONCAT(tag, ' ') FROM MEMORY_TAGS GROUP BY nodeId"
+        ).fetchall())
+
+        first, second = (set(tags[results['page_memories'][page]].split()) for page in (0, 1))
+        assert {'pdf:insight:wal', 'pdf:insight:bulk', 'pdf:insight:fts',
+                'pdf:ontology:database', 'pdf:ontology:sqlite'} <= first
+        assert 'pdf:insight:extra' not in first
+        assert not any(tag.startswith(('pdf:insight:', 'pdf:ontology:')) for tag in second)
+
+
+def test_process_document_stream_matches_whole_document(tmp_path):
+    page_content = {
+        0: "# Introduction\n" + LONG_TEXT,
+        1: LONG_TEXT + "\n## Scope\n" + LONG_TEXT,
+        2: LONG_TEXT,
+        3: "   \n",
+        4: LONG_TEXT + "\n  # Results  \n" + LONG_TEXT,
+        5: "1.2. Details\n" + LONG_TEXT,
+    }
+
+    def stored(processor):
+        conn = processor.adapter.conn
+        nodes = conn.execute(
+            "SELECT path, content FROM MEMORY_NODES ORDER BY path"
+        ).fetchall()
+        edges = conn.execute(
+            "SELECT s.path, t.path, e.type FROM MEMORY_EDGES e"
+            " JOIN MEMORY_NODES s ON s.id = e.source JOIN MEMORY_NODES t ON t.id = e.target"
+            " ORDER BY 1, 2, 3"
+        ).fetchall()
+        return nodes, edges
+
+    whole_config = MemoryConfig(database_path=tmp_path / "whole.db")
+    with MemoryProcessor(whole_config, use_toc_first=False) as processor:
+        processor.process_document(FakePDFDocument(), page_content)
+        expected = stored(processor)
+
+    stream_config = MemoryConfig(database_path=tmp_path / "stream.db")
+    with MemoryProcessor(stream_config) as processor:
+        results = processor.process_document_stream(
+            FakePDFDocument(), iter(page_content.items()), batch_size=2
+        )
+        assert stored(processor) == expected
+
+    assert results['document_id']
+    assert sorted(results['page_memories']) == [0, 1, 2, 4, 5]
+    assert len(results['section_memories']) == 4
+
+
+def test_process_document_stream_carries_only_the_open_section(config):
+    pages = [(0, "# Only heading\n" + LONG_TEXT)] + [(page, f"Body line {page}.") for page in range(1, 300)]
+    scanned = []
+
+    with MemoryProcessor(config) as processor:
+        scan_sections = processor._scan_sections
+
+        def recording_scan(page_content, open_section=None):
+            scanned.append((len(page_content), open_section and set(open_section)))
+            return scan_sections(page_content, open_section)
+
+        processor._scan_sections = recording_scan
+        results = processor.process_document_stream(FakePDFDocument(), iter(pages), batch_size=20)
+        [content] = processor.adapter.conn.execute(
+            "SELECT content FROM MEMORY_NODES WHERE id = ?", list(results['section_memories'].values())
+        ).fetchone()
+
+    # Each window scans only its own pages; no earlier page text is carried
+    assert [size for size, _ in scanned] == [20] * 15 + [0]
+    assert all(keys in (None, {'id', 'title', 'level', 'lines', 'pages'}) for _, keys in scanned)
+    assert content.splitlines()[0] == "Only heading"
+    assert content.splitlines()[-1] == "Body line 299."
+    assert len(content.splitlines()) == 301
+
+
+def test_process_document_rerun_is_idempotent(config):
+    page_content = {0: "# Introduction\n" + LONG_TEXT, 1: LONG_TEXT}
+
+    with MemoryProcessor(config, use_toc_first=False) as processor:
+        first = processor.process_document(FakePDFDocument(), page_content)
+        nodes, edges = count(processor.adapter.conn, "MEMORY_NODES"), count(processor.adapter.conn, "MEMORY_EDGES")
+        second = processor.process_document(FakePDFDocument(), page_content)
+
+        assert second['page_memories'] == first['page_memories']
+        assert count(processor.adapter.conn, "MEMORY_NODES") == nodes
+        assert count(processor.adapter.conn, "MEMORY_EDGES") == edges
+
+
+def test_toc_sections_collect_sparse_pages_in_range(config):
+    entries = [
+        TOCEntry(number="1", title="Setup", page=2, level=1, raw_text="1 Setup 2"),
+        TOCEntry(number="2", title="Usage", page=40, level=1, raw_text="2 Usage 40"),
+    ]
+    toc = TOCStructure(entries=entries, format=TOCFormat.NUMBERED, toc_pages=[0], root_entries=entries)
+    page_content = {page: f"Page {page} text" for page in (5, 2, 90, 39, 40)}
+    page_content[39] = "  \n"
+
+    sections = MemoryProcessor(config)._process_toc_sections(toc, page_content)
+
+    toc_sections = {section['title']: section for section in sections if 'toc_entry' in section}
+    assert toc_sections['Setup']['pages'] == [2, 5]
+    assert toc_sections['Setup']['content'] == "Page 2 text\n\nPage 5 text"
+    assert toc_sections['Usage']['pages'] == [40, 90]
+
+
+@pytest.mark.parametrize("content, max_length, expected", [
+    ("First sentence. Second one.", 500, "First sentence"),
+    ("No boundary at all", 500, "No boundary at all"),
+    ("A long opening sentence. Then more.", 6, "A long"),
+    ("Ends with a stop.", 500, "Ends with a stop."),
+])
+def test_generate_summary_fallback_uses_first_sentence(config, content, max_length, expected):
+    processor = MemoryProcessor(config)
+
+    assert processor._generate_summary(content, max_length) == expected
@@ -0,0 +1,351 @@
+"""Tests for the two-phase SemanticProcessor."""
+import json
+import os
+import threading
+from typing import Dict, Any, Optional
+
+import fitz
+import pytest
+from PIL import Image
+
+from pdf_manipulator.intelligence import summarizer
+from pdf_manipulator.intelligence.base import IntelligenceBackend
+from pdf_manipulator.intelligence.processor import DocumentProcessor
+from pdf_manipulator.intelligence.semantic_processor import (
+    PAGE_ANALYSIS_SCHEMA, SemanticProcessor, _extract_first_json_object
+)
+
+
+class FakeEnhancementBackend(IntelligenceBackend):
+    """Backend answering every page with a JSON summary of its prompt."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.barrier = None
+        self.calls = 0
+        self.prompts = {}
+
+    def process_page_with_context(self, image_path, extracted_text: str,
+                                  context: Optional[Dict[str, Any]] = None,
+                                  response_schema: Optional[Dict[str, Any]] = None) -> str:
+        self.response_schema = response_schema
+        with self.lock:
+            self.calls += 1
+            self.prompts[image_path.name] = extracted_text
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        with self.lock:
+            self.in_flight -= 1
+        return "```json\n" + json.dumps({
+            "image": image_path.name,
+            "key_insights": [f"insight from {image_path.name}"],
+            "enhanced_text": f"Corrected text of {image_path.name}",
+            "semantic_summary": f"Summary of {image_path.name}",
+        }) + "\n```"
+
+    def transcribe_image(self, image_path, prompt: Optional[str] = None) -> str:
+        return ""
+
+    def transcribe_text(self, text: str, prompt_template: Optional[str] = None) -> str:
+        return text
+
+    def supports_image_input(self) -> bool:
+        return True
+
+    def get_name(self) -> str:
+        return "fake"
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"model": "fake"}
+
+
+@pytest.fixture
+def page_images(tmp_path):
+    """Create page images with pre-extracted markdown alongside."""
+    images_dir = tmp_path / "images"
+    markdown_dir = tmp_path / "markdown"
+    images_dir.mkdir()
+    markdown_dir.mkdir()
+    paths = []
+    for i in range(4):
+        path = images_dir / f"page_{i:04d}.png"
+        path.write_bytes(b"image")
+        (markdown_dir / f"page_{i:04d}_extracted.md").write_text(
+            f"# Page {i + 1}\n\nText of page {i + 1}.", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_process_pages_sends_requests_concurrently(page_images):
+    """Enhancement calls overlap and results come back in input order."""
+    backend = FakeEnhancementBackend()
+    backend.barrier = threading.Barrier(2)
+    processor = SemanticProcessor(backend, backend, max_concurrent_requests=2)
+
+    pages = [(path, i + 1, {}) for i, path in enumerate(page_images)]
+    results = processor.process_pages(pages)
+
+    assert backend.max_in_flight == 2
+    assert [r["page_number"] for r in results] == [1, 2, 3, 4]
+    assert [r["semantic_enhancement"]["image"] for r in results] == [p.name for p in page_images]
+    assert results[2]["extracted_text"] == "Text of page 3."
+
+
+def test_process_page_matches_process_pages(page_images):
+    """The single-page entry point returns the same analysis as a batch of one."""
+    backend = FakeEnhancementBackend()
+    processor = SemanticProcessor(backend, backend)
+
+    single = processor.process_page(page_images[1], 2)
+    batch = processor.process_pages([(page_images[1], 2, None)])[0]
+
+    assert single == batch
+    assert single["semantic_enhancement"]["image"] == "page_0001.png"
+
+
+@pytest.mark.parametrize("entry_point", ["iter_document_pages", "process_document_pages_with_progress"])
+def test_document_processor_sends_page_windows_concurrently(page_images, tmp_path, entry_point):
+    """The document loops feed windows of pages to the semantic pipeline."""
+    backend = FakeEnhancementBackend()
+    backend.barrier = threading.Barrier(2)
+    processor = DocumentProcessor(backend)
+    processor.semantic_processor = SemanticProcessor(backend, backend, max_concurrent_requests=2)
+    processor.use_semantic_pipeline = True
+
+    output_dir = tmp_path / "output"
+    if entry_point == "iter_document_pages":
+        pages = list(processor.iter_document_pages(page_images, output_dir, "doc"))
+    else:
+        pages = processor.process_document_pages_with_progress(page_images, output_dir, "doc")["pages"]
+
+    assert backend.calls == 4
+    assert backend.max_in_flight == 2
+    assert [page["page_number"] for page in pages] == [1, 2, 3, 4]
+    assert "Corrected text of page_0002.png" in (output_dir / "page_0002.md").read_text(encoding="utf-8")
+    # The second window sees the summaries of the pages before it
+    assert "Context from Previous Pages" not in backend.prompts["page_0001.png"]
+    for name in ("page_0002.png", "page_0003.png"):
+        assert "Page 1: Summary of page_0000.png" in backend.prompts[name]
+        assert "Page 2: Summary of page_0001.png" in backend.prompts[name]
+
+
+CACHE_CONFIG = {"semantic_enhancement": {"cache": {"enabled": True}}}
+
+
+def write_pages(tmp_path, texts, dark_pages=()):
+    """Write one blank page image and markdown file per text."""
+    images_dir = tmp_path / "images"
+    markdown_dir = tmp_path / "markdown"
+    images_dir.mkdir()
+    markdown_dir.mkdir()
+    paths = []
+    for i, text in enumerate(texts):
+        path = images_dir / f"page_{i:04d}.png"
+        image = Image.new("L", (90, 80), color=255)
+        if i in dark_pages:
+            image.paste(0, (0, 0, 45, 80))
+        image.save(path)
+        (markdown_dir / f"page_{i:04d}_extracted.md").write_text(f"# Header\n\n{text}", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_near_duplicate_page_reuses_enhancement(tmp_path):
+    """A page repeating an earlier page's text and image skips the LLM call."""
+    paths = write_pages(tmp_path, ["Standard terms and conditions apply to every order."] * 3, dark_pages=(2,))
+
+    backend = FakeEnhancementBackend()
+    processor = SemanticProcessor(backend, backend, config=CACHE_CONFIG)
+
+    results = [processor.process_page(path, i + 1) for i, path in enumerate(paths)]
+
+    assert backend.calls == 2
+    assert results[1]["cache_hit"] is True
+    assert results[1]["semantic_enhancement"]["key_insights"] == ["insight from page_0000.png"]
+    assert "image" not in results[1]["semantic_enhancement"]
+    assert "cache_hit" not in results[2]
+
+
+def test_near_duplicate_cache_is_off_by_default(tmp_path):
+    """Without cache config every page gets its own enhancement call."""
+    paths = write_pages(tmp_path, ["Standard terms and conditions apply to every order."] * 2)
+
+    backend = FakeEnhancementBackend()
+    processor = SemanticProcessor(backend, backend)
+
+    results = [processor.process_page(path, i + 1) for i, path in enumerate(paths)]
+
+    assert processor.semantic_cache is None
+    assert backend.calls == 2
+    assert not any(r.get("cache_hit") for r in results)
+
+
+def test_near_duplicate_page_keeps_its_own_text(tmp_path):
+    """Pages differing in one amount share analysis but never text."""
+    clause = ("The supplier shall deliver the goods described in schedule A to the buyer "
+              "within thirty days of the order date, and the buyer shall pay a total of {} "
+              "on delivery under the payment terms agreed in section four of this contract.")
+    texts = [clause.format("12,000 USD"), clause.format("95,000 USD")]
+    paths = write_pages(tmp_path, texts)
+
+    backend = FakeEnhancementBackend()
+    processor = SemanticProcessor(backend, backend, config=CACHE_CONFIG)
+
+    results = [processor.process_page(path, i + 1) for i, path in enumerate(paths)]
+
+    assert results[1]["cache_hit"] is True
+    assert results[0]["semantic_enhancement"]["enhanced_text"] == "Corrected text of page_0000.png"
+    second = results[1]["semantic_enhancement"]
+    assert second["enhanced_text"] == texts[1]
+    assert "12,000" not in json.dumps(second)
+
+
+def test_summarize_keeps_central_sentences_in_order():
+    """LexRank picks sentences sharing the text's main vocabulary."""
+    text = ("Graph databases store nodes and edges. "
+            "Weather was pleasant yesterday. "
+            "Nodes and edges in graph databases carry properties. "
+            "Queries traverse edges between graph nodes. "
+            "My cat likes sardines. "
+            "Graph databases index nodes for fast traversal.")
+    summary = summarizer.summarize(text, ratio=0.5).split("\n")
+
+    assert "Weather was pleasant yesterday." not in summary
+    assert "My cat likes sardines." not in summary
+    assert summary == sorted(summary, key=text.index)
+    assert summarizer.summarize("Too short. Only two sentences.") == ""
+
+
+def test_batch_ranking_matches_per_page_selection():
+    """Pages ranked in one batch yield valid per-page scores and short pages get none."""
+    long_page = " ".join(f"Sentence {i} about graph nodes and edges." for i in range(8))
+    scores = summarizer.rank_texts([long_page, "One sentence only.", long_page])
+
+    assert scores[1] is None
+    assert len(scores[0]) == 8 and scores[0] == pytest.approx(scores[2])
+    assert summarizer.summarize(long_page, ratio=0.3, scores=scores[0])
+
+    processor = SemanticProcessor(FakeEnhancementBackend(), max_tokens=30)
+    processor.prepare_summaries([long_page, "Short page."])
+    assert list(processor._sentence_scores) == [long_page]
+
+
+def test_document_processor_ranks_each_window_in_one_batch(tmp_path, monkeypatch):
+    """Long pages processed through DocumentProcessor are ranked once per window."""
+    batches = []
+    real_rank_texts = summarizer.rank_texts
+
+    def recording_rank_texts(texts):
+        batches.append(len(texts))
+        return real_rank_texts(texts)
+
+    monkeypatch.setattr(summarizer, "rank_texts", recording_rank_texts)
+    paths = write_pages(tmp_path, [
+        " ".join(f"Sentence {i} of page {page} covers graph nodes and edges." for i in range(12))
+        for page in range(4)
+    ])
+    backend = FakeEnhancementBackend()
+    processor = DocumentProcessor(backend)
+    processor.semantic_processor = SemanticProcessor(backend, backend, max_tokens=30, max_concurrent_requests=2)
+    processor.use_semantic_pipeline = True
+
+    list(processor.iter_document_pages(paths, tmp_path / "output", "doc"))
+
+    assert batches == [2, 2]
+
+
+def test_long_text_is_summarized_in_one_pass(monkeypatch):
+    """Summaries come from a single summarizer call, truncated to max_tokens."""
+    calls = []
+    real_summarize = summarizer.summarize
+
+    def counting_summarize(text, **kwargs):
+        calls.append(kwargs["ratio"])
+        return real_summarize(text, **kwargs)
+
+    monkeypatch.setattr(summarizer, "summarize", counting_summarize)
+    text = " ".join(f"Sentence {i} explains how graph nodes and edges relate to queries." for i in range(40))
+    processor = SemanticProcessor(FakeEnhancementBackend(), max_tokens=40)
+
+    summary, was_summarized, original_count, summary_count = processor._smart_summarize(text)
+
+    assert len(calls) == 1
+    assert was_summarized and summary_count <= 40 < original_count
+    assert summary == " ".join(summary.split()[:40])
+
+
+@pytest.mark.parametrize("response, expected", [
+    ('Here you go: {"a": "}{", "b": [1, {"c": 2}]} done', ({"a": "}{", "b": [1, {"c": 2}]}, True)),
+    ('```json\n{"topic": "x", "key_insights": ["one", "tw', ({"topic": "x", "key_insights": ["one"]}, False)),
+    ('{"topic": "cut off', (None, False)),
+    ('Sure! {note} here: {"a": 1}', ({"a": 1}, True)),
+    ('Fill in {name}, {"topic": "x", "key_insights": ["one", "tw', ({"topic": "x", "key_insights": ["one"]}, False)),
+    ('no json here', (None, False)),
+])
+def test_extract_first_json_object(response, expected):
+    """The first parseable object is found in prose and truncated output keeps complete members."""
+    json_text, complete = _extract_first_json_object(response)
+    assert (json.loads(json_text) if json_text else None, complete) == expected
+
+
+def test_default_template_requests_schema_constrained_output(page_images):
+    """The page analysis schema is sent unless a custom template is configured."""
+    backend = FakeEnhancementBackend()
+    SemanticProcessor(backend, backend).process_page(page_images[0], 1)
+    assert backend.response_schema is PAGE_ANALYSIS_SCHEMA
+
+    config = {"semantic_enhancement": {"prompts": {"unified_prompt": "{extracted_text}"}}}
+    SemanticProcessor(backend, backend, config=config).process_page(page_images[0], 1)
+    assert backend.response_schema is None
+
+
+def test_extracted_text_is_reread_after_file_changes(page_images):
+    """Cached extracted text is refreshed when the markdown file is rewritten."""
+    processor = SemanticProcessor(FakeEnhancementBackend())
+    markdown = page_images[0].parent.parent / "markdown" / "page_0000_extracted.md"
+
+    assert processor._extract_text(page_images[0]) == "Text of page 1."
+
+    markdown.write_text("# Page 1\n\nRevised text.", encoding="utf-8")
+    os.utime(markdown, ns=(0, markdown.stat().st_mtime_ns + 1))
+    assert processor._extract_text(page_images[0]) == "Revised text."
+
+
+def test_semantic_enhancement_is_saved_as_json(page_images, tmp_path):
+    """The per-page semantic file holds the parsed enhancement and its prompt."""
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    SemanticProcessor(FakeEnhancementBackend(), FakeEnhancementBackend()).process_page(
+        page_images[2], 3, output_dir=output_dir)
+
+    saved = json.loads((output_dir / "page_0002_semantic.json").read_text(encoding="utf-8"))
+    assert saved["image"] == "page_0002.png"
+    assert "Semantic Analysis Task" in saved["prompt"]
+
+    config = {"semantic_enhancement": {"indent_json": False}}
+    SemanticProcessor(FakeEnhancementBackend(), FakeEnhancementBackend(), config=config).process_page(
+        page_images[2], 3, output_dir=output_dir)
+    compact = (output_dir / "page_0002_semantic.json").read_text(encoding="utf-8")
+    assert compact.count("\n") == 1 and compact.endswith("}\n")
+    assert json.loads(compact)["image"] == "page_0002.png"
+
+
+def test_pre_extract_splits_markdown_by_pdf_page_count(tmp_path):
+    """Pre-extraction writes one file per PDF page."""
+    pdf_path = tmp_path / "doc.pdf"
+    with fitz.open() as doc:
+        for _ in range(3):
+            doc.new_page()
+        doc.save(pdf_path)
+
+    output_dir = tmp_path / "markdown"
+    SemanticProcessor(FakeEnhancementBackend())._pre_extract_all_pages(
+        "one\ntwo\nthree", str(pdf_path), output_dir)
+
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "page_0000_extracted.md", "page_0001_extracted.md", "page_0002_extracted.md"]
+    assert (output_dir / "page_0001_extracted.md").read_text(encoding="utf-8").endswith("two")